@@ -0,0 +1,71 @@
+"""
+Benchmark del tiempo de arranque en frío de la CLI.
+Editorial Nuevo Milenio
+
+Mide, en procesos nuevos, el tiempo de importar el pipeline de evaluación y
+de ejecutar 'python main.py' sin argumentos, e informa de los módulos que más
+tardan en importarse (python -X importtime).
+
+Uso:
+    python benchmarks/arranque.py [--repeticiones N] [--max-ms MS]
+
+Con --max-ms el script termina con código 1 si la mediana de importación
+supera el umbral, para detectar regresiones en CI.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+PROCESAMIENTO = os.path.join(RAIZ, 'src', 'procesamiento')
+IMPORTACION = f'import sys; sys.path.insert(0, {PROCESAMIENTO!r}); import evaluador, utils'
+
+
+def medir(comando, repeticiones):
+    """Mediana en milisegundos de ejecutar el comando en procesos nuevos."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run(comando, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def modulos_mas_lentos(cantidad=10):
+    """Módulos con mayor tiempo acumulado de importación (en microsegundos)."""
+    salida = subprocess.run([sys.executable, '-X', 'importtime', '-c', IMPORTACION],
+                            cwd=RAIZ, capture_output=True, text=True).stderr
+    filas = []
+    for linea in salida.splitlines():
+        partes = linea.split('|')
+        if len(partes) == 3 and partes[1].strip().isdigit():
+            filas.append((int(partes[1]), partes[2].strip()))
+    return sorted(filas, reverse=True)[:cantidad]
+
+
+def main():
+    args = sys.argv[1:]
+    repeticiones = int(args[args.index('--repeticiones') + 1]) if '--repeticiones' in args else 10
+    maximo = float(args[args.index('--max-ms') + 1]) if '--max-ms' in args else None
+
+    base = medir([sys.executable, '-c', 'pass'], repeticiones)
+    importacion = medir([sys.executable, '-c', IMPORTACION], repeticiones)
+    cli = medir([sys.executable, 'main.py'], repeticiones)
+
+    print(f"Intérprete vacío:           {base:8.1f} ms")
+    print(f"Importar evaluador + utils: {importacion:8.1f} ms (+{importacion - base:.1f} ms)")
+    print(f"python main.py (uso):       {cli:8.1f} ms (+{cli - base:.1f} ms)")
+    print("\nImportaciones más costosas (acumulado):")
+    for microsegundos, modulo in modulos_mas_lentos():
+        print(f"  {microsegundos / 1000:8.1f} ms  {modulo}")
+
+    if maximo is not None and importacion - base > maximo:
+        print(f"\nRegresión: la importación supera {maximo:.1f} ms sobre el intérprete vacío")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark del conteo de palabras, oraciones y capítulos en TXT.
+Editorial Nuevo Milenio
+
+Compara, sobre un TXT sintético en español (o el indicado), tres caminos:
+  - funciones sueltas: leer el texto y llamar a contar_palabras,
+    contar_capitulos y calcular_legibilidad (re.findall);
+  - escanear_texto: leer el texto y escanearlo (estructura y palabras, dos pasadas);
+  - escanear_txt: contar sobre el archivo proyectado en memoria (conteo_bytes.py).
+Informa del tiempo mediano y del rendimiento en MB/s de cada uno.
+
+Uso:
+    python benchmarks/conteo_txt.py [archivo.txt] [--mb N] [--repeticiones N]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(RAIZ, 'src', 'procesamiento'))
+
+from conteo_bytes import _compilar_patrones  # noqa: E402
+from silabas import estadisticas_cache  # noqa: E402
+from utils import (calcular_legibilidad, contar_capitulos, contar_palabras,  # noqa: E402
+                   escanear_texto, escanear_txt)
+
+PALABRAS = ('el la de que y en un se no por con su para como más pero sus le ya o este sí porque '
+            'esta entre cuando muy sin sobre también me hasta hay donde quien desde todo nos durante '
+            'canción corazón niño señor último acción después allí aquí él está había sería').split()
+
+
+def generar_txt(ruta, megas):
+    """Escribe un TXT con capítulos, párrafos, diálogos y puntuación española."""
+    aleatorio = random.Random(0)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        escrito = capitulo = 0
+        while escrito < megas * 1e6:
+            capitulo += 1
+            partes = [f'Capítulo {capitulo}\n\n']
+            for _ in range(40):
+                oraciones = (' '.join(aleatorio.choices(PALABRAS, k=aleatorio.randint(5, 20))).capitalize()
+                             + aleatorio.choice('.?!') for _ in range(aleatorio.randint(2, 6)))
+                partes.append('—' + ' '.join(oraciones) + ' «¿Verdad?»\n\n')
+            bloque = ''.join(partes)
+            f.write(bloque)
+            escrito += len(bloque.encode('utf-8'))
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def main():
+    args = sys.argv[1:]
+    megas = float(args[args.index('--mb') + 1]) if '--mb' in args else 20
+    repeticiones = int(args[args.index('--repeticiones') + 1]) if '--repeticiones' in args else 5
+    archivos = [a for a in args if a.lower().endswith('.txt')]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = archivos[0] if archivos else os.path.join(directorio, 'sintetico.txt')
+        if not archivos:
+            generar_txt(ruta, megas)
+        tamano = os.path.getsize(ruta) / 1e6
+
+        def leer():
+            with open(ruta, encoding='utf-8') as f:
+                return f.read()
+
+        def sueltas():
+            texto = leer()
+            return contar_palabras(texto), contar_capitulos(texto), calcular_legibilidad(texto)
+
+        inicio = time.perf_counter()
+        _compilar_patrones()
+        print(f"Archivo: {ruta} ({tamano:.1f} MB)")
+        print(f"Generación de patrones (una vez por proceso): {(time.perf_counter() - inicio) * 1000:.0f} ms\n")
+
+        base = None
+        for nombre, funcion in (('funciones sueltas', sueltas),
+                                ('escanear_texto', lambda: escanear_texto(leer())),
+                                ('escanear_txt (mmap)', lambda: escanear_txt(ruta))):
+            segundos = medir(funcion, repeticiones)
+            base = base or segundos
+            print(f"{nombre:22s} {segundos * 1000:9.1f} ms  {tamano / segundos:8.1f} MB/s  x{base / segundos:.1f}")
+
+        stats = escanear_txt(ruta)
+        coincide = (stats == escanear_texto(leer())
+                    and stats['num_palabras'] == contar_palabras(leer())
+                    and stats['num_capitulos'] == contar_capitulos(leer()))
+        print(f"\nMismos resultados: {'sí' if coincide else 'NO'}")
+        cache = estadisticas_cache()
+        print(f"Caché de sílabas: {cache['formas']} formas, {cache['tasa_aciertos']:.1%} de aciertos")
+
+
+if __name__ == '__main__':
+    main()
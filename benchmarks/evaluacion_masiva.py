@@ -0,0 +1,61 @@
+"""
+Benchmark de la evaluación de estadísticas guardadas.
+Editorial Nuevo Milenio
+
+Compara, sobre N registros sintéticos y para cada género, llamar a
+evaluar_manuscrito registro a registro con evaluar_registros
+(evaluacion_masiva.py), e informa de los tiempos medianos y de si los
+veredictos coinciden.
+
+Uso:
+    python benchmarks/evaluacion_masiva.py [--registros N] [--repeticiones N]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(RAIZ, 'src', 'procesamiento'))
+
+from evaluacion_masiva import cargar_columnas, evaluar_columnas  # noqa: E402
+from evaluador import GENERO_CRITERIOS, es_apto, evaluar_manuscrito  # noqa: E402
+
+
+def generar_registros(n):
+    aleatorio = random.Random(0)
+    return [{'num_palabras': aleatorio.randint(0, 200000),
+             'num_capitulos': aleatorio.randint(0, 40),
+             'indice_legibilidad': aleatorio.uniform(0, 100),
+             'errores_graves': aleatorio.randint(0, 100)} for _ in range(n)]
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos), resultado
+
+
+def main():
+    args = sys.argv[1:]
+    n = int(args[args.index('--registros') + 1]) if '--registros' in args else 50000
+    repeticiones = int(args[args.index('--repeticiones') + 1]) if '--repeticiones' in args else 5
+    registros = generar_registros(n)
+
+    segundos, columnas = medir(lambda: cargar_columnas(registros), repeticiones)
+    print(f"{n} registros; carga en columnas: {segundos * 1000:.1f} ms (una vez para todos los géneros)\n")
+    for genero in GENERO_CRITERIOS:
+        bucle, aptos = medir(lambda: [es_apto(evaluar_manuscrito(r, genero)) for r in registros], repeticiones)
+        vectorial, masivo = medir(lambda: evaluar_columnas(columnas, genero), repeticiones)
+        coincide = masivo['apto'].tolist() == aptos
+        print(f"{genero:8s} bucle {bucle * 1000:8.1f} ms  vectorizado {vectorial * 1000:6.2f} ms  "
+              f"x{bucle / vectorial:6.0f}  mismos veredictos: {'sí' if coincide else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
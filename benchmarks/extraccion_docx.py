@@ -0,0 +1,93 @@
+"""
+Benchmark de extracción de texto DOCX: lector XML incremental frente a python-docx.
+Editorial Nuevo Milenio
+
+Genera un DOCX sintético (o usa el indicado) y mide, para cada camino, el tiempo
+mediano y el pico de memoria de Python (tracemalloc) al extraer el texto, y
+comprueba que ambos producen el mismo resultado.
+
+Uso:
+    python benchmarks/extraccion_docx.py [archivo.docx] [--parrafos N] [--repeticiones N]
+
+Sin python-docx instalado solo se mide el lector XML.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(RAIZ, 'src', 'procesamiento'))
+
+from archivos import ProcesadorDeArchivos  # noqa: E402
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+TIPOS = ('<?xml version="1.0" encoding="UTF-8"?>'
+         '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+         '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+         '<Default Extension="xml" ContentType="application/xml"/>'
+         '<Override PartName="/word/document.xml" ContentType="application/'
+         'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+RELACIONES = ('<?xml version="1.0" encoding="UTF-8"?>'
+              '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+              '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+              'relationships/officeDocument" Target="word/document.xml"/></Relationships>')
+PARRAFO = ('<w:p><w:r><w:t xml:space="preserve">En un lugar de la Mancha, de cuyo nombre no quiero '
+           'acordarme, </w:t></w:r><w:r><w:t>no ha mucho tiempo que vivía un hidalgo.</w:t></w:r></w:p>')
+
+
+def generar_docx(ruta, parrafos):
+    """Escribe un DOCX mínimo válido con el número de párrafos indicado."""
+    with zipfile.ZipFile(ruta, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('[Content_Types].xml', TIPOS)
+        z.writestr('_rels/.rels', RELACIONES)
+        z.writestr('word/document.xml', f'<?xml version="1.0" encoding="UTF-8"?><w:document {W}>'
+                   f'<w:body>{PARRAFO * parrafos}</w:body></w:document>')
+
+
+def medir(funcion, ruta, repeticiones):
+    """(texto, mediana en segundos, pico de memoria en bytes) de extraer el texto."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        texto = funcion(ruta)
+        tiempos.append(time.perf_counter() - inicio)
+    tracemalloc.start()
+    funcion(ruta)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return texto, statistics.median(tiempos), pico
+
+
+def main():
+    args = sys.argv[1:]
+    parrafos = int(args[args.index('--parrafos') + 1]) if '--parrafos' in args else 50000
+    repeticiones = int(args[args.index('--repeticiones') + 1]) if '--repeticiones' in args else 3
+    archivos = [a for a in args if a.lower().endswith('.docx')]
+
+    procesador = ProcesadorDeArchivos()
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = archivos[0] if archivos else os.path.join(directorio, 'sintetico.docx')
+        if not archivos:
+            generar_docx(ruta, parrafos)
+        print(f"Archivo: {ruta} ({os.path.getsize(ruta) / 1024:.0f} KB comprimido)\n")
+
+        texto, segundos, pico = medir(procesador._extraer_docx, ruta, repeticiones)
+        print(f"Lector XML:  {segundos * 1000:9.1f} ms  pico {pico / 1e6:7.1f} MB")
+        try:
+            import docx  # noqa: F401
+        except ImportError:
+            print("python-docx: no instalado")
+            return
+        texto_docx, segundos_docx, pico_docx = medir(procesador._extraer_docx_python_docx, ruta, repeticiones)
+        print(f"python-docx: {segundos_docx * 1000:9.1f} ms  pico {pico_docx / 1e6:7.1f} MB")
+        print(f"\nAceleración: x{segundos_docx / segundos:.1f}  "
+              f"Mismo texto: {'sí' if texto == texto_docx else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
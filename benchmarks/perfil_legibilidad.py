@@ -0,0 +1,76 @@
+"""
+Benchmark del perfil de legibilidad por ventanas.
+Editorial Nuevo Milenio
+
+Sobre un texto sintético de N palabras (150,000 por defecto, una novela),
+mide perfil_legibilidad con varios tamaños de ventana y lo compara con
+recalcular cada ventana desde cero (escanear_texto sobre su fragmento). El
+perfil incremental debe tardar lo mismo con cualquier ventana; el recálculo
+crece con ella.
+
+Uso:
+    python benchmarks/perfil_legibilidad.py [--palabras N] [--repeticiones N]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(RAIZ, 'src', 'procesamiento'))
+
+from perfil_legibilidad import inicios_de_ventanas, medir_oraciones, perfil_legibilidad  # noqa: E402
+from utils import escanear_texto  # noqa: E402
+
+PALABRAS = ('el la de que y en un se no por con su para como más pero sus le ya o este sí porque '
+            'esta entre cuando muy sin sobre también me hasta hay donde quien desde todo nos durante '
+            'casa camino mañana corazón administración murciélago extraordinariamente ciudad río '
+            'pensamiento silencio ventana historia canción averigüéis aire tiempo').split()
+
+
+def generar_texto(palabras):
+    aleatorio = random.Random(0)
+    oraciones = []
+    while palabras > 0:
+        n = min(palabras, aleatorio.randint(3, 30))
+        palabras -= n
+        oraciones.append(' '.join(aleatorio.choices(PALABRAS, k=n)).capitalize() + '.')
+    return ' '.join(oraciones)
+
+
+def recalcular(texto, ventana, paso):
+    inicios = medir_oraciones(texto)[0]
+    limites = list(inicios[1:]) + [len(texto)]
+    n = len(inicios)
+    return [escanear_texto(texto[inicios[i]:limites[min(i + ventana, n) - 1]])['indice_legibilidad']
+            for i in inicios_de_ventanas(n, ventana, paso)]
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def main():
+    args = sys.argv[1:]
+    palabras = int(args[args.index('--palabras') + 1]) if '--palabras' in args else 150000
+    repeticiones = int(args[args.index('--repeticiones') + 1]) if '--repeticiones' in args else 3
+    texto = generar_texto(palabras)
+    n = len(medir_oraciones(texto)[0])
+    print(f"{palabras} palabras, {n} oraciones, {len(texto) / 1e6:.1f} MB\n")
+    for ventana in (10, 50, 200):
+        perfil = perfil_legibilidad(texto, ventana, 1)
+        incremental = medir(lambda: perfil_legibilidad(texto, ventana, 1), repeticiones)
+        directo = medir(lambda: recalcular(texto, ventana, 1), 1)
+        print(f"ventana {ventana:5d}: {len(perfil.indices):6d} ventanas  incremental {incremental * 1000:8.1f} ms"
+              f"  recalculando {directo * 1000:9.1f} ms  x{directo / incremental:.0f}")
+
+
+if __name__ == '__main__':
+    main()
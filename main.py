@@ -3,13 +3,33 @@ Ecdotica — Sistema de evaluación editorial automatizada.
 Editorial Nuevo Milenio
 
 Uso:
-    python main.py <ruta_manuscrito> <genero>
+    python main.py <ruta_manuscrito> <genero|todos> [--exhaustivo]
+    python main.py --lote <directorio|manifiesto> [genero] [--procesos N] [--exhaustivo]
+    python main.py --limpiar-cache
+
+El manuscrito puede ser .pdf, .docx o texto UTF-8 (.txt, .md o cualquier otra
+extensión). El texto extraído de PDF y DOCX se guarda en una caché en disco
+(~/.cache/ecdotica, o $ECDOTICA_CACHE) para no repetir la extracción;
+--limpiar-cache la vacía junto con la gramatical.
 
 Géneros disponibles:
     novela, cuento, poema, ensayo, cronica
 
+Con 'todos' el manuscrito se analiza una sola vez y se evalúa en cada género;
+el reporte empieza por una tabla de compatibilidad ordenada.
+
 Ejemplo:
     python main.py manuscrito.txt novela
+    python main.py manuscrito.txt todos
+    python main.py --lote bandeja/ --procesos 8 > resultados.jsonl
+
+Los criterios baratos se evalúan primero y, si el manuscrito ya incumple
+alguno, la revisión gramatical se omite (el reporte la marca con '–');
+--exhaustivo evalúa siempre todos los criterios.
+
+En modo lote se acepta un directorio (con un subdirectorio por género, o
+cualquier directorio si se indica el género) o un manifiesto .csv/.tsv/.jsonl
+de pares (ruta, género). Se escribe una línea JSON por manuscrito.
 """
 
 import sys
@@ -18,26 +38,84 @@ import os
 # Añadir el módulo de procesamiento al path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src', 'procesamiento'))
 
-from evaluador import evaluar_manuscrito, reporte_resultados
-from utils import analizar_manuscrito
+from evaluador import evaluar_generos, evaluar_ruta, reporte_generos, reporte_resultados
 
 GENEROS_DISPONIBLES = ['novela', 'cuento', 'poema', 'ensayo', 'cronica']
 
 
+def main_lote(args):
+    from lote import evaluar_lote, escribir_jsonl, leer_manifiesto, listar_directorio
+
+    procesos = None
+    if '--procesos' in args:
+        i = args.index('--procesos')
+        try:
+            procesos = int(args[i + 1])
+        except (IndexError, ValueError):
+            print("Error: --procesos requiere un número entero", file=sys.stderr)
+            sys.exit(1)
+        del args[i:i + 2]
+    exhaustivo = '--exhaustivo' in args
+    if exhaustivo:
+        args.remove('--exhaustivo')
+
+    if not args:
+        print("Uso: python main.py --lote <directorio|manifiesto> [genero] [--procesos N] [--exhaustivo]",
+              file=sys.stderr)
+        sys.exit(1)
+
+    origen = args[0]
+    genero = args[1].lower() if len(args) > 1 else None
+    if genero is not None and genero not in GENEROS_DISPONIBLES:
+        print(f"Error: Género '{genero}' no reconocido.", file=sys.stderr)
+        sys.exit(1)
+
+    if os.path.isdir(origen):
+        pares = listar_directorio(origen, genero)
+    elif os.path.isfile(origen):
+        pares = leer_manifiesto(origen)
+    else:
+        print(f"Error: No se encontró '{origen}'", file=sys.stderr)
+        sys.exit(1)
+
+    escribir_jsonl(evaluar_lote(pares, procesos, exhaustivo=exhaustivo), sys.stdout)
+
+
+def limpiar_caches():
+    from cache import CacheExtraccion, CacheGramatical
+
+    for cache in (CacheExtraccion(), CacheGramatical()):
+        cache.limpiar()
+        cache.cerrar()
+    print("Cachés vaciadas.")
+
+
 def main():
-    if len(sys.argv) < 3:
-        print("Uso: python main.py <ruta_manuscrito> <genero>")
+    if len(sys.argv) > 1 and sys.argv[1] == '--lote':
+        main_lote(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == '--limpiar-cache':
+        limpiar_caches()
+        return
+
+    args = sys.argv[1:]
+    exhaustivo = '--exhaustivo' in args
+    if exhaustivo:
+        args.remove('--exhaustivo')
+
+    if len(args) < 2:
+        print("Uso: python main.py <ruta_manuscrito> <genero|todos> [--exhaustivo]")
         print(f"Géneros disponibles: {', '.join(GENEROS_DISPONIBLES)}")
         sys.exit(1)
 
-    ruta = sys.argv[1]
-    genero = sys.argv[2].lower()
+    ruta = args[0]
+    genero = args[1].lower()
 
     if not os.path.isfile(ruta):
         print(f"Error: No se encontró el archivo '{ruta}'")
         sys.exit(1)
 
-    if genero not in GENEROS_DISPONIBLES:
+    if genero != 'todos' and genero not in GENEROS_DISPONIBLES:
         print(f"Error: Género '{genero}' no reconocido.")
         print(f"Géneros disponibles: {', '.join(GENEROS_DISPONIBLES)}")
         sys.exit(1)
@@ -45,8 +123,13 @@ def main():
     print(f"\nAnalizando manuscrito: {ruta}")
     print(f"Género: {genero}\n")
 
-    stats = analizar_manuscrito(ruta)
-    resultados = evaluar_manuscrito(stats, genero)
+    from cache import CacheExtraccion, CacheGramatical
+    caches = {'cache': CacheGramatical(), 'cache_extraccion': CacheExtraccion()}
+    if genero == 'todos':
+        tabla, _ = evaluar_generos(ruta, GENEROS_DISPONIBLES, exhaustivo=exhaustivo, **caches)
+        print(reporte_generos(tabla))
+        return
+    resultados, _ = evaluar_ruta(ruta, genero, exhaustivo=exhaustivo, **caches)
     print(reporte_resultados(resultados, genero))
 
 
@@ -0,0 +1,122 @@
+"""
+Buffer de texto editable basado en una tabla de piezas.
+Editorial Nuevo Milenio
+
+El texto no se copia al editarlo: se guarda como una lista de piezas
+(cadena, inicio, fin) que apuntan al texto original o a los textos insertados.
+Insertar, borrar o reemplazar solo parte la pieza afectada y desplaza los
+offsets de las siguientes; el texto completo se reconstruye únicamente
+cuando alguien lo pide, y se guarda hasta la siguiente edición.
+"""
+
+from bisect import bisect_right
+
+
+class BufferDeTexto:
+    """Tabla de piezas con historial para deshacer y rehacer."""
+
+    def __init__(self, texto=''):
+        self._piezas = [(texto, 0, len(texto))] if texto else []
+        # Offset de inicio de cada pieza en el texto resultante
+        self._inicios = [0] if texto else []
+        self._longitud = len(texto)
+        self._texto = texto
+        # Ediciones como (offset, texto quitado, texto puesto)
+        self._deshacer = []
+        self._rehacer = []
+
+    def __len__(self):
+        return self._longitud
+
+    def __str__(self):
+        return self.texto()
+
+    def __getitem__(self, indice):
+        if not isinstance(indice, slice) or indice.step not in (None, 1):
+            raise TypeError('BufferDeTexto solo admite cortes contiguos')
+        inicio, fin, _ = indice.indices(self._longitud)
+        return self.fragmento(inicio, fin)
+
+    def texto(self):
+        """Texto completo; se reconstruye solo si hubo ediciones desde la última vez."""
+        if self._texto is None:
+            self._texto = ''.join(cadena[a:b] for cadena, a, b in self._piezas)
+            self._piezas = [(self._texto, 0, self._longitud)] if self._texto else []
+            self._inicios = [0] if self._texto else []
+        return self._texto
+
+    def fragmento(self, inicio, fin):
+        """Texto entre dos offsets, sin reconstruir el texto completo."""
+        if self._texto is not None:
+            return self._texto[inicio:fin]
+        if inicio >= fin:
+            return ''
+        partes = []
+        i = bisect_right(self._inicios, inicio) - 1
+        while i < len(self._piezas) and self._inicios[i] < fin:
+            cadena, a, b = self._piezas[i]
+            base = self._inicios[i]
+            partes.append(cadena[a + max(inicio - base, 0):a + min(fin - base, b - a)])
+            i += 1
+        return ''.join(partes)
+
+    def insertar(self, offset, texto):
+        """Inserta texto en el offset."""
+        self.reemplazar(offset, 0, texto)
+
+    def borrar(self, offset, longitud):
+        """Borra longitud caracteres desde el offset y devuelve el texto borrado."""
+        return self.reemplazar(offset, longitud, '')
+
+    def reemplazar(self, offset, longitud, texto):
+        """Sustituye longitud caracteres desde el offset por texto y devuelve los sustituidos."""
+        quitado = self._aplicar(offset, longitud, texto)
+        self._deshacer.append((offset, quitado, texto))
+        self._rehacer.clear()
+        return quitado
+
+    def deshacer(self):
+        """Revierte la última edición y la devuelve como (offset, quitado, puesto), o None."""
+        if not self._deshacer:
+            return None
+        offset, quitado, puesto = self._deshacer.pop()
+        self._aplicar(offset, len(puesto), quitado)
+        self._rehacer.append((offset, quitado, puesto))
+        return offset, puesto, quitado
+
+    def rehacer(self):
+        """Vuelve a aplicar la última edición deshecha y la devuelve como (offset, quitado, puesto), o None."""
+        if not self._rehacer:
+            return None
+        offset, quitado, puesto = self._rehacer.pop()
+        self._aplicar(offset, len(quitado), puesto)
+        self._deshacer.append((offset, quitado, puesto))
+        return offset, quitado, puesto
+
+    def _aplicar(self, offset, longitud, texto):
+        if offset < 0 or longitud < 0 or offset + longitud > self._longitud:
+            raise IndexError(f'Edición fuera del texto: {offset}+{longitud} de {self._longitud}')
+        i = self._partir(offset)
+        j = self._partir(offset + longitud)
+        quitado = ''.join(cadena[a:b] for cadena, a, b in self._piezas[i:j])
+        nuevas = [(texto, 0, len(texto))] if texto else []
+        self._piezas[i:j] = nuevas
+        delta = len(texto) - longitud
+        self._inicios[i:] = [offset] * len(nuevas) + [s + delta for s in self._inicios[j:]]
+        self._longitud += delta
+        if quitado or texto:
+            self._texto = None
+        return quitado
+
+    def _partir(self, offset):
+        """Asegura que una pieza empieza en el offset y devuelve su índice."""
+        if offset == self._longitud:
+            return len(self._piezas)
+        i = bisect_right(self._inicios, offset) - 1
+        desplazamiento = offset - self._inicios[i]
+        if desplazamiento:
+            cadena, a, b = self._piezas[i]
+            self._piezas[i:i + 1] = [(cadena, a, a + desplazamiento), (cadena, a + desplazamiento, b)]
+            self._inicios.insert(i + 1, offset)
+            i += 1
+        return i
@@ -1,30 +1,259 @@
+import re
+from collections import namedtuple
+from operator import itemgetter
+
+from buffer import BufferDeTexto
+from erratas import AutomataErratas, cargar_automata, normalizar
+from intervalos import IndiceDeIntervalos
+from lineas import IndiceDeLineas
+
+# Tipos de incidencia que detecta el escaneo
+ESPACIO_DOBLE = 'espacio_doble'
+SIN_PUNTUACION = 'sin_puntuacion'
+ERRATA = 'errata'
+GRAMATICA = 'gramatica'
+
+# Errores comunes predefinidos y su corrección (puede ampliarse)
+ERRORES_COMUNES = {'teh': 'the', 'recivido': 'recibido', 'escribirr': 'escribir'}
+
+# Incidencia encontrada en el texto. offset, longitud y columna en caracteres; linea
+# desde 0 (como falta_puntuacion); sugerencia para erratas y gramática; regla y
+# mensaje solo para gramática.
+Incidencia = namedtuple('Incidencia', 'tipo offset longitud linea columna texto sugerencia regla mensaje',
+                        defaults=(None, None))
+
+# Patrón único para el escaneo de formato. Cada alternativa es un grupo con nombre:
+#   sin_puntuacion -> posición tras el último carácter visible de una línea que no
+#                     acaba en . ! ?, o inicio de una línea solo con espacios
+#   espacio_doble  -> espacio seguido de otro espacio
+# sin_puntuacion va primero: es de longitud cero y, si no, un espacio doble al
+# final de la línea la ocultaría. Las erratas las busca el autómata (erratas.py).
+_PATRON = re.compile(
+    r'(?P<sin_puntuacion>(?<=[^.!?\s])(?=[^\S\n]*$)|^(?=[^\S\n]+$))'
+    r'|(?P<espacio_doble> (?= ))',
+    re.MULTILINE,
+)
+
+_AUTOMATA = AutomataErratas(ERRORES_COMUNES)
+
+
 class EditorDeTexto:
-    def __init__(self):
-        self.texto = ''
+    def __init__(self, errores=None, lexicon=None, directorio_cache=None):
+        """errores: dict {errata: corrección}; lexicon: ruta de un léxico (ver erratas.py);
+        directorio_cache: dónde guardar su autómata compilado (por defecto, erratas.directorio_automatas())."""
+        if lexicon is not None:
+            self._automata = cargar_automata(lexicon, directorio_cache)
+        elif errores is not None:
+            self._automata = AutomataErratas(errores)
+        else:
+            self._automata = _AUTOMATA
+        self.errores = self._automata.correcciones
+        self.cargar_texto('')
 
     def cargar_texto(self, texto):
         """Carga el texto a editar."""
-        self.texto = texto
+        self._buffer = BufferDeTexto(texto)
+        self._incidencias = None
+        self._indice = None
+        # Todas las incidencias (del escaneo y del corrector gramatical) como
+        # intervalos [inicio, fin) con valor (tipo, texto, sugerencia, regla, mensaje);
+        # línea y columna se calculan al devolverlas
+        self._intervalos = IndiceDeIntervalos()
+        self._escaneado = False
+
+    @property
+    def texto(self):
+        """Texto actual; tras editar se reconstruye una sola vez, al pedirlo."""
+        return self._buffer.texto()
+
+    @texto.setter
+    def texto(self, texto):
+        self.cargar_texto(texto)
+
+    @property
+    def indice(self):
+        """Índice de líneas del texto cargado (ver lineas.py); se mantiene al editar."""
+        if self._indice is None:
+            self._indice = IndiceDeLineas(self.texto)
+        return self._indice
+
+    def escanear(self):
+        """Encuentra todas las incidencias del texto, en orden de offset.
+
+        Una pasada del patrón de formato y otra del autómata de erratas, ambas
+        lineales en el tamaño del texto. El resultado se reutiliza y, al editar,
+        solo se vuelven a escanear las líneas afectadas.
+        """
+        if self._incidencias is None:
+            self._incidencias = self._ubicar(e for e in self._diagnosticos().elementos() if e[2][0] != GRAMATICA)
+        return self._incidencias
+
+    def gramatica(self):
+        """Incidencias del corrector gramatical registradas (ver agregar_gramatica), en orden de offset."""
+        return self._ubicar(e for e in self._intervalos.elementos() if e[2][0] == GRAMATICA)
+
+    def incidencias_en(self, inicio, fin):
+        """Incidencias (de formato, erratas y gramática) que se solapan con [inicio, fin).
+
+        Pensado para mostrar solo las de la zona visible: la consulta usa un
+        índice de intervalos (ver intervalos.py) y no recorre todo el manuscrito.
+        """
+        return self._ubicar(self._diagnosticos().solapados(inicio, fin))
+
+    def incidencias_en_lineas(self, desde, hasta=None):
+        """Incidencias que se solapan con las líneas [desde, hasta)."""
+        inicio, fin = self.indice.rango(desde, hasta)
+        return self.incidencias_en(inicio, fin + 1)
+
+    def agregar_gramatica(self, coincidencias, inicio=0, fin=None):
+        """Registra las coincidencias del corrector gramatical para el tramo [inicio, fin).
+
+        Sustituye las incidencias de gramática que empezaban en ese tramo, así que
+        al volver a revisar un párrafo basta con pasar su tramo y sus coincidencias.
+        """
+        if fin is None:
+            fin = len(self._buffer)
+        nuevas = self.ubicar_coincidencias(coincidencias)
+        intervalos = self._intervalos
+        for elemento in intervalos.empiezan_en(inicio, fin):
+            if elemento[2][0] == GRAMATICA:
+                intervalos.quitar(*elemento)
+        for i in nuevas:
+            intervalos.insertar(i.offset, i.offset + i.longitud, (GRAMATICA, i.texto, *i[6:]))
+        return nuevas
+
+    def _diagnosticos(self):
+        """Índice de intervalos con todas las incidencias, escaneando el texto la primera vez."""
+        if not self._escaneado:
+            self._intervalos = IndiceDeIntervalos(
+                [*self._intervalos.elementos(), *self._registrar(self._escanear_fragmento(self.texto, 0))])
+            self._escaneado = True
+        return self._intervalos
+
+    def _escanear_fragmento(self, fragmento, base):
+        """Incidencias (inicio, fin, tipo, sugerencia) de un fragmento que empieza en
+        un inicio de línea y acaba en un final de línea; offsets desplazados por base."""
+        encontradas = [(base + m.start(), base + m.end(), m.lastgroup, None)
+                       for m in _PATRON.finditer(fragmento)]
+        encontradas += [(base + inicio, base + fin, ERRATA, correccion)
+                        for inicio, fin, _, correccion in self._automata.buscar(fragmento)]
+        encontradas.sort(key=itemgetter(0))
+        return encontradas
+
+    def _registrar(self, encontradas):
+        """Convierte incidencias (inicio, fin, tipo, sugerencia) en elementos del índice de intervalos."""
+        fragmento = self._buffer.fragmento
+        return [(inicio, fin, (tipo, fragmento(inicio, fin), sugerencia, None, None))
+                for inicio, fin, tipo, sugerencia in encontradas]
+
+    def _ubicar(self, elementos):
+        """Incidencias de elementos (inicio, fin, valor) del índice, con su línea y columna actuales."""
+        posicion = self.indice.posicion
+        return [Incidencia(tipo, inicio, fin - inicio, *posicion(inicio), texto, *resto)
+                for inicio, fin, (tipo, texto, *resto) in elementos]
+
+    def insertar(self, offset, texto):
+        """Inserta texto en el offset."""
+        self.reemplazar(offset, 0, texto)
+
+    def borrar(self, offset, longitud):
+        """Borra longitud caracteres desde el offset."""
+        self.reemplazar(offset, longitud, '')
+
+    def reemplazar(self, offset, longitud, texto):
+        """Sustituye longitud caracteres desde el offset, por ejemplo para aplicar una sugerencia.
+
+        No copia el manuscrito (ver buffer.py) ni recorre las incidencias
+        posteriores: solo se vuelven a escanear las líneas tocadas y las demás
+        se desplazan en el índice de intervalos sin reconstruirse.
+        """
+        quitado = self._buffer.reemplazar(offset, longitud, texto)
+        self._tras_editar(offset, quitado, texto)
+
+    def deshacer(self):
+        """Revierte la última edición. Devuelve False si no había nada que deshacer."""
+        edicion = self._buffer.deshacer()
+        if edicion is not None:
+            self._tras_editar(*edicion)
+        return edicion is not None
+
+    def rehacer(self):
+        """Vuelve a aplicar la última edición deshecha. Devuelve False si no había ninguna."""
+        edicion = self._buffer.rehacer()
+        if edicion is not None:
+            self._tras_editar(*edicion)
+        return edicion is not None
+
+    def _tras_editar(self, offset, quitado, puesto):
+        """Actualiza el índice de líneas y las incidencias tras una edición.
+
+        Las incidencias guardan su texto y se ubican (línea y columna) al
+        devolverlas, así que las posteriores a la edición solo se desplazan.
+        """
+        self._incidencias = None
+        intervalos = self._intervalos
+        if self._indice is not None:
+            self._indice.actualizar(offset, quitado, puesto, self._buffer)
+        elif not len(intervalos):
+            return
+        indice = self.indice
+        delta = len(puesto) - len(quitado)
+        limite = offset + len(quitado)
+        # Las de gramática no se revisan aquí: se descartan las que tocan la edición
+        for elemento in intervalos.solapados(offset - 1, limite + 1):
+            if elemento[2][0] == GRAMATICA and elemento[1] >= offset:
+                intervalos.quitar(*elemento)
+        if not self._escaneado:
+            intervalos.desplazar(limite + 1, delta)
+            return
+        # Ventana de líneas que hay que volver a escanear: las tocadas por la edición
+        # más las que puede abarcar una errata de varias palabras a cada lado
+        margen = self._automata.max_palabras
+        primera = max(indice.linea(offset) - margen, 0)
+        ultima = indice.linea(offset + len(puesto))
+        inicio = indice.rango(primera)[0]
+        fin = indice.rango(ultima)[1]
+        # Se escanea algo más allá para no cortar erratas que empiezan en la ventana
+        hasta = indice.rango(min(ultima + margen, len(indice) - 1))[1]
+        nuevas = self._registrar([e for e in self._escanear_fragmento(self._buffer.fragmento(inicio, hasta), inicio)
+                                  if e[0] <= fin])
+
+        # Se quitan (con offsets de antes de la edición) las del escaneo que
+        # empiezan en la ventana; las siguientes pasan a estar detrás de fin
+        for elemento in intervalos.empiezan_en(inicio, max(limite, fin - delta + 1)):
+            if elemento[2][0] != GRAMATICA:
+                intervalos.quitar(*elemento)
+        intervalos.desplazar(limite + 1, delta)
+        for elemento in nuevas:
+            intervalos.insertar(*elemento)
+
+    def ubicar_coincidencias(self, coincidencias):
+        """Convierte coincidencias del corrector gramatical (offset, longitud, regla,
+        mensaje, sugerencias) en incidencias con línea y columna."""
+        posicion = self.indice.posicion
+        return [Incidencia(GRAMATICA, c.offset, c.longitud, *posicion(c.offset),
+                           self._buffer.fragmento(c.offset, c.offset + c.longitud),
+                           c.sugerencias[0] if c.sugerencias else None, c.regla, c.mensaje)
+                for c in coincidencias]
+
+    def texto_de_lineas(self, desde, hasta=None):
+        """Texto de las líneas [desde, hasta) del texto cargado."""
+        return self._buffer.fragmento(*self.indice.rango(desde, hasta))
 
     def encontrar_espacios_dobles(self):
         """Identifica espacios dobles en el texto."""
-        return [i for i in range(len(self.texto)-1) if self.texto[i] == ' ' and self.texto[i+1] == ' ']
+        return [i.offset for i in self.escanear() if i.tipo == ESPACIO_DOBLE]
 
     def falta_puntuacion(self):
         """Detecta líneas que podrían no terminar correctamente con puntuación."""
-        import re
-        lineas = self.texto.split('\n')
         # Se considera que falta puntuación si la línea no termina en . ! ?
-        return [n for n, l in enumerate(lineas) if l and not re.search(r'[.!?]$', l.strip())]
+        return [i.linea for i in self.escanear() if i.tipo == SIN_PUNTUACION]
 
     def errores_comunes(self):
         """Detecta errores comunes predefinidos en el texto (puede ampliarse)."""
-        errores = {'teh': 'the', 'recivido': 'recibido', 'escribirr': 'escribir'}
-        encontrados = {}
-        for err in errores:
-            if err in self.texto:
-                encontrados[err] = errores[err]
-        return encontrados
+        formas = self._automata.formas
+        encontrados = dict.fromkeys(formas[normalizar(i.texto)] for i in self.escanear() if i.tipo == ERRATA)
+        return {err: self.errores[err] for err in encontrados}
 
     # ---
     # Aquí podría combinarse con funciones de edición humana, mostrando sugerencias y esperando validación.
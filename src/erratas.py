@@ -0,0 +1,227 @@
+"""
+Léxico de erratas compilado en un autómata de Aho-Corasick.
+Editorial Nuevo Milenio
+
+El autómata trabaja sobre palabras, no sobre caracteres: cada errata del
+léxico es una secuencia de una o más palabras (\\w+) y solo se reconoce
+completa, con límites de palabra a ambos lados. Entre las palabras de una
+errata de varias palabras solo puede haber espacios, con un salto de línea
+como mucho (una línea en blanco la corta). La búsqueda recorre el
+texto una vez, sea cual sea el tamaño del léxico, y no distingue mayúsculas.
+
+Tras compilarlo, el autómata se guarda en tablas planas: un número por
+palabra del léxico, las transiciones en un solo diccionario {estado *
+palabras + palabra: estado} y las salidas de todos los estados seguidas en
+dos listas, con el inicio de las de cada estado. Así se guarda en disco
+como JSON (por hash del léxico) de listas de números y cadenas, y cargarlo
+no reconstruye un objeto por estado. Son solo datos: leer uno manipulado
+puede dar un autómata incorrecto, pero nunca ejecutar código.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+from collections import deque
+from functools import cached_property
+from itertools import accumulate
+
+from procesamiento.directorios import directorio_cache as _directorio_cache
+
+# Cambiarla invalida los autómatas guardados
+VERSION_AUTOMATA = '3'
+
+_PALABRA = re.compile(r'\w+')
+# Palabras del texto, y signos o líneas en blanco (cortan una errata de varias palabras)
+_TOKEN = re.compile(r'(?P<palabra>\w+)|(?P<corte>[^\w\s]+|\n[^\S\n]*\n)')
+
+# Tablas que guarda a_datos, todas listas
+_TABLAS = ('erratas', 'correcciones', 'palabras', 'claves', 'destinos', 'fallo',
+           'inicio_salida', 'longitud_salida', 'errata_salida')
+
+
+def directorio_automatas():
+    """Directorio por defecto de los autómatas compilados: 'erratas' dentro del de las cachés."""
+    return _directorio_cache('erratas')
+
+
+def normalizar(errata):
+    """Secuencia de palabras en minúsculas con la que se reconoce una errata."""
+    return tuple(p.lower() for p in _PALABRA.findall(errata))
+
+
+class AutomataErratas:
+    """Autómata de Aho-Corasick sobre palabras construido a partir de {errata: corrección}."""
+
+    def __init__(self, errores):
+        self.correcciones = dict(errores)
+        self._erratas = list(self.correcciones)
+        self.max_palabras = 0
+        # Número de cada palabra del léxico
+        self._palabras = {}
+        # Trie con un diccionario {número de palabra: estado} por estado (0: raíz);
+        # se aplana al acabar
+        siguiente = [{}]
+        salida = [[]]
+        for n, errata in enumerate(self._erratas):
+            palabras = normalizar(errata)
+            if not palabras:
+                continue
+            estado = 0
+            for palabra in palabras:
+                p = self._palabras.setdefault(palabra, len(self._palabras))
+                hijo = siguiente[estado].get(p)
+                if hijo is None:
+                    hijo = siguiente[estado][p] = len(siguiente)
+                    siguiente.append({})
+                    salida.append([])
+                estado = hijo
+            salida[estado].append((len(palabras), n))
+            self.max_palabras = max(self.max_palabras, len(palabras))
+        self._fallo = _enlazar_fallos(siguiente, salida)
+        total = len(self._palabras)
+        self._siguiente = {estado * total + p: hijo
+                           for estado, hijos in enumerate(siguiente) for p, hijo in hijos.items()}
+        # Salidas del estado e: posiciones [inicio_salida[e], inicio_salida[e + 1])
+        self._inicio_salida = [0, *accumulate(map(len, salida))]
+        self._longitud_salida = [longitud for salidas in salida for longitud, _ in salidas]
+        self._errata_salida = [n for salidas in salida for _, n in salidas]
+
+    def __len__(self):
+        return len(self.correcciones)
+
+    @cached_property
+    def formas(self):
+        """Errata del léxico que corresponde a cada secuencia normalizada."""
+        formas = {}
+        for errata in self._erratas:
+            palabras = normalizar(errata)
+            if palabras:
+                formas[palabras] = errata
+        return formas
+
+    def a_datos(self):
+        """Tablas del autómata como listas de JSON (ver desde_datos)."""
+        return {
+            'erratas': self._erratas,
+            'correcciones': [self.correcciones[e] for e in self._erratas],
+            'palabras': list(self._palabras),
+            'claves': list(self._siguiente),
+            'destinos': list(self._siguiente.values()),
+            'fallo': self._fallo,
+            'inicio_salida': self._inicio_salida,
+            'longitud_salida': self._longitud_salida,
+            'errata_salida': self._errata_salida,
+            'max_palabras': self.max_palabras,
+        }
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Reconstruye un autómata de a_datos sin volver a compilarlo.
+
+        Las listas se usan tal como las da json.load. Lanza ValueError si sus
+        longitudes no cuadran.
+        """
+        if not all(isinstance(datos[t], list) for t in _TABLAS):
+            raise ValueError('Tablas del autómata incoherentes')
+        automata = cls.__new__(cls)
+        automata._erratas = datos['erratas']
+        automata.correcciones = dict(zip(datos['erratas'], datos['correcciones']))
+        automata._palabras = dict(zip(datos['palabras'], range(len(datos['palabras']))))
+        automata._siguiente = dict(zip(datos['claves'], datos['destinos']))
+        automata._fallo = datos['fallo']
+        automata._inicio_salida = datos['inicio_salida']
+        automata._longitud_salida = datos['longitud_salida']
+        automata._errata_salida = datos['errata_salida']
+        automata.max_palabras = datos['max_palabras']
+        if not (len(automata._erratas) == len(datos['correcciones']) == len(automata.correcciones)
+                and len(datos['claves']) == len(datos['destinos']) == len(automata._siguiente)
+                and len(automata._inicio_salida) == len(automata._fallo) + 1
+                and automata._inicio_salida[-1] == len(automata._longitud_salida) == len(automata._errata_salida)):
+            raise ValueError('Tablas del autómata incoherentes')
+        return automata
+
+    def buscar(self, texto):
+        """Genera (inicio, fin, errata, corrección) por cada aparición, en orden de fin."""
+        palabras, siguiente, fallo = self._palabras, self._siguiente, self._fallo
+        inicio_salida, longitud_salida, errata_salida = (
+            self._inicio_salida, self._longitud_salida, self._errata_salida)
+        erratas, correcciones = self._erratas, self.correcciones
+        total = len(palabras)
+        inicios = deque(maxlen=self.max_palabras or 1)
+        estado = 0
+        for m in _TOKEN.finditer(texto):
+            if m.lastgroup == 'corte':
+                estado = 0
+                continue
+            inicios.append(m.start())
+            n = palabras.get(m.group().lower())
+            if n is None:
+                # Una palabra que no está en el léxico devuelve a la raíz
+                estado = 0
+                continue
+            while estado and estado * total + n not in siguiente:
+                estado = fallo[estado]
+            estado = siguiente.get(estado * total + n, 0)
+            for k in range(inicio_salida[estado], inicio_salida[estado + 1]):
+                errata = erratas[errata_salida[k]]
+                yield inicios[-longitud_salida[k]], m.end(), errata, correcciones[errata]
+
+
+def _enlazar_fallos(siguiente, salida):
+    """Enlaces de fallo del trie, por anchura; cada estado hereda las salidas de su sufijo."""
+    fallo = [0] * len(siguiente)
+    cola = deque(siguiente[0].values())
+    while cola:
+        estado = cola.popleft()
+        for p, hijo in siguiente[estado].items():
+            cola.append(hijo)
+            f = fallo[estado]
+            while f and p not in siguiente[f]:
+                f = fallo[f]
+            fallo[hijo] = siguiente[f].get(p, 0)
+            salida[hijo] += salida[fallo[hijo]]
+    return fallo
+
+
+def leer_lexicon(ruta):
+    """Lee un léxico {errata: corrección} de un archivo 'errata<TAB>corrección' o CSV.
+
+    El separador es el tabulador si aparece en la línea y la coma en otro caso;
+    '#' inicia un comentario.
+    """
+    errores = {}
+    with open(ruta, encoding='utf-8', newline='') as f:
+        for linea in f:
+            if not linea.strip() or linea.lstrip().startswith('#'):
+                continue
+            fila = next(csv.reader([linea], delimiter='\t' if '\t' in linea else ','))
+            if len(fila) >= 2:
+                errores[fila[0].strip()] = fila[1].strip()
+    return errores
+
+
+def cargar_automata(ruta, directorio_cache=None):
+    """Devuelve el autómata de un léxico, reutilizando el compilado en disco si existe.
+
+    La clave es el hash del contenido del léxico, así que editarlo basta para
+    que se recompile. Sin caché: AutomataErratas(leer_lexicon(ruta)).
+    """
+    if directorio_cache is None:
+        directorio_cache = directorio_automatas()
+    with open(ruta, 'rb') as f:
+        clave = hashlib.sha256(VERSION_AUTOMATA.encode('ascii') + b'\0' + f.read()).hexdigest()
+    compilado = os.path.join(directorio_cache, clave + '.json')
+    try:
+        with open(compilado, encoding='utf-8') as f:
+            return AutomataErratas.desde_datos(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    automata = AutomataErratas(leer_lexicon(ruta))
+    os.makedirs(directorio_cache, exist_ok=True)
+    temporal = f'{compilado}.{os.getpid()}.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(automata.a_datos(), f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temporal, compilado)
+    return automata
@@ -0,0 +1,197 @@
+"""
+Índice de intervalos para consultar incidencias por rango de caracteres.
+Editorial Nuevo Milenio
+
+Los intervalos [inicio, fin) se guardan en una lista ordenada por inicio. Para
+saber qué intervalos se solapan con [a, b) basta con buscar por bisección los
+que empiezan en [a - ancho, b), donde ancho es la longitud máxima de un
+intervalo corto; los pocos intervalos más largos (una regla gramatical que
+abarca un párrafo, por ejemplo) van en una segunda lista que se recorre entera.
+Insertar y quitar son una bisección y un desplazamiento de la lista.
+
+Tras una edición, desplazar no recorre los intervalos posteriores: deja el
+desplazamiento pendiente a partir de una posición de la lista, y la siguiente
+edición solo lo aplica a los intervalos que quedan entre ambas posiciones.
+Editar una y otra vez en la misma zona cuesta lo mismo con diez incidencias
+detrás que con cien mil.
+
+Un intervalo vacío (inicio == fin) se trata como el punto inicio: se solapa con
+[a, b) si a <= inicio < b.
+"""
+
+from bisect import bisect_left
+from heapq import merge
+from itertools import count
+
+# Longitud a partir de la cual un intervalo se guarda aparte
+ANCHO_CORTO = 256
+
+
+def _mover(clave, delta):
+    return (clave[0] + delta,) + ((clave[1] + delta,) + clave[2:] if len(clave) > 1 else ())
+
+
+class _Claves:
+    """Claves (inicio, fin, n) ordenadas, con un desplazamiento pendiente.
+
+    Las claves de la posición desde en adelante están guardadas sin sumarles
+    delta; real(j) da la clave verdadera. Las de cada tramo siguen ordenadas,
+    así que se buscan por bisección sin aplicar el desplazamiento.
+    """
+
+    __slots__ = ('claves', 'desde', 'delta')
+
+    def __init__(self, claves=()):
+        self.claves = sorted(claves)
+        self.desde = len(self.claves)
+        self.delta = 0
+
+    def __len__(self):
+        return len(self.claves)
+
+    def real(self, j):
+        if j < self.desde:
+            return self.claves[j]
+        return _mover(self.claves[j], self.delta)
+
+    def reales(self, i=0, j=None):
+        j = len(self.claves) if j is None else j
+        corte = min(max(i, self.desde), j)
+        reales = self.claves[i:corte]
+        if corte < j:
+            delta = self.delta
+            reales += [(a + delta, b + delta, n) for a, b, n in self.claves[corte:j]]
+        return reales
+
+    def buscar(self, clave):
+        """Posición de la primera clave real >= clave (como bisect_left)."""
+        desde = self.desde
+        if desde and self.claves[desde - 1] >= clave:
+            return bisect_left(self.claves, clave, 0, desde)
+        return bisect_left(self.claves, _mover(clave, -self.delta), desde)
+
+    def insertar(self, clave):
+        j = self.buscar(clave)
+        if j <= self.desde:
+            self.claves.insert(j, clave)
+            self.desde += 1
+        else:
+            self.claves.insert(j, _mover(clave, -self.delta))
+
+    def quitar(self, j):
+        clave = self.real(j)
+        del self.claves[j]
+        if j < self.desde:
+            self.desde -= 1
+        return clave
+
+    def desplazar(self, p, delta):
+        """Suma delta a las claves de la posición p en adelante."""
+        claves = self.claves
+        if p >= self.desde:
+            # Las claves entre el pendiente anterior y p lo reciben ya
+            self._aplicar(self.desde, p, self.delta)
+        else:
+            # Las de [p, desde) solo deben recibir delta, no el pendiente anterior
+            self._aplicar(p, self.desde, -self.delta)
+        self.desde = p
+        self.delta += delta
+        if p >= len(claves):
+            self.desde, self.delta = len(claves), 0
+        elif 0 < p and self.real(p - 1) > self.real(p):
+            # El desplazamiento adelantó intervalos a otros anteriores: se reordena todo
+            self.claves = sorted(self.reales())
+            self.desde, self.delta = len(self.claves), 0
+
+    def _aplicar(self, i, j, delta):
+        if delta and i < j:
+            self.claves[i:j] = [(a + delta, b + delta, n) for a, b, n in self.claves[i:j]]
+
+
+class IndiceDeIntervalos:
+    """Conjunto de (inicio, fin, valor) con consultas de solapamiento por rango."""
+
+    def __init__(self, elementos=(), ancho=ANCHO_CORTO):
+        self.ancho = ancho
+        self._secuencia = count()
+        # Claves (inicio, fin, n) ordenadas; n desempata y da el valor en _valores
+        self._valores = {}
+        cortos = []
+        largos = []
+        for inicio, fin, valor in elementos:
+            (largos if fin - inicio > ancho else cortos).append(self._clave(inicio, fin, valor))
+        self._cortos = _Claves(cortos)
+        self._largos = _Claves(largos)
+
+    def __len__(self):
+        return len(self._valores)
+
+    def __iter__(self):
+        """Valores en orden de (inicio, fin)."""
+        return (valor for _, _, valor in self.elementos())
+
+    def elementos(self):
+        """Tuplas (inicio, fin, valor) en orden de (inicio, fin)."""
+        valores = self._valores
+        return ((a, b, valores[n]) for a, b, n in merge(self._cortos.reales(), self._largos.reales()))
+
+    def _lista(self, inicio, fin):
+        return self._largos if fin - inicio > self.ancho else self._cortos
+
+    def _clave(self, inicio, fin, valor):
+        n = next(self._secuencia)
+        self._valores[n] = valor
+        return inicio, fin, n
+
+    def insertar(self, inicio, fin, valor):
+        """Añade el intervalo [inicio, fin) con su valor."""
+        if fin < inicio:
+            raise ValueError(f'Intervalo invertido: [{inicio}, {fin})')
+        self._lista(inicio, fin).insertar(self._clave(inicio, fin, valor))
+
+    def quitar(self, inicio, fin, valor):
+        """Quita un intervalo igual a (inicio, fin, valor). Devuelve False si no estaba."""
+        lista = self._lista(inicio, fin)
+        i = lista.buscar((inicio, fin))
+        while i < len(lista):
+            clave = lista.real(i)
+            if clave[:2] != (inicio, fin):
+                break
+            if self._valores[clave[2]] == valor:
+                del self._valores[lista.quitar(i)[2]]
+                return True
+            i += 1
+        return False
+
+    def desplazar(self, desde, delta):
+        """Suma delta a los intervalos que empiezan en desde o después.
+
+        El desplazamiento queda pendiente (ver el comentario del módulo). Con
+        delta negativo no debe quedar ningún intervalo que empiece en
+        [desde + delta, desde); si lo hay, la lista se reordena.
+        """
+        for lista in (self._cortos, self._largos):
+            lista.desplazar(lista.buscar((desde,)), delta)
+
+    def solapados(self, a, b):
+        """Tuplas (inicio, fin, valor) de los intervalos que se solapan con [a, b), en orden."""
+        cortos = self._cortos
+        claves = cortos.reales(cortos.buscar((a - self.ancho,)), cortos.buscar((b,)))
+        encontradas = [c for c in claves if c[1] > a or c[0] >= a]
+        if len(self._largos):
+            largas = [c for c in self._largos.reales() if c[0] < b and (c[1] > a or c[0] >= a)]
+            encontradas = merge(encontradas, largas)
+        return [(inicio, fin, self._valores[n]) for inicio, fin, n in encontradas]
+
+    def consultar(self, a, b):
+        """Valores de los intervalos que se solapan con [a, b), en orden de (inicio, fin)."""
+        return [valor for _, _, valor in self.solapados(a, b)]
+
+    def empiezan_en(self, a, b):
+        """Tuplas (inicio, fin, valor) de los intervalos que empiezan en [a, b), en orden."""
+        cortos = self._cortos
+        encontradas = cortos.reales(cortos.buscar((a,)), cortos.buscar((b,)))
+        if len(self._largos):
+            largas = [c for c in self._largos.reales() if a <= c[0] < b]
+            encontradas = merge(encontradas, largas)
+        return [(inicio, fin, self._valores[n]) for inicio, fin, n in encontradas]
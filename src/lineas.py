@@ -0,0 +1,72 @@
+"""
+Índice de inicios de línea para traducir offsets a (línea, columna).
+Editorial Nuevo Milenio
+
+Se construye una vez por texto cargado y se actualiza con cada edición. Las
+consultas son búsquedas binarias sobre los offsets de inicio de cada línea,
+así que no hace falta volver a partir el texto por saltos de línea en cada
+comprobación.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class IndiceDeLineas:
+    """Offsets de inicio de cada línea de un texto (líneas separadas por '\\n', desde 0)."""
+
+    def __init__(self, texto):
+        # Solo se usa con len() y cortes [a:b]; tras actualizar puede ser un BufferDeTexto
+        self.texto = texto
+        # Cada línea empieza tras la anterior y su '\n'
+        self.inicios = [0]
+        self.inicios += accumulate(len(linea) + 1 for linea in texto.split('\n')[:-1])
+
+    def __len__(self):
+        return len(self.inicios)
+
+    def linea(self, offset):
+        """Número de línea del offset."""
+        return bisect_right(self.inicios, offset) - 1
+
+    def posicion(self, offset):
+        """(línea, columna) del offset; la columna se cuenta en caracteres desde 0."""
+        linea = bisect_right(self.inicios, offset) - 1
+        return linea, offset - self.inicios[linea]
+
+    def offset(self, linea, columna=0):
+        """Offset de una (línea, columna); inverso de posicion."""
+        return self.inicios[linea] + columna
+
+    def rango(self, desde, hasta=None):
+        """Offsets (inicio, fin) de las líneas [desde, hasta); fin excluye el último '\\n'."""
+        if hasta is None:
+            hasta = desde + 1
+        desde = max(desde, 0)
+        hasta = min(hasta, len(self.inicios))
+        if desde >= hasta:
+            return 0, 0
+        fin = self.inicios[hasta] - 1 if hasta < len(self.inicios) else len(self.texto)
+        return self.inicios[desde], fin
+
+    def actualizar(self, offset, quitado, puesto, texto):
+        """Ajusta el índice a una edición (offset, texto quitado, texto puesto) sin recorrer el texto.
+
+        texto es el texto ya editado. Solo se tocan los inicios de las líneas
+        afectadas y se desplazan los de las siguientes.
+        """
+        i = bisect_right(self.inicios, offset)
+        j = bisect_right(self.inicios, offset + len(quitado))
+        delta = len(puesto) - len(quitado)
+        nuevos = []
+        salto = puesto.find('\n')
+        while salto != -1:
+            nuevos.append(offset + salto + 1)
+            salto = puesto.find('\n', salto + 1)
+        self.inicios[i:] = nuevos + [s + delta for s in self.inicios[j:]]
+        self.texto = texto
+
+    def lineas(self, desde, hasta=None):
+        """Texto de las líneas [desde, hasta), sin el '\\n' final."""
+        inicio, fin = self.rango(desde, hasta)
+        return self.texto[inicio:fin]
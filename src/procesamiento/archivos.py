@@ -1,10 +1,44 @@
 import os
+import re
+import zipfile
+from xml.etree import ElementTree
 
 # Para PDF: instalar 'PyPDF2'
-# Para DOCX: instalar 'python-docx'
+# Para DOCX: lectura directa del XML; 'python-docx' como respaldo
 # Para TXT: estándar
 # Estructura para futura integración con SpaCy y LanguageTool comentada
 
+# Tamaño (en caracteres) de los bloques de lectura en flujo
+TAMANO_BLOQUE = 1 << 20
+
+# Rasgos de SpaCy que usan las estadísticas de texto
+RASGOS_ESTADISTICAS = ('tokens', 'oraciones', 'entidades')
+
+# Tamaño máximo de un párrafo enviado a SpaCy (muy por debajo de nlp.max_length)
+LIMITE_PARRAFO = 100000
+
+# Cortes de una línea más larga que el límite de un párrafo: fin de oración o, si no hay, espacio
+_CORTES_LINEA = (re.compile(r'[.!?]+\s+'), re.compile(r'\s+'))
+
+# DOCX: espacio de nombres de WordprocessingML y partes de encabezado/pie
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_PARTE_ENCABEZADO = re.compile(r'word/(header|footer)\d*\.xml')
+
+# PDF: a partir de cuántas páginas se reparte la extracción entre procesos,
+# y cuántas páginas extrae cada tarea
+UMBRAL_PAGINAS_PARALELO = 500
+PAGINAS_POR_TAREA = 50
+
+# Formatos de documento binarios o con marcado propio que no se leen como texto
+EXTENSIONES_NO_SOPORTADAS = frozenset({'.doc', '.odt', '.rtf', '.pages', '.epub', '.xls', '.xlsx',
+                                       '.ods', '.ppt', '.pptx', '.odp', '.zip'})
+
+def es_texto_plano(ruta):
+    """True si la ruta se lee como texto UTF-8: todo lo que no es .pdf, .docx ni un formato no soportado."""
+    ext = os.path.splitext(ruta)[1].lower()
+    return ext not in ('.pdf', '.docx') and ext not in EXTENSIONES_NO_SOPORTADAS
+
+
 class ProcesadorDeArchivos:
     """
     Clase para procesar archivos PDF, TXT y DOCX.
@@ -16,45 +50,124 @@ class ProcesadorDeArchivos:
     """
     
     def extraer_texto(self, ruta):
+        # Cualquier extensión que no sea PDF, DOCX ni un formato no soportado
+        # (.txt, .md, ninguna) se lee como texto UTF-8
         ext = os.path.splitext(ruta)[1].lower()
+        if ext in EXTENSIONES_NO_SOPORTADAS:
+            raise ValueError("Tipo de archivo no soportado")
         if ext == '.pdf':
             return self._extraer_pdf(ruta)
         elif ext == '.docx':
             return self._extraer_docx(ruta)
-        elif ext == '.txt':
-            return self._extraer_txt(ruta)
-        else:
-            raise ValueError("Tipo de archivo no soportado")
+        return self._extraer_txt(ruta)
     
     def _extraer_pdf(self, ruta):
         # Requiere PyPDF2
-        texto = ""
         try:
-            import PyPDF2
-            with open(ruta, 'rb') as f:
-                lector = PyPDF2.PdfReader(f)
-                for pagina in lector.pages:
-                    texto += pagina.extract_text() or ""
+            return "".join(self.iterar_paginas_pdf(ruta))
         except ImportError:
-            texto = "PyPDF2 no instalado"
-        return texto
+            return "PyPDF2 no instalado"
+
+    def iterar_paginas_pdf(self, ruta, paralelo=None, procesos=None):
+        """Genera el texto de cada página de un PDF a medida que se extrae.
+
+        Con paralelo=None, los PDF de UMBRAL_PAGINAS_PARALELO páginas o más se
+        reparten por rangos entre procesos. Las páginas siempre salen en orden.
+        """
+        import PyPDF2
+        with open(ruta, 'rb') as f:
+            lector = PyPDF2.PdfReader(f)
+            total = len(lector.pages)
+            if paralelo is None:
+                paralelo = total >= UMBRAL_PAGINAS_PARALELO
+            if not paralelo:
+                for pagina in lector.pages:
+                    yield pagina.extract_text() or ""
+                return
+        yield from _extraer_pdf_en_paralelo(ruta, total, procesos)
     
     def _extraer_docx(self, ruta):
+        # Lectura directa del XML; python-docx queda como respaldo
+        try:
+            return "".join(p + "\n" for p in self.iterar_parrafos_docx(ruta))
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+            return self._extraer_docx_python_docx(ruta)
+
+    def _extraer_docx_python_docx(self, ruta):
         # Requiere python-docx
         texto = ""
         try:
             import docx
             doc = docx.Document(ruta)
-            for parrafo in doc.paragraphs:
-                texto += parrafo.text + "\n"
+            texto = "".join(parrafo.text + "\n" for parrafo in doc.paragraphs)
         except ImportError:
             texto = "python-docx no instalado"
         return texto
+
+    def iterar_parrafos_docx(self, ruta, encabezados=False, notas=False, tablas=False):
+        """Genera el texto de cada párrafo de un DOCX leyendo su XML de forma incremental.
+
+        No construye el modelo de objetos de python-docx: recorre word/document.xml
+        con iterparse y libera cada párrafo tras emitirlo. Por defecto produce los
+        mismos párrafos que python-docx (cuerpo, sin tablas); opcionalmente incluye
+        encabezados y pies de página (antes del cuerpo), notas al pie y al final
+        (después) y el texto de las tablas.
+        """
+        with zipfile.ZipFile(ruta) as z:
+            nombres = z.namelist()
+            partes = []
+            if encabezados:
+                partes += sorted(n for n in nombres if _PARTE_ENCABEZADO.fullmatch(n))
+            partes.append('word/document.xml')
+            if notas:
+                partes += [n for n in ('word/footnotes.xml', 'word/endnotes.xml') if n in nombres]
+            for parte in partes:
+                with z.open(parte) as xml:
+                    yield from _parrafos_xml(xml, tablas)
     
+    def _iterar_docx(self, ruta):
+        """Párrafos de un DOCX terminados en salto de línea, con python-docx como respaldo.
+
+        Como _extraer_docx, pero la falta de python-docx se propaga en lugar de
+        devolverse como texto. Si el XML falla después de emitir algún párrafo,
+        el error también se propaga, para no repetir el principio del documento.
+        """
+        emitidos = False
+        try:
+            for parrafo in self.iterar_parrafos_docx(ruta):
+                emitidos = True
+                yield parrafo + "\n"
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+            if emitidos:
+                raise
+            import docx
+            for parrafo in docx.Document(ruta).paragraphs:
+                yield parrafo.text + "\n"
+
     def _extraer_txt(self, ruta):
         # TXT estándar
         with open(ruta, encoding="utf-8") as f:
             return f.read()
+
+    def iterar_txt(self, ruta, tamano_bloque=TAMANO_BLOQUE):
+        """Lee un TXT por bloques de tamaño fijo sin cargarlo entero en memoria."""
+        with open(ruta, encoding="utf-8") as f:
+            while True:
+                bloque = f.read(tamano_bloque)
+                if not bloque:
+                    break
+                yield bloque
+    
+    def iterar_texto(self, ruta, tamano_bloque=TAMANO_BLOQUE):
+        """Genera el texto de cualquier formato soportado por fragmentos (bloques o páginas)."""
+        ext = os.path.splitext(ruta)[1].lower()
+        if ext in EXTENSIONES_NO_SOPORTADAS:
+            raise ValueError("Tipo de archivo no soportado")
+        if ext == '.pdf':
+            return self.iterar_paginas_pdf(ruta)
+        elif ext == '.docx':
+            return self._iterar_docx(ruta)
+        return self.iterar_txt(ruta, tamano_bloque)
     
     # Ejemplo de cómo integrar SpaCy en el futuro:
     # def analizar_con_spacy(self, texto):
@@ -71,6 +184,76 @@ class ProcesadorDeArchivos:
     #     return tool.correct(texto)
 
 
+def _parrafos_xml(xml, tablas=False):
+    """Texto de cada <w:p> de una parte WordprocessingML, en orden de documento.
+
+    Sigue el criterio de python-docx para el texto de un párrafo: <w:t>, tabuladores
+    como '\\t' y saltos de línea o de carro como '\\n'. Los párrafos anidados en
+    tablas o cuadros de texto se omiten salvo tablas=True.
+    """
+    # Elementos abiertos, de la raíz al actual
+    pila = []
+    anidamiento = 0
+    texto = []
+    for evento, elemento in ElementTree.iterparse(xml, events=('start', 'end')):
+        etiqueta = elemento.tag
+        if evento == 'start':
+            pila.append(elemento)
+            if etiqueta == _W + 'txbxContent' or (etiqueta == _W + 'tbl' and not tablas):
+                anidamiento += 1
+            elif etiqueta == _W + 'p' and not anidamiento:
+                texto = []
+            continue
+        pila.pop()
+        # Soltar cada hijo terminado de la raíz o de <w:body> (párrafos, tablas...);
+        # el parser sigue añadiendo los siguientes a ese mismo padre
+        if pila and (len(pila) == 1 or pila[-1].tag == _W + 'body'):
+            pila[-1].remove(elemento)
+        if anidamiento and etiqueta in (_W + 't', _W + 'tab', _W + 'br', _W + 'cr'):
+            continue
+        if etiqueta == _W + 't':
+            texto.append(elemento.text or '')
+        elif etiqueta == _W + 'tab':
+            texto.append('\t')
+        elif etiqueta in (_W + 'br', _W + 'cr'):
+            texto.append('\n')
+        elif etiqueta == _W + 'p':
+            elemento.clear()
+            if not anidamiento:
+                yield ''.join(texto)
+        elif etiqueta == _W + 'txbxContent' or (etiqueta == _W + 'tbl' and not tablas):
+            anidamiento -= 1
+
+
+def _extraer_pdf_en_paralelo(ruta, total, procesos=None):
+    """Extrae rangos de páginas en un pool de procesos, conservando el orden.
+
+    Como mucho hay 2 * procesos rangos en vuelo, para no acumular el documento entero.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    procesos = procesos or os.cpu_count() or 1
+    rangos = iter(range(0, total, PAGINAS_POR_TAREA))
+    with ProcessPoolExecutor(procesos) as executor:
+        en_vuelo = deque()
+        for inicio in rangos:
+            en_vuelo.append(executor.submit(_extraer_rango_pdf, ruta, inicio,
+                                            min(inicio + PAGINAS_POR_TAREA, total)))
+            if len(en_vuelo) >= 2 * procesos:
+                yield from en_vuelo.popleft().result()
+        while en_vuelo:
+            yield from en_vuelo.popleft().result()
+
+
+def _extraer_rango_pdf(ruta, inicio, fin):
+    """Texto de las páginas [inicio, fin) de un PDF (se ejecuta en un proceso hijo)."""
+    import PyPDF2
+    with open(ruta, 'rb') as f:
+        lector = PyPDF2.PdfReader(f)
+        return [lector.pages[i].extract_text() or "" for i in range(inicio, fin)]
+
+
 # ============================================================================
 # FUNCIONES DE EJEMPLO PARA ANÁLISIS DE TEXTOS CON SPACY Y LANGUAGETOOL
 # ============================================================================
@@ -88,16 +271,17 @@ def analizar_texto_ejemplo():
     """
     
     import spacy
-    import language_tool_python
+    from corrector import obtener_corrector
+    from modelo_spacy import obtener_nlp
 
-    # Cargar el modelo de SpaCy para español
+    # Cargar el modelo de SpaCy para español (pipeline completo, compartido)
     # Nota: Requiere instalar el modelo con: python -m spacy download es_core_news_sm
     print("Cargando modelo de SpaCy para español...")
-    nlp = spacy.load("es_core_news_sm")
+    nlp = obtener_nlp(('oraciones', 'entidades', 'lemas', 'dependencias'))
 
-    # Inicializar LanguageTool para español
+    # LanguageTool para español (instancia compartida, se arranca al primer uso)
     print("Inicializando LanguageTool...")
-    tool = language_tool_python.LanguageTool('es')
+    corrector = obtener_corrector()
     
     # Leer el archivo de muestra
     ruta_sample = os.path.join(os.path.dirname(__file__), '..', 'samples', 'sample.txt')
@@ -163,7 +347,7 @@ def analizar_texto_ejemplo():
     fragmento_lt = '. '.join(primer_parrafo.split('.')[:3]) + '.'
     
     # Obtener sugerencias de corrección
-    matches = tool.check(fragmento_lt)
+    matches = corrector.revisar(fragmento_lt)
     
     print(f"\n5. SUGERENCIAS DE CORRECCIÓN:")
     print("-" * 50)
@@ -179,9 +363,6 @@ def analizar_texto_ejemplo():
     else:
         print("  ¡Excelente! No se encontraron sugerencias de corrección.")
     
-    # Cerrar LanguageTool
-    tool.close()
-    
     print("\n" + "="*70)
     print("ANÁLISIS COMPLETADO")
     print("="*70)
@@ -204,19 +385,18 @@ def obtener_estadisticas_texto(ruta_archivo):
         with open(ruta_archivo, 'r', encoding='utf-8') as f:
             texto = f.read()
         
-        import spacy
+        from modelo_spacy import obtener_nlp, procesar
 
-        # Cargar modelo de SpaCy
-        nlp = spacy.load("es_core_news_sm")
-        doc = nlp(texto)
+        # Los textos que superan el límite de SpaCy se procesan por párrafos
+        if len(texto) > obtener_nlp(RASGOS_ESTADISTICAS).max_length:
+            return next(estadisticas_corpus([ruta_archivo]))[1]
+
+        # Modelo compartido, solo con los componentes que piden estas estadísticas
+        doc = procesar(texto, RASGOS_ESTADISTICAS)
         
-        estadisticas = {
-            'caracteres': len(texto),
-            'palabras': len([token for token in doc if not token.is_space]),
-            'oraciones': len(list(doc.sents)),
-            'tokens': len(doc),
-            'entidades': len(doc.ents)
-        }
+        estadisticas = _estadisticas_vacias()
+        _acumular_estadisticas(estadisticas, doc)
+        estadisticas['caracteres'] = len(texto)
         
         return estadisticas
     
@@ -225,6 +405,136 @@ def obtener_estadisticas_texto(ruta_archivo):
         return None
 
 
+def estadisticas_corpus(rutas, batch_size=64, n_process=1):
+    """
+    Obtiene las estadísticas de muchos archivos pasando sus párrafos por nlp.pipe.
+    
+    Los archivos se leen línea a línea y se agrupan en párrafos, de modo que ni
+    los textos largos chocan con nlp.max_length ni el corpus entero pasa por
+    memoria. Las estadísticas de cada párrafo se suman en el mismo diccionario
+    que devuelve obtener_estadisticas_texto ('tokens' no incluye los saltos de
+    línea que separan párrafos).
+    
+    Args:
+        rutas (iterable): Rutas de los archivos de texto
+        batch_size (int): Párrafos por lote de nlp.pipe
+        n_process (int): Procesos de nlp.pipe
+    
+    Yields:
+        tuple: (ruta, estadísticas) por archivo, en el orden de entrada;
+        las estadísticas son None si el archivo no pudo leerse
+    """
+    import time
+    from modelo_spacy import obtener_nlp, registrar_documentos
+
+    rutas = list(rutas)
+    nlp = obtener_nlp(RASGOS_ESTADISTICAS)
+    limite = min(LIMITE_PARRAFO, nlp.max_length)
+    caracteres = [0] * len(rutas)
+    fallidos = set()
+    parrafos_procesados = 0
+
+    def parrafos():
+        for i, ruta in enumerate(rutas):
+            try:
+                with open(ruta, 'r', encoding='utf-8') as f:
+                    for parrafo in _leer_parrafos(_contar_caracteres(f, caracteres, i), limite):
+                        yield parrafo, i
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error al procesar el archivo {ruta}: {e}")
+                fallidos.add(i)
+
+    def resultado(i):
+        if i in fallidos:
+            return rutas[i], None
+        estadisticas = acumuladas.pop(i, None) or _estadisticas_vacias()
+        estadisticas['caracteres'] = caracteres[i]
+        return rutas[i], estadisticas
+
+    acumuladas = {}
+    siguiente = 0
+    inicio = time.perf_counter()
+    for doc, i in nlp.pipe(parrafos(), as_tuples=True, batch_size=batch_size, n_process=n_process):
+        while siguiente < i:
+            yield resultado(siguiente)
+            siguiente += 1
+        _acumular_estadisticas(acumuladas.setdefault(i, _estadisticas_vacias()), doc)
+        parrafos_procesados += 1
+    registrar_documentos(parrafos_procesados, time.perf_counter() - inicio)
+    while siguiente < len(rutas):
+        yield resultado(siguiente)
+        siguiente += 1
+
+
+def _estadisticas_vacias():
+    return {'caracteres': 0, 'palabras': 0, 'oraciones': 0, 'tokens': 0, 'entidades': 0}
+
+
+def _acumular_estadisticas(estadisticas, doc):
+    estadisticas['palabras'] += sum(1 for token in doc if not token.is_space)
+    estadisticas['oraciones'] += sum(1 for _ in doc.sents)
+    estadisticas['tokens'] += len(doc)
+    estadisticas['entidades'] += len(doc.ents)
+
+
+def _contar_caracteres(lineas, caracteres, i):
+    for linea in lineas:
+        caracteres[i] += len(linea)
+        yield linea
+
+
+def _leer_parrafos(lineas, limite=LIMITE_PARRAFO):
+    """Agrupa líneas en párrafos separados por líneas en blanco (hasta 'limite' caracteres).
+
+    Una línea más larga que 'limite' se parte por oraciones o, si no hay, por
+    espacios (ver _partir_linea), así que ningún párrafo pasa del límite.
+    """
+    parrafo = []
+    tamano = 0
+    for linea in lineas:
+        if len(linea) > limite:
+            if parrafo:
+                yield ''.join(parrafo).rstrip('\n')
+                parrafo = []
+                tamano = 0
+            # El último trozo sigue como una línea más, para juntarse con las siguientes
+            *trozos, linea = _partir_linea(linea, limite)
+            yield from (t for t in trozos if t.strip())
+        if linea.strip():
+            parrafo.append(linea)
+            tamano += len(linea)
+            if tamano < limite:
+                continue
+        if parrafo:
+            yield ''.join(parrafo).rstrip('\n')
+            parrafo = []
+            tamano = 0
+    if parrafo:
+        yield ''.join(parrafo).rstrip('\n')
+
+
+def _partir_linea(linea, limite):
+    """Trozos de hasta 'limite' caracteres que, unidos, dan la línea.
+
+    Cada trozo acaba tras el último fin de oración que cabe en él; si no hay
+    ninguno, tras el último espacio, y si tampoco, justo en el límite.
+    """
+    trozos = []
+    inicio = 0
+    while len(linea) - inicio > limite:
+        fin = inicio + limite
+        corte = fin
+        for patron in _CORTES_LINEA:
+            cortes = [m.end() for m in patron.finditer(linea, inicio, fin) if m.end() > inicio]
+            if cortes:
+                corte = cortes[-1]
+                break
+        trozos.append(linea[inicio:corte])
+        inicio = corte
+    trozos.append(linea[inicio:])
+    return trozos
+
+
 if __name__ == "__main__":
     """
     Bloque principal que ejecuta la función de ejemplo cuando se ejecuta el script directamente.
@@ -256,3 +566,12 @@ if __name__ == "__main__":
         print(f"  Tokens totales: {stats['tokens']:,}")
         print(f"  Entidades nombradas: {stats['entidades']}")
         print()
+
+    from modelo_spacy import metricas
+    tiempos = metricas()
+    print("Tiempos de SpaCy:")
+    for pipeline, segundos in tiempos['cargas'].items():
+        print(f"  Carga [{pipeline}]: {segundos:.2f} s")
+    print(f"  Documentos procesados: {tiempos['documentos']} "
+          f"({tiempos['tiempo_por_documento']:.3f} s por documento)")
+    print()
@@ -0,0 +1,233 @@
+"""
+Cachés en disco: revisión gramatical por párrafo y texto extraído de PDF y DOCX.
+Editorial Nuevo Milenio
+
+Cada párrafo se identifica por el hash de su texto normalizado junto con el
+idioma y la versión del corrector, de modo que al reenviar un manuscrito solo
+se revisan los párrafos nuevos o modificados. El texto extraído de un PDF o
+DOCX se identifica por el hash del archivo original, de modo que reevaluarlo
+no repite la extracción.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from directorios import directorio_cache
+
+# Número máximo de párrafos guardados antes de desalojar los menos usados
+MAX_PARRAFOS = 200000
+
+
+def normalizar_parrafo(parrafo):
+    """Normaliza un párrafo para calcular su clave (sin espacios en los extremos)."""
+    return parrafo.strip()
+
+
+class CacheGramatical:
+    """Caché LRU de coincidencias por párrafo, guardada en SQLite.
+
+    Las coincidencias se guardan como listas JSON con offsets relativos al
+    inicio del párrafo normalizado.
+    """
+
+    def __init__(self, ruta=None, max_parrafos=MAX_PARRAFOS):
+        if ruta is None:
+            ruta = directorio_cache('gramatica.sqlite3')
+        if os.path.dirname(ruta):
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        self.ruta = ruta
+        self.max_parrafos = max_parrafos
+        self.aciertos = 0
+        self.fallos = 0
+        self._usados = {}
+        self._con = sqlite3.connect(ruta, timeout=30)
+        self._con.execute(
+            'CREATE TABLE IF NOT EXISTS parrafos ('
+            ' clave TEXT PRIMARY KEY, coincidencias TEXT NOT NULL, uso INTEGER NOT NULL)')
+        self._con.execute('CREATE INDEX IF NOT EXISTS parrafos_uso ON parrafos (uso)')
+        self._con.commit()
+
+    @staticmethod
+    def clave(parrafo, idioma, version):
+        """Hash del párrafo normalizado, el idioma y la versión del corrector."""
+        datos = '\0'.join((idioma, version, normalizar_parrafo(parrafo)))
+        return hashlib.sha256(datos.encode('utf-8')).hexdigest()
+
+    def obtener(self, clave):
+        """Devuelve las coincidencias guardadas o None si el párrafo no está."""
+        fila = self._con.execute(
+            'SELECT coincidencias FROM parrafos WHERE clave = ?', (clave,)).fetchone()
+        if fila is None:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        self._usados[clave] = time.time_ns()
+        return json.loads(fila[0])
+
+    def guardar(self, clave, coincidencias):
+        """Guarda las coincidencias (listas serializables) de un párrafo."""
+        self._con.execute(
+            'INSERT OR REPLACE INTO parrafos (clave, coincidencias, uso) VALUES (?, ?, ?)',
+            (clave, json.dumps(coincidencias, ensure_ascii=False), time.time_ns()))
+
+    def confirmar(self):
+        """Escribe los cambios pendientes y desaloja las entradas menos usadas."""
+        if self._usados:
+            self._con.executemany('UPDATE parrafos SET uso = ? WHERE clave = ?',
+                                  [(uso, clave) for clave, uso in self._usados.items()])
+            self._usados.clear()
+        self._con.execute(
+            'DELETE FROM parrafos WHERE clave IN ('
+            ' SELECT clave FROM parrafos ORDER BY uso DESC LIMIT -1 OFFSET ?)',
+            (self.max_parrafos,))
+        self._con.commit()
+
+    def estadisticas(self):
+        """Contadores de aciertos y fallos, y número de párrafos guardados."""
+        entradas = self._con.execute('SELECT COUNT(*) FROM parrafos').fetchone()[0]
+        return {'aciertos': self.aciertos, 'fallos': self.fallos, 'entradas': entradas}
+
+    def limpiar(self):
+        """Elimina todas las entradas."""
+        self._con.execute('DELETE FROM parrafos')
+        self._con.commit()
+
+    def cerrar(self):
+        self.confirmar()
+        self._con.close()
+
+
+# Tamaño máximo (en bytes) de los textos extraídos guardados antes de desalojar
+MAX_BYTES_EXTRACCION = 2 << 30
+
+# Versión de la extracción: cambiarla invalida todos los textos guardados
+VERSION_EXTRACCION = '1'
+
+# Tamaño de lectura al calcular el hash de un archivo
+_TAMANO_LECTURA = 1 << 20
+
+
+class CacheExtraccion:
+    """Caché LRU en disco del texto extraído de manuscritos PDF y DOCX.
+
+    Cada texto se guarda como un .txt nombrado por el hash del contenido del
+    original (y VERSION_EXTRACCION). Un índice SQLite recuerda la clave de cada
+    ruta junto con su tamaño y fecha de modificación, para no releer el original
+    si no ha cambiado, y el último uso de cada texto, para desalojar los menos
+    usados cuando el total supera max_bytes.
+    """
+
+    def __init__(self, directorio=None, max_bytes=MAX_BYTES_EXTRACCION):
+        if directorio is None:
+            directorio = directorio_cache('extraccion')
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self._con = sqlite3.connect(os.path.join(directorio, 'indice.sqlite3'), timeout=30)
+        self._con.execute(
+            'CREATE TABLE IF NOT EXISTS archivos ('
+            ' ruta TEXT PRIMARY KEY, tamano INTEGER NOT NULL, mtime INTEGER NOT NULL, clave TEXT NOT NULL)')
+        self._con.execute(
+            'CREATE TABLE IF NOT EXISTS textos ('
+            ' clave TEXT PRIMARY KEY, bytes INTEGER NOT NULL, uso INTEGER NOT NULL)')
+        self._con.commit()
+
+    @staticmethod
+    def hash_archivo(ruta):
+        """Hash del contenido del archivo y de la versión de la extracción."""
+        h = hashlib.sha256(VERSION_EXTRACCION.encode('ascii') + b'\0')
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(_TAMANO_LECTURA), b''):
+                h.update(bloque)
+        return h.hexdigest()
+
+    def clave(self, ruta):
+        """Clave del archivo; solo se recalcula el hash si cambió su tamaño o su fecha."""
+        ruta = os.path.abspath(ruta)
+        info = os.stat(ruta)
+        fila = self._con.execute(
+            'SELECT tamano, mtime, clave FROM archivos WHERE ruta = ?', (ruta,)).fetchone()
+        if fila is not None and fila[:2] == (info.st_size, info.st_mtime_ns):
+            return fila[2]
+        clave = self.hash_archivo(ruta)
+        self._con.execute('INSERT OR REPLACE INTO archivos (ruta, tamano, mtime, clave) VALUES (?, ?, ?, ?)',
+                          (ruta, info.st_size, info.st_mtime_ns, clave))
+        self._con.commit()
+        return clave
+
+    def obtener(self, ruta, extraer):
+        """Devuelve la ruta del .txt con el texto de `ruta`.
+
+        Si no está guardado, se escribe con los fragmentos que genere extraer(ruta)
+        (por ejemplo ProcesadorDeArchivos().iterar_texto). Una extracción que falla
+        no deja nada en la caché.
+        """
+        clave = self.clave(ruta)
+        destino = os.path.join(self.directorio, clave + '.txt')
+        fila = self._con.execute('SELECT 1 FROM textos WHERE clave = ?', (clave,)).fetchone()
+        if fila is not None and os.path.exists(destino):
+            self.aciertos += 1
+            self._con.execute('UPDATE textos SET uso = ? WHERE clave = ?', (time.time_ns(), clave))
+            self._con.commit()
+            return destino
+        self.fallos += 1
+        temporal = f'{destino}.{os.getpid()}.tmp'
+        try:
+            with open(temporal, 'w', encoding='utf-8') as f:
+                for fragmento in extraer(ruta):
+                    f.write(fragmento)
+            os.replace(temporal, destino)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+        self._con.execute('INSERT OR REPLACE INTO textos (clave, bytes, uso) VALUES (?, ?, ?)',
+                          (clave, os.path.getsize(destino), time.time_ns()))
+        self._desalojar()
+        self._con.commit()
+        return destino
+
+    def _desalojar(self):
+        """Borra los textos menos usados hasta quedar por debajo de max_bytes (conserva el último)."""
+        total = 0
+        sobrantes = []
+        for clave, tamano in self._con.execute('SELECT clave, bytes FROM textos ORDER BY uso DESC'):
+            total += tamano
+            if total > self.max_bytes and total > tamano:
+                sobrantes.append(clave)
+        self._borrar(sobrantes)
+
+    def _borrar(self, claves):
+        for clave in claves:
+            try:
+                os.remove(os.path.join(self.directorio, clave + '.txt'))
+            except FileNotFoundError:
+                pass
+        self._con.executemany('DELETE FROM textos WHERE clave = ?', [(c,) for c in claves])
+
+    def invalidar(self, ruta):
+        """Olvida el texto extraído de un archivo, que se volverá a extraer en el próximo uso."""
+        ruta = os.path.abspath(ruta)
+        fila = self._con.execute('SELECT clave FROM archivos WHERE ruta = ?', (ruta,)).fetchone()
+        if fila is not None:
+            self._borrar([fila[0]])
+            self._con.execute('DELETE FROM archivos WHERE clave = ?', (fila[0],))
+            self._con.commit()
+
+    def estadisticas(self):
+        """Contadores de aciertos y fallos, número de textos guardados y su tamaño total."""
+        entradas, total = self._con.execute('SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM textos').fetchone()
+        return {'aciertos': self.aciertos, 'fallos': self.fallos, 'entradas': entradas, 'bytes': total}
+
+    def limpiar(self):
+        """Elimina todos los textos guardados y el índice de archivos."""
+        self._borrar([c for c, in self._con.execute('SELECT clave FROM textos').fetchall()])
+        self._con.execute('DELETE FROM archivos')
+        self._con.commit()
+
+    def cerrar(self):
+        self._con.close()
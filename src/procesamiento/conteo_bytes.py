@@ -0,0 +1,218 @@
+"""
+Conteo rápido de palabras, sílabas, oraciones, capítulos y párrafos en TXT UTF-8.
+Editorial Nuevo Milenio
+
+El archivo se proyecta en memoria (mmap) y se recorre como bytes, sin
+decodificarlo entero a str ni construir listas de palabras:
+
+- Las palabras se cuentan traduciendo cada bloque a una máscara de bytes
+  ('a' para los bytes que pueden formar parte de una palabra, ' ' para el
+  resto) y contando los inicios de palabra con bytes.count. Los bytes no
+  ASCII se consideran de palabra (así se cuentan bien 'canción' o 'niño'), y
+  después se corrigen los pocos tramos de caracteres no ASCII que no lo son
+  ('¿', '«', '—', espacio duro...), localizados con una expresión regular
+  sobre bytes.
+- Oraciones, capítulos y párrafos se cuentan con bytes.count o con
+  expresiones regulares sobre bytes equivalentes a las de utils.py.
+- Para las sílabas, los bytes ASCII que no son de palabra se traducen a
+  espacios y los bloques se parten con bytes.split en formas, que se agrupan
+  en un Counter. Al final se decodifica y silabea cada forma distinta una
+  vez; las que contienen caracteres no ASCII se vuelven a partir con
+  \\w+, por si alguno de ellos no es de palabra.
+
+Las clases de caracteres de las expresiones sobre bytes se generan a partir
+de las de 're' (\\w y \\s) la primera vez que se usan, de modo que el
+resultado coincide con escanear_texto sobre el texto decodificado.
+"""
+
+import codecs
+import mmap
+import os
+import re
+from collections import Counter
+
+from silabas import contar_silabas_formas
+
+# Tamaño (en bytes) de los bloques de la máscara de palabras y de la validación UTF-8
+TAMANO_BLOQUE_BYTES = 1 << 20
+
+# Bytes ASCII que forman palabras según \w; los no ASCII se tratan aparte
+_PALABRA_ASCII = frozenset(b'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz')
+_MASCARA = bytes(0x61 if b in _PALABRA_ASCII or b >= 0x80 else 0x20 for b in range(256))
+_ES_PALABRA = bytes(_MASCARA[b] == 0x61 for b in range(256))
+
+# Límites de cada longitud de codificación UTF-8
+_LIMITES_UTF8 = (0x7F, 0x7FF, 0xFFFF, 0x10FFFF)
+
+# Como _MASCARA, pero conservando los bytes de palabra en lugar de sustituirlos por 'a'
+_SEPARADORES = bytes(b if _MASCARA[b] == 0x61 else 0x20 for b in range(256))
+
+_PALABRA = re.compile(r'\w+')
+
+_patrones = None
+
+
+def _rangos(patron, texto, desplazamiento):
+    """Rangos (inicio, fin) de puntos de código de texto que coinciden con patron."""
+    return [(m.start() + desplazamiento, m.end() - 1 + desplazamiento) for m in patron.finditer(texto)]
+
+
+def _secuencias_utf8(inicio, fin):
+    """Divide un rango de puntos de código en secuencias de rangos de bytes UTF-8.
+
+    Cada secuencia es una lista de pares (primer byte, último byte) por
+    posición, y todas las combinaciones que describe son caracteres del rango.
+    """
+    for limite in _LIMITES_UTF8:
+        if inicio <= limite < fin:
+            yield from _secuencias_utf8(inicio, limite)
+            yield from _secuencias_utf8(limite + 1, fin)
+            return
+    longitud = len(chr(inicio).encode('utf-8'))
+    for i in range(1, longitud):
+        mascara = (1 << (6 * i)) - 1
+        if inicio & ~mascara != fin & ~mascara:
+            if inicio & mascara:
+                yield from _secuencias_utf8(inicio, inicio | mascara)
+                yield from _secuencias_utf8((inicio | mascara) + 1, fin)
+                return
+            if fin & mascara != mascara:
+                yield from _secuencias_utf8(inicio, (fin & ~mascara) - 1)
+                yield from _secuencias_utf8(fin & ~mascara, fin)
+                return
+    yield list(zip(chr(inicio).encode('utf-8'), chr(fin).encode('utf-8')))
+
+
+def _clase(desde, hasta):
+    if desde == hasta:
+        return re.escape(bytes([desde]))
+    return b'[' + re.escape(bytes([desde])) + b'-' + re.escape(bytes([hasta])) + b']'
+
+
+def _patron_caracter(rangos):
+    """Expresión sobre bytes que reconoce un carácter no ASCII de los rangos dados.
+
+    Es una alternativa por byte inicial que empieza por ese byte literal; así
+    're' salta deprisa las posiciones que no pueden empezar una coincidencia
+    y descarta cada rama con una sola comparación.
+    """
+    continuaciones = {}
+    for inicio, fin in rangos:
+        for secuencia in _secuencias_utf8(inicio, fin):
+            resto = b''.join(_clase(*par) for par in secuencia[1:])
+            for inicial in range(secuencia[0][0], secuencia[0][1] + 1):
+                continuaciones.setdefault(inicial, []).append(resto)
+    ramas = [re.escape(bytes([b])) + b'(?:' + b'|'.join(restos) + b')'
+             for b, restos in sorted(continuaciones.items())]
+    return b'(?:' + b'|'.join(ramas) + b')'
+
+
+def _compilar_patrones():
+    """Genera las expresiones sobre bytes a partir de las clases \\w y \\s de 're'."""
+    global _patrones
+    if _patrones is not None:
+        return _patrones
+    # Todos los caracteres no ASCII codificables (sin sustitutos)
+    bajo = ''.join(map(chr, range(0x80, 0xD800)))
+    alto = ''.join(map(chr, range(0xE000, 0x110000)))
+    no_palabra = _rangos(re.compile(r'\W+'), bajo, 0x80) + _rangos(re.compile(r'\W+'), alto, 0xE000)
+    espacio = _rangos(re.compile(r'\s+'), bajo, 0x80) + _rangos(re.compile(r'\s+'), alto, 0xE000)
+
+    no_palabra_unicode = _patron_caracter(no_palabra)
+    espacio_unicode = _patron_caracter(espacio)
+    # \s y [^\S\n] de utils.py, sobre bytes
+    s = b'(?:[\\t\\n\\x0b\\x0c\\r \\x1c-\\x1f]|' + espacio_unicode + b')'
+    s_sin_salto = b'(?:[\\t\\x0b\\x0c\\r \\x1c-\\x1f]|' + espacio_unicode + b')'
+    _patrones = {
+        'no_palabra': re.compile(no_palabra_unicode + b'(?:' + no_palabra_unicode + b')*'),
+        'espacio_inicial': re.compile(s + b'*'),
+        'parrafo': re.compile(b'\\n' + s_sin_salto + b'*\\n' + s + b'*(?!' + s + b')(?s:.)'),
+        'capitulo': re.compile(b'\\n[Cc][Aa][Pp]\\xc3[\\xad\\x8d][Tt][Uu][Ll][Oo]'),
+        'capitulo_inicial': re.compile(b'[Cc][Aa][Pp]\\xc3[\\xad\\x8d][Tt][Uu][Ll][Oo]'),
+        'retorno_suelto': re.compile(b'\\r(?!\\n)'),
+    }
+    return _patrones
+
+
+def contar_mapa(datos):
+    """Cuenta sobre un objeto de bytes (o mmap) con texto UTF-8.
+
+    Devuelve (conteo, caracteres) con las claves de conteo de utils.py:
+    palabra, capitulo, oracion, parrafo y silaba. 'palabra' incluye los encabezados
+    de capítulo. Lanza UnicodeDecodeError si los datos no son UTF-8 válido.
+    Devuelve None si contienen retornos de carro sueltos, que la lectura en
+    modo texto convertiría en saltos de línea.
+    """
+    patrones = _compilar_patrones()
+    if patrones['retorno_suelto'].search(datos):
+        return None
+    total = len(datos)
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    caracteres = palabras = oraciones = 0
+    anterior = 0x20
+    formas = Counter()
+    # Forma que quedó partida al final del bloque anterior
+    arrastre = b''
+    for desde in range(0, total, TAMANO_BLOQUE_BYTES):
+        bloque = datos[desde:desde + TAMANO_BLOQUE_BYTES]
+        caracteres += len(decodificador.decode(bloque))
+        trozos = (arrastre + bloque.translate(_SEPARADORES)).split()
+        arrastre = trozos.pop() if trozos and _ES_PALABRA[bloque[-1]] else b''
+        formas.update(trozos)
+        mascara = bloque.translate(_MASCARA)
+        palabras += mascara.count(b' a') + (anterior == 0x20 and mascara[0] == 0x61)
+        anterior = mascara[-1]
+        oraciones += bloque.count(b'.') + bloque.count(b'!') + bloque.count(b'?')
+    caracteres += len(decodificador.decode(b'', final=True))
+    if arrastre:
+        formas[arrastre] += 1
+    # Los '\r\n' se leen como un solo carácter en modo texto
+    caracteres -= _contar_crlf(datos)
+
+    # Tramos no ASCII que no son de palabra: la máscara los dio por palabra
+    for m in patrones['no_palabra'].finditer(datos):
+        inicio, fin = m.span()
+        palabras += ((inicio > 0 and _ES_PALABRA[datos[inicio - 1]])
+                     + (fin < total and _ES_PALABRA[datos[fin]]) - 1)
+
+    capitulos = sum(1 for _ in patrones['capitulo'].finditer(datos))
+    capitulos += patrones['capitulo_inicial'].match(datos) is not None
+
+    # El primer párrafo empieza en el primer carácter visible; los demás, tras una línea en blanco
+    parrafos = 0
+    primero = patrones['espacio_inicial'].match(datos).end()
+    if primero < total:
+        parrafos = 1 + sum(1 for _ in patrones['parrafo'].finditer(datos, primero))
+
+    conteo = {'palabra': palabras - capitulos, 'capitulo': capitulos,
+              'oracion': oraciones, 'parrafo': parrafos, 'silaba': _contar_silabas(formas)}
+    return conteo, caracteres
+
+
+def _contar_silabas(formas):
+    """Sílabas de un Counter de formas en bytes (UTF-8 ya validado)."""
+    silabas = Counter()
+    for forma, n in formas.items():
+        texto = forma.decode('utf-8')
+        for palabra in ((texto,) if forma.isascii() else _PALABRA.findall(texto)):
+            silabas[palabra] += n
+    return contar_silabas_formas(silabas)
+
+
+def _contar_crlf(datos):
+    """Cuenta los pares CRLF por bloques, sin copiar los datos enteros."""
+    cantidad = 0
+    for desde in range(0, len(datos), TAMANO_BLOQUE_BYTES):
+        # Un byte de solape para no perder pares partidos entre bloques
+        cantidad += datos[desde:desde + TAMANO_BLOQUE_BYTES + 1].count(b'\r\n')
+    return cantidad
+
+
+def contar_archivo(ruta):
+    """Como contar_mapa, pero proyectando en memoria un archivo .txt UTF-8."""
+    with open(ruta, 'rb') as f:
+        # mmap no admite archivos vacíos
+        if not os.fstat(f.fileno()).st_size:
+            return contar_mapa(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            return contar_mapa(datos)
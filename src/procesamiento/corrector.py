@@ -0,0 +1,382 @@
+"""
+Corrector gramatical persistente para todo el proceso.
+Editorial Nuevo Milenio
+
+LanguageTool arranca un servidor Java en cada instancia, lo que cuesta más que
+revisar un manuscrito típico. Este módulo mantiene las instancias vivas,
+las arranca al primer uso, las reinicia si dejan de responder y las cierra al
+salir. Los textos largos se reparten por fragmentos entre un pool de correctores.
+
+El backend es intercambiable: cualquier fábrica que reciba el idioma y devuelva
+un objeto con check(texto) y close() sirve (por ejemplo, un corrector falso en tests).
+"""
+
+import atexit
+import os
+import queue
+import re
+import threading
+from bisect import bisect_right
+from collections import namedtuple
+
+IDIOMA = 'es'
+
+# Tamaño máximo orientativo (en caracteres) de cada fragmento enviado al backend
+TAMANO_FRAGMENTO = 20000
+
+# Número de correctores del pool compartido
+NUM_CORRECTORES = int(os.environ.get('ECDOTICA_CORRECTORES', min(4, os.cpu_count() or 1)))
+
+# Coincidencia normalizada, con offset relativo al documento completo
+Coincidencia = namedtuple('Coincidencia', 'offset longitud regla mensaje sugerencias')
+
+_CORTE_PARRAFO = re.compile(r'\n[^\S\n]*\n\s*')
+_CORTE_ORACION = re.compile(r'[.!?]+\s+')
+
+
+class BackendLanguageTool:
+    """Backend real basado en language_tool_python.
+
+    Requiere: pip install language-tool-python
+    """
+
+    def __init__(self, idioma=IDIOMA):
+        import language_tool_python
+        self.idioma = idioma
+        self._tool = language_tool_python.LanguageTool(idioma)
+
+    @staticmethod
+    def version():
+        """Versión de language_tool_python, obtenida sin arrancar el servidor."""
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            return version('language-tool-python')
+        except PackageNotFoundError:
+            return ''
+
+    def check(self, texto):
+        return self._tool.check(texto)
+
+    def close(self):
+        self._tool.close()
+
+
+class CorrectorGramatical:
+    """Envuelve un backend de revisión y lo mantiene vivo entre llamadas."""
+
+    def __init__(self, fabrica=BackendLanguageTool, idioma=IDIOMA):
+        self.fabrica = fabrica
+        self.idioma = idioma
+        self.reinicios = 0
+        self._backend = None
+        self._lock = threading.Lock()
+
+    def revisar(self, texto):
+        """Devuelve las coincidencias del backend para el texto.
+
+        Si el backend falla durante la revisión se descarta, se arranca uno nuevo
+        y se reintenta una vez. Un ImportError al arrancar se propaga tal cual.
+        """
+        with self._lock:
+            backend = self._iniciar()
+            try:
+                return backend.check(texto)
+            except Exception:
+                self._descartar()
+                self.reinicios += 1
+                return self._iniciar().check(texto)
+
+    def version(self):
+        """Versión del backend, si la fábrica la declara (sin arrancarlo)."""
+        version = getattr(self.fabrica, 'version', None)
+        return version() if version else ''
+
+    def esta_activo(self):
+        """Comprueba que el backend está arrancado y responde."""
+        with self._lock:
+            if self._backend is None:
+                return False
+            try:
+                self._backend.check('')
+                return True
+            except Exception:
+                self._descartar()
+                return False
+
+    def cerrar(self):
+        """Detiene el backend; se volverá a arrancar en la siguiente revisión."""
+        with self._lock:
+            self._descartar()
+
+    def _iniciar(self):
+        if self._backend is None:
+            self._backend = self.fabrica(self.idioma)
+        return self._backend
+
+    def _descartar(self):
+        backend, self._backend = self._backend, None
+        if backend is not None:
+            try:
+                backend.close()
+            except Exception:
+                pass
+
+
+class PoolDeCorrectores:
+    """Conjunto de correctores que revisan fragmentos de un texto en paralelo.
+
+    Cada corrector se arranca solo cuando un fragmento lo necesita, así que un
+    texto corto no llega a levantar más de un backend.
+    """
+
+    def __init__(self, tamano=NUM_CORRECTORES, fabrica=BackendLanguageTool, idioma=IDIOMA):
+        self.correctores = [CorrectorGramatical(fabrica, idioma) for _ in range(max(1, tamano))]
+        self._libres = queue.Queue()
+        for c in self.correctores:
+            self._libres.put(c)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def revisar(self, texto, tamano_fragmento=TAMANO_FRAGMENTO, cache=None):
+        """Revisa el texto por fragmentos y devuelve Coincidencias ordenadas por offset.
+
+        Con una CacheGramatical solo se envían al backend los párrafos que no estén
+        en ella, y los nuevos resultados se guardan por párrafo. En ese modo se
+        descartan las coincidencias situadas en los espacios entre párrafos.
+        """
+        if cache is not None:
+            return self._revisar_con_cache(texto, tamano_fragmento, cache)
+        fragmentos = dividir_en_fragmentos(texto, tamano_fragmento)
+        return fusionar_coincidencias(self._revisar_fragmentos(texto, fragmentos))
+
+    def cerrar(self):
+        """Detiene los backends y los hilos del pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        for c in self.correctores:
+            c.cerrar()
+
+    def _revisar_con_cache(self, texto, tamano_fragmento, cache):
+        corrector = self.correctores[0]
+        resultados = []
+        pendientes = []
+        for n, (inicio, fin) in enumerate(dividir_en_parrafos(texto)):
+            clave = cache.clave(texto[inicio:fin], corrector.idioma, corrector.version())
+            guardadas = cache.obtener(clave)
+            if guardadas is None:
+                pendientes.append((n, inicio, fin, clave))
+            else:
+                resultados.append([Coincidencia(offset + inicio, *resto)
+                                   for offset, *resto in guardadas])
+        grupos = _agrupar_consecutivos(pendientes, tamano_fragmento)
+        fragmentos = [(grupo[0][1], grupo[-1][2]) for grupo in grupos]
+        for grupo, coincidencias in zip(grupos, self._revisar_fragmentos(texto, fragmentos)):
+            inicios = [p[1] for p in grupo]
+            por_parrafo = [[] for _ in grupo]
+            for c in coincidencias:
+                i = bisect_right(inicios, c.offset) - 1
+                if i >= 0 and c.offset < grupo[i][2]:
+                    por_parrafo[i].append(c)
+            for (_, inicio, _, clave), lista in zip(grupo, por_parrafo):
+                cache.guardar(clave, [[c.offset - inicio, *c[1:]] for c in lista])
+                resultados.append(lista)
+        cache.confirmar()
+        return fusionar_coincidencias(resultados)
+
+    def _revisar_fragmentos(self, texto, fragmentos):
+        if len(fragmentos) <= 1 or len(self.correctores) == 1:
+            return [self._revisar_fragmento(texto, i, f) for i, f in fragmentos]
+        return list(self._obtener_executor().map(
+            lambda f: self._revisar_fragmento(texto, *f), fragmentos))
+
+    def _revisar_fragmento(self, texto, inicio, fin):
+        corrector = self._libres.get()
+        try:
+            matches = corrector.revisar(texto[inicio:fin])
+        finally:
+            self._libres.put(corrector)
+        return [_normalizar(m, inicio) for m in matches]
+
+    def _obtener_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(len(self.correctores),
+                                                    thread_name_prefix='corrector')
+            return self._executor
+
+
+def dividir_en_fragmentos(texto, tamano=TAMANO_FRAGMENTO):
+    """Divide el texto en tramos contiguos (inicio, fin) de hasta ~tamano caracteres.
+
+    Se corta al inicio de un párrafo y, si no hay ninguno en el tramo, al inicio de
+    una oración. Un párrafo u oración más largo que tamano queda en un solo tramo.
+    """
+    fragmentos = []
+    inicio = 0
+    n = len(texto)
+    while n - inicio > tamano:
+        limite = inicio + tamano
+        corte = ultimo_corte(texto, inicio, limite) or _siguiente_corte(texto, limite)
+        if corte >= n:
+            break
+        fragmentos.append((inicio, corte))
+        inicio = corte
+    if inicio < n:
+        fragmentos.append((inicio, n))
+    return fragmentos
+
+
+def ultimo_corte(texto, inicio=0, limite=None):
+    """Offset del último inicio de párrafo en (inicio, limite) o, si no hay, del
+    último inicio de oración; None si no hay ninguno.
+
+    Son los mismos cortes que usa dividir_en_fragmentos, así que un texto que se
+    revisa por partes cortadas aquí da las mismas coincidencias que entero.
+    """
+    limite = len(texto) if limite is None else limite
+    return (_ultimo_corte(_CORTE_PARRAFO, texto, inicio, limite)
+            or _ultimo_corte(_CORTE_ORACION, texto, inicio, limite))
+
+
+def dividir_en_parrafos(texto):
+    """Tramos (inicio, fin) de cada párrafo, sin los espacios que lo rodean."""
+    parrafos = []
+    inicio = 0
+    for m in [*_CORTE_PARRAFO.finditer(texto), None]:
+        fin = m.start() if m else len(texto)
+        bloque = texto[inicio:fin]
+        contenido = bloque.strip()
+        if contenido:
+            a = inicio + len(bloque) - len(bloque.lstrip())
+            parrafos.append((a, a + len(contenido)))
+        if m:
+            inicio = m.end()
+    return parrafos
+
+
+def _agrupar_consecutivos(pendientes, tamano):
+    """Agrupa párrafos pendientes contiguos en el texto hasta ~tamano caracteres."""
+    grupos = []
+    for p in pendientes:
+        n, inicio, fin, _ = p
+        if grupos:
+            ultimo = grupos[-1][-1]
+            if ultimo[0] == n - 1 and fin - grupos[-1][0][1] <= tamano:
+                grupos[-1].append(p)
+                continue
+        grupos.append([p])
+    return grupos
+
+
+def _ultimo_corte(patron, texto, inicio, limite):
+    corte = None
+    for m in patron.finditer(texto, inicio, limite):
+        if inicio < m.end() < limite:
+            corte = m.end()
+    return corte
+
+
+def _siguiente_corte(texto, desde):
+    for patron in (_CORTE_PARRAFO, _CORTE_ORACION):
+        m = patron.search(texto, desde)
+        if m:
+            return m.end()
+    return len(texto)
+
+
+def fusionar_coincidencias(grupos):
+    """Une listas de Coincidencias, descartando duplicados y ordenando por offset."""
+    vistas = set()
+    resultado = []
+    for grupo in grupos:
+        for c in grupo:
+            clave = (c.offset, c.longitud, c.regla)
+            if clave not in vistas:
+                vistas.add(clave)
+                resultado.append(c)
+    resultado.sort(key=lambda c: (c.offset, c.longitud))
+    return resultado
+
+
+def _normalizar(match, desplazamiento):
+    """Convierte un Match de LanguageTool en Coincidencia con offset absoluto."""
+    return Coincidencia(
+        offset=match.offset + desplazamiento,
+        longitud=match.errorLength,
+        regla=match.ruleId,
+        mensaje=match.message,
+        sugerencias=list(match.replacements),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Instancias compartidas por el proceso
+# ---------------------------------------------------------------------------
+
+_fabrica = BackendLanguageTool
+_pool = None
+_lock_global = threading.Lock()
+
+
+def obtener_pool():
+    """Devuelve el pool compartido, creándolo (sin arrancar backends) si hace falta."""
+    global _pool
+    with _lock_global:
+        if _pool is None:
+            _pool = PoolDeCorrectores(NUM_CORRECTORES, _fabrica)
+        return _pool
+
+
+def obtener_corrector():
+    """Devuelve el corrector compartido (el primero del pool)."""
+    return obtener_pool().correctores[0]
+
+
+def revisar_texto(texto, tamano_fragmento=TAMANO_FRAGMENTO, cache=None):
+    """Revisa el texto con el pool compartido y devuelve sus Coincidencias."""
+    return obtener_pool().revisar(texto, tamano_fragmento, cache)
+
+
+def backend_disponible():
+    """Indica, sin arrancarlo, si el backend configurado puede revisar textos.
+
+    Solo LanguageTool puede faltar: con otra fábrica se supone que sí.
+    """
+    if _fabrica is not BackendLanguageTool:
+        return True
+    from importlib.util import find_spec
+    return find_spec('language_tool_python') is not None
+
+
+def configurar_backend(fabrica=None):
+    """Cambia la fábrica de backends del corrector compartido.
+
+    Con fabrica=None se vuelve a LanguageTool. El corrector anterior se cierra.
+    """
+    global _fabrica
+    cerrar_corrector()
+    _fabrica = fabrica or BackendLanguageTool
+
+
+def cerrar_corrector():
+    """Cierra los correctores compartidos si existen."""
+    global _pool
+    with _lock_global:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.cerrar()
+
+
+def _olvidar_corrector():
+    # Un proceso hijo no debe reutilizar ni cerrar los servidores de su padre.
+    global _pool, _lock_global
+    _pool = None
+    _lock_global = threading.Lock()
+
+
+atexit.register(cerrar_corrector)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_olvidar_corrector)
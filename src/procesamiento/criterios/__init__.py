@@ -1,8 +1,19 @@
 """
 Módulo de criterios editoriales para diferentes géneros literarios.
 Editorial Nuevo Milenio
+
+Los submódulos se importan al primer acceso (criterios.novela, etc.) para no
+pagar su carga cuando solo se evalúa un género. Cada uno guarda en UMBRALES
+los umbrales editoriales del género, que evaluacion_masiva.py aplica también
+a columnas de estadísticas.
 """
 
-from . import novela, cuento, poema, ensayo, cronica
+import importlib
 
 __all__ = ['novela', 'cuento', 'poema', 'ensayo', 'cronica']
+
+
+def __getattr__(nombre):
+    if nombre in __all__:
+        return importlib.import_module(f'{__name__}.{nombre}')
+    raise AttributeError(f'module {__name__!r} has no attribute {nombre!r}')
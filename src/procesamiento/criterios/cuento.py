@@ -3,27 +3,37 @@ Módulo de criterios editoriales para cuento.
 Editorial Nuevo Milenio
 """
 
+UMBRALES = {
+    'errores_por': 5000,  # la tasa de errores se mide por cada errores_por palabras
+    'max_errores': 5,
+    'min_palabras': 1000,
+    'max_palabras': 30000,
+    'min_legibilidad': 60,
+}
+
 
 def evaluar_ortografia_gramatica(stats):
     """Evalúa ortografía y gramática. Se espera menos de 5 errores graves por cada 5,000 palabras."""
     errores_graves = stats.get('errores_graves', 0)
-    palabras = stats.get('num_palabras', 1)
-    tasa_error = errores_graves / palabras * 5000
+    palabras = stats.get('num_palabras') or 1
+    por = UMBRALES['errores_por']
+    tasa_error = errores_graves / palabras * por
     return {
-        'cumple': tasa_error < 5,
+        'cumple': tasa_error < UMBRALES['max_errores'],
         'tasa_error': tasa_error,
-        'mensaje': f'Tasa de errores: {tasa_error:.2f} por 5,000 palabras'
+        'mensaje': f'Tasa de errores: {tasa_error:.2f} por {por:,} palabras'
     }
 
 
 def evaluar_longitud(stats):
     """Evalúa el rango de palabras del cuento. Entre 1,000 y 30,000 palabras."""
     palabras = stats.get('num_palabras', 0)
-    cumple = 1000 <= palabras <= 30000
-    if palabras < 1000:
-        mensaje = f'El cuento tiene {palabras} palabras. Mínimo requerido: 1,000'
-    elif palabras > 30000:
-        mensaje = f'El cuento tiene {palabras} palabras. Máximo recomendado: 30,000'
+    minimo, maximo = UMBRALES['min_palabras'], UMBRALES['max_palabras']
+    cumple = minimo <= palabras <= maximo
+    if palabras < minimo:
+        mensaje = f'El cuento tiene {palabras} palabras. Mínimo requerido: {minimo:,}'
+    elif palabras > maximo:
+        mensaje = f'El cuento tiene {palabras} palabras. Máximo recomendado: {maximo:,}'
     else:
         mensaje = f'Longitud adecuada: {palabras} palabras'
     return {
@@ -44,8 +54,8 @@ def evaluar_estructura(stats):
 def evaluar_legibilidad(stats):
     """Evalúa el índice de legibilidad. Debe ser al menos 60."""
     indice = stats.get('indice_legibilidad', 100)
-    cumple = indice >= 60
-    mensaje = f'Índice de legibilidad: {indice:.2f}. Mínimo recomendado: 60'
+    cumple = indice >= UMBRALES['min_legibilidad']
+    mensaje = f'Índice de legibilidad: {indice:.2f}. Mínimo recomendado: {UMBRALES["min_legibilidad"]}'
     return {
         'cumple': cumple,
         'indice': indice,
@@ -53,6 +63,15 @@ def evaluar_legibilidad(stats):
     }
 
 
+# Datos del manuscrito que lee cada criterio (ver motor_reglas.py)
+REQUISITOS = {
+    'ortografia_gramatica': ('errores_graves', 'num_palabras'),
+    'longitud': ('num_palabras',),
+    'estructura': (),
+    'legibilidad': ('indice_legibilidad',),
+}
+
+
 def evaluar_cuento(stats):
     """Evalúa todos los criterios y devuelve dict con resultados detallados."""
     return {
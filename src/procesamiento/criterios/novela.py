@@ -3,27 +3,43 @@ Módulo de criterios editoriales para novela.
 Editorial Nuevo Milenio
 """
 
+UMBRALES = {
+    'errores_por': 10000,  # la tasa de errores se mide por cada errores_por palabras
+    'max_errores': 10,
+    'min_palabras': 30000,
+    'max_palabras': 150000,
+    'min_capitulos': 3,
+    # Palabras del capítulo más largo / las del más corto. None: el equilibrio
+    # solo se informa; con un número, también decide la estructura
+    'max_desequilibrio': None,
+    # Los capítulos más cortos (líneas de un índice, títulos sueltos) no cuentan para el equilibrio
+    'min_palabras_capitulo': 50,
+    'min_legibilidad': 50,
+}
+
 
 def evaluar_ortografia_gramatica(stats):
     """Evalúa ortografía y gramática. Se espera menos de 10 errores graves por cada 10,000 palabras."""
     errores_graves = stats.get('errores_graves', 0)
-    palabras = stats.get('num_palabras', 1)
-    tasa_error = errores_graves / palabras * 10000
+    palabras = stats.get('num_palabras') or 1
+    por = UMBRALES['errores_por']
+    tasa_error = errores_graves / palabras * por
     return {
-        'cumple': tasa_error < 10,
+        'cumple': tasa_error < UMBRALES['max_errores'],
         'tasa_error': tasa_error,
-        'mensaje': f'Tasa de errores: {tasa_error:.2f} por 10,000 palabras'
+        'mensaje': f'Tasa de errores: {tasa_error:.2f} por {por:,} palabras'
     }
 
 
 def evaluar_longitud(stats):
     """Evalúa el rango de palabras de la novela. Entre 30,000 y 150,000 palabras."""
     palabras = stats.get('num_palabras', 0)
-    cumple = 30000 <= palabras <= 150000
-    if palabras < 30000:
-        mensaje = f'La novela tiene {palabras} palabras. Mínimo requerido: 30,000'
-    elif palabras > 150000:
-        mensaje = f'La novela tiene {palabras} palabras. Máximo recomendado: 150,000'
+    minimo, maximo = UMBRALES['min_palabras'], UMBRALES['max_palabras']
+    cumple = minimo <= palabras <= maximo
+    if palabras < minimo:
+        mensaje = f'La novela tiene {palabras} palabras. Mínimo requerido: {minimo:,}'
+    elif palabras > maximo:
+        mensaje = f'La novela tiene {palabras} palabras. Máximo recomendado: {maximo:,}'
     else:
         mensaje = f'Longitud adecuada: {palabras} palabras'
     return {
@@ -33,14 +49,43 @@ def evaluar_longitud(stats):
     }
 
 
+def desequilibrio_capitulos(capitulos, min_palabras=None):
+    """Palabras del capítulo más largo divididas por las del más corto.
+
+    Ignora los capítulos de menos de min_palabras palabras (por defecto,
+    UMBRALES['min_palabras_capitulo']); devuelve None si no queda ninguno.
+    """
+    if min_palabras is None:
+        min_palabras = UMBRALES['min_palabras_capitulo']
+    palabras = [c['num_palabras'] for c in capitulos if c['num_palabras'] >= min_palabras]
+    if not palabras:
+        return None
+    return max(palabras) / max(min(palabras), 1)
+
+
 def evaluar_estructura(stats):
-    """Evalúa si la novela tiene capítulos. Se requieren al menos 3 capítulos."""
+    """Evalúa si la novela tiene capítulos. Se requieren al menos 3 capítulos.
+
+    Si las estadísticas traen el desglose por capítulos ('capitulos'), el
+    resultado incluye su desequilibrio; solo decide el veredicto si
+    UMBRALES['max_desequilibrio'] tiene un valor.
+    """
     num_capitulos = stats.get('num_capitulos', 0)
-    cumple = num_capitulos >= 3
-    mensaje = f'Capítulos detectados: {num_capitulos}. Mínimo requerido: 3'
+    cumple = num_capitulos >= UMBRALES['min_capitulos']
+    mensaje = f'Capítulos detectados: {num_capitulos}. Mínimo requerido: {UMBRALES["min_capitulos"]}'
+    resultado = {'num_capitulos': num_capitulos}
+    capitulos = stats.get('capitulos')
+    desequilibrio = desequilibrio_capitulos(capitulos) if capitulos else None
+    if desequilibrio is not None:
+        maximo = UMBRALES['max_desequilibrio']
+        mensaje += f'. El capítulo más largo tiene {desequilibrio:.1f} veces las palabras del más corto'
+        if maximo is not None:
+            cumple = cumple and desequilibrio <= maximo
+            mensaje += f' (máximo {maximo})'
+        resultado['desequilibrio'] = desequilibrio
     return {
         'cumple': cumple,
-        'num_capitulos': num_capitulos,
+        **resultado,
         'mensaje': mensaje
     }
 
@@ -48,8 +93,8 @@ def evaluar_estructura(stats):
 def evaluar_legibilidad(stats):
     """Evalúa el índice de legibilidad. Debe ser al menos 50."""
     indice = stats.get('indice_legibilidad', 100)
-    cumple = indice >= 50
-    mensaje = f'Índice de legibilidad: {indice:.2f}. Mínimo recomendado: 50'
+    cumple = indice >= UMBRALES['min_legibilidad']
+    mensaje = f'Índice de legibilidad: {indice:.2f}. Mínimo recomendado: {UMBRALES["min_legibilidad"]}'
     return {
         'cumple': cumple,
         'indice': indice,
@@ -57,6 +102,24 @@ def evaluar_legibilidad(stats):
     }
 
 
+def requisitos_estructura():
+    """Datos que lee evaluar_estructura con los UMBRALES actuales.
+
+    El desglose por capítulos solo se pide si el equilibrio decide el veredicto.
+    """
+    return ('num_capitulos',) + (('capitulos',) if UMBRALES['max_desequilibrio'] is not None else ())
+
+
+# Datos del manuscrito que lee cada criterio (ver motor_reglas.py); una función
+# se llama al construir las reglas, para que siga a los UMBRALES
+REQUISITOS = {
+    'ortografia_gramatica': ('errores_graves', 'num_palabras'),
+    'longitud': ('num_palabras',),
+    'estructura': requisitos_estructura,
+    'legibilidad': ('indice_legibilidad',),
+}
+
+
 def evaluar_novela(stats):
     """Evalúa todos los criterios y devuelve dict con resultados detallados."""
     return {
@@ -0,0 +1,15 @@
+"""
+Ubicación de las cachés en disco de Ecdotica.
+Editorial Nuevo Milenio
+
+No importa nada del proyecto ni guarda estado, así que la usan tanto los
+módulos de procesamiento (cache.py) como los del editor (erratas.py).
+"""
+
+import os
+
+
+def directorio_cache(*partes):
+    """Ruta dentro del directorio de cachés: $ECDOTICA_CACHE o, si no está definida, ~/.cache/ecdotica."""
+    base = os.environ.get('ECDOTICA_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'ecdotica'))
+    return os.path.join(base, *partes)
@@ -0,0 +1,75 @@
+"""
+Evaluación vectorizada de muchos diccionarios de estadísticas.
+Editorial Nuevo Milenio
+
+Para volver a puntuar un archivo de estadísticas guardadas (por ejemplo, tras
+cambiar los umbrales de un género) sin llamar a evaluar_<genero> registro a
+registro: los registros se cargan en columnas de NumPy y cada criterio es una
+operación sobre la columna entera. Los veredictos coinciden con los de los
+módulos de criterios, con los mismos valores por defecto para las claves que
+falten.
+
+Requiere: pip install numpy
+"""
+
+from criterios.novela import desequilibrio_capitulos
+from evaluador import GENERO_CRITERIOS
+
+# Claves de las estadísticas que leen los criterios
+CLAVES = ('num_palabras', 'num_capitulos', 'indice_legibilidad', 'errores_graves')
+
+
+def cargar_columnas(registros, claves=CLAVES):
+    """Convierte una secuencia de dicts de estadísticas en {clave: array de float}.
+
+    Las claves que falten en un registro quedan como NaN. El desglose por
+    capítulos, si lo hay, se resume en la columna 'desequilibrio_capitulos'.
+    """
+    import numpy as np
+    columnas = {clave: np.fromiter((r.get(clave, np.nan) for r in registros), float, len(registros))
+                for clave in claves}
+    desequilibrios = (desequilibrio_capitulos(r['capitulos']) if r.get('capitulos') else None for r in registros)
+    columnas['desequilibrio_capitulos'] = np.fromiter(
+        (np.nan if d is None else d for d in desequilibrios), float, len(registros))
+    return columnas
+
+
+def evaluar_columnas(columnas, genero, umbrales=None):
+    """Aplica los criterios del género a columnas de estadísticas (ver cargar_columnas).
+
+    Devuelve {criterio: array de bool} con los mismos nombres que evaluar_<genero>,
+    más 'apto' (todos los criterios) y 'tasa_error'. Sin umbrales se usan los
+    UMBRALES del módulo de criterios del género.
+    """
+    import numpy as np
+    if genero not in GENERO_CRITERIOS:
+        raise ValueError(f'Género no implementado: {genero}')
+    if umbrales is None:
+        umbrales = GENERO_CRITERIOS.modulo(genero).UMBRALES
+
+    def columna(clave, defecto):
+        valores = columnas[clave]
+        return np.where(np.isnan(valores), defecto, valores)
+
+    palabras = columna('num_palabras', 0)
+    # Como en los criterios: sin palabras, la tasa se calcula sobre una palabra
+    tasa_error = columna('errores_graves', 0) / np.where(palabras == 0, 1, palabras) * umbrales['errores_por']
+    estructura = (columna('num_capitulos', 0) >= umbrales['min_capitulos']
+                  if umbrales.get('min_capitulos') is not None else np.ones(len(palabras), bool))
+    if umbrales.get('max_desequilibrio') is not None and 'desequilibrio_capitulos' in columnas:
+        desequilibrio = columnas['desequilibrio_capitulos']
+        estructura &= np.isnan(desequilibrio) | (desequilibrio <= umbrales['max_desequilibrio'])
+    resultados = {
+        'ortografia_gramatica': tasa_error < umbrales['max_errores'],
+        'longitud': (palabras >= umbrales['min_palabras']) & (palabras <= umbrales['max_palabras']),
+        'estructura': estructura,
+        'legibilidad': columna('indice_legibilidad', 100) >= umbrales['min_legibilidad'],
+    }
+    resultados['apto'] = np.logical_and.reduce(list(resultados.values()))
+    resultados['tasa_error'] = tasa_error
+    return resultados
+
+
+def evaluar_registros(registros, genero, umbrales=None):
+    """Como evaluar_columnas, a partir de una secuencia de dicts de estadísticas."""
+    return evaluar_columnas(cargar_columnas(registros), genero, umbrales)
@@ -3,16 +3,45 @@ Pipeline central para evaluación editorial automatizada.
 Editorial Nuevo Milenio
 """
 
-from criterios import novela, cuento, poema, ensayo, cronica
-from utils import analizar_manuscrito
+import importlib
+from collections.abc import Mapping
 
-GENERO_CRITERIOS = {
-    'novela': novela.evaluar_novela,
-    'cuento': cuento.evaluar_cuento,
-    'poema': poema.evaluar_poema,
-    'ensayo': ensayo.evaluar_ensayo,
-    'cronica': cronica.evaluar_cronica,
-}
+from motor_reglas import Manuscrito, Regla, ejecutar
+
+
+class RegistroDeGeneros(Mapping):
+    """Asocia cada género con su función de evaluación ('modulo:funcion').
+
+    El módulo de criterios de un género solo se importa la primera vez que se pide.
+    """
+
+    def __init__(self, rutas):
+        self._rutas = dict(rutas)
+        self._funciones = {}
+
+    def __getitem__(self, genero):
+        if genero not in self._funciones:
+            self._funciones[genero] = getattr(self.modulo(genero), self._rutas[genero].split(':')[1])
+        return self._funciones[genero]
+
+    def modulo(self, genero):
+        """Módulo de criterios del género."""
+        return importlib.import_module(self._rutas[genero].split(':')[0])
+
+    def __iter__(self):
+        return iter(self._rutas)
+
+    def __len__(self):
+        return len(self._rutas)
+
+
+GENERO_CRITERIOS = RegistroDeGeneros({
+    'novela': 'criterios.novela:evaluar_novela',
+    'cuento': 'criterios.cuento:evaluar_cuento',
+    'poema': 'criterios.poema:evaluar_poema',
+    'ensayo': 'criterios.ensayo:evaluar_ensayo',
+    'cronica': 'criterios.cronica:evaluar_cronica',
+})
 
 
 def evaluar_manuscrito(stats, genero):
@@ -23,15 +52,92 @@ def evaluar_manuscrito(stats, genero):
     return resultados
 
 
+def reglas_de_genero(genero):
+    """Reglas del género, una por criterio, con los datos que declara su módulo (REQUISITOS).
+
+    Un requisito puede ser una función sin argumentos; se llama en cada
+    construcción, así que refleja los umbrales vigentes.
+    """
+    if genero not in GENERO_CRITERIOS:
+        raise ValueError(f'Género no implementado: {genero}')
+    modulo = GENERO_CRITERIOS.modulo(genero)
+    reglas = []
+    for nombre, requiere in modulo.REQUISITOS.items():
+        if callable(requiere):
+            requiere = requiere()
+        funcion = getattr(modulo, f'evaluar_{nombre}')
+        reglas.append(Regla(nombre, funcion.__doc__, funcion, requiere))
+    return reglas
+
+
+def evaluar_ruta(ruta, genero, cache=None, cache_extraccion=None, exhaustivo=False):
+    """Analiza y evalúa un manuscrito calculando solo los datos que piden sus criterios.
+
+    Devuelve (resultados, stats). Los criterios baratos van primero y, si alguno
+    no se cumple, los que necesitan algo caro (la revisión gramatical) quedan
+    omitidos. Con exhaustivo=True se evalúan todos, como evaluar_manuscrito.
+    """
+    manuscrito = Manuscrito(ruta, cache=cache, cache_extraccion=cache_extraccion)
+    resultados = ejecutar(reglas_de_genero(genero), manuscrito, exhaustivo)
+    return resultados, manuscrito.stats
+
+
+def evaluar_generos(ruta, generos=None, cache=None, cache_extraccion=None, exhaustivo=False):
+    """Evalúa un manuscrito en varios géneros (todos por defecto) con un solo análisis.
+
+    Todos los géneros comparten el mismo Manuscrito, así que cada dato se calcula
+    una vez aunque lo pidan varios. Un criterio omitido en un género se aplica
+    igualmente si otro género llegó a calcular lo que necesitaba.
+    Devuelve (tabla, stats), con la tabla de clasificar_generos.
+    """
+    generos = list(GENERO_CRITERIOS) if generos is None else generos
+    manuscrito = Manuscrito(ruta, cache=cache, cache_extraccion=cache_extraccion)
+    reglas = {genero: reglas_de_genero(genero) for genero in generos}
+    resultados = {genero: ejecutar(reglas[genero], manuscrito, exhaustivo) for genero in generos}
+    stats = manuscrito.stats
+    for genero in generos:
+        for regla in reglas[genero]:
+            if resultados[genero][regla.nombre].get('omitido') and all(c in stats for c in regla.requiere):
+                resultados[genero][regla.nombre] = regla.aplicar(stats)
+    return clasificar_generos(resultados), stats
+
+
+def clasificar_generos(resultados):
+    """Ordena {género: resultados} de más a menos compatible.
+
+    Cada fila es un dict con genero, apto, cumplidos, omitidos, total y
+    resultados. Primero van los aptos y después los que cumplen una mayor
+    proporción de criterios; a igualdad se respeta el orden recibido.
+    """
+    tabla = []
+    for genero, res in resultados.items():
+        cumplidos = sum(1 for v in res.values() if v.get('cumple'))
+        tabla.append({
+            'genero': genero,
+            'apto': es_apto(res),
+            'cumplidos': cumplidos,
+            'omitidos': sum(1 for v in res.values() if v.get('omitido')),
+            'total': len(res),
+            'resultados': res,
+        })
+    tabla.sort(key=lambda fila: (not fila['apto'], -fila['cumplidos'] / max(fila['total'], 1)))
+    return tabla
+
+
+def es_apto(resultados):
+    """Un manuscrito es apto si cumple todos los criterios (un criterio omitido no cuenta como cumplido)."""
+    return all([v.get('cumple', False) for v in resultados.values()])
+
+
 def reporte_resultados(resultados, genero):
     """Genera un reporte de evaluación."""
     mensajes = []
     for criterio, valor in resultados.items():
         cumple = valor.get('cumple', False)
         mensaje = valor.get('mensaje', f'{criterio}: sin información')
-        estado = '✓' if cumple else '✗'
+        estado = '–' if valor.get('omitido') else '✓' if cumple else '✗'
         mensajes.append(f'{estado} {mensaje}')
-    apto = all([v.get('cumple', False) for v in resultados.values()])
+    apto = es_apto(resultados)
     mensajes.append('---')
     if apto:
         mensajes.append(f'APTO para publicación en {genero.upper()}')
@@ -40,13 +146,31 @@ def reporte_resultados(resultados, genero):
     return '\n'.join(mensajes)
 
 
+def reporte_generos(tabla):
+    """Genera un reporte con la tabla de compatibilidad y el detalle de cada género."""
+    mensajes = ['Compatibilidad por género:']
+    for posicion, fila in enumerate(tabla, 1):
+        veredicto = 'APTO' if fila['apto'] else 'NO APTO'
+        omitidos = f" ({fila['omitidos']} sin evaluar)" if fila['omitidos'] else ''
+        mensajes.append(f"{posicion}. {fila['genero'].upper():<8} {veredicto:<8} "
+                        f"{fila['cumplidos']}/{fila['total']} criterios{omitidos}")
+    for fila in tabla:
+        mensajes.append('')
+        mensajes.append(f"[{fila['genero'].upper()}]")
+        mensajes.append(reporte_resultados(fila['resultados'], fila['genero']))
+    return '\n'.join(mensajes)
+
+
 if __name__ == '__main__':
     import sys
     if len(sys.argv) < 3:
-        print('Uso: python evaluador.py <ruta_manuscrito> <genero>')
+        print('Uso: python evaluador.py <ruta_manuscrito> <genero|todos>')
         sys.exit(1)
     ruta = sys.argv[1]
     genero = sys.argv[2]
-    stats = analizar_manuscrito(ruta)
-    resultados = evaluar_manuscrito(stats, genero)
-    print(reporte_resultados(resultados, genero))
+    if genero == 'todos':
+        tabla, _ = evaluar_generos(ruta)
+        print(reporte_generos(tabla))
+    else:
+        resultados, _ = evaluar_ruta(ruta, genero)
+        print(reporte_resultados(resultados, genero))
@@ -0,0 +1,212 @@
+"""
+Evaluación por lotes de una bandeja de manuscritos.
+Editorial Nuevo Milenio
+
+Recibe un directorio o un manifiesto con pares (ruta, género), reparte los
+manuscritos entre un pool de procesos y emite una línea JSON por manuscrito
+a medida que cada uno termina.
+"""
+
+import csv
+import itertools
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import corrector
+from cache import CacheExtraccion, CacheGramatical
+from evaluador import GENERO_CRITERIOS, es_apto, evaluar_ruta
+
+# Extensiones que se recogen al listar un directorio
+EXTENSIONES = ('.txt', '.pdf', '.docx')
+
+# Cachés gramatical y de extracción de cada proceso trabajador (ver _iniciar_trabajador)
+_cache = None
+_cache_extraccion = None
+
+
+def leer_manifiesto(ruta):
+    """Lee pares (ruta, género) de un manifiesto .jsonl o CSV/TSV.
+
+    - JSONL: un objeto por línea con las claves 'ruta' y 'genero'.
+    - CSV/TSV: una línea 'ruta,genero' (o separada por tabulador); '#' inicia un comentario.
+    Las rutas relativas se resuelven respecto al directorio del manifiesto. Las
+    líneas en blanco se saltan; una entrada sin género se devuelve con género
+    vacío, para que el lote la informe como error en lugar de detenerse. Una
+    línea JSONL ilegible o sin 'ruta' se devuelve ya como resultado de error
+    (un dict como los de evaluar_lote, con ruta '<manifiesto>:<línea>').
+    """
+    base = os.path.dirname(os.path.abspath(ruta))
+    pares = []
+    with open(ruta, encoding='utf-8', newline='') as f:
+        if ruta.lower().endswith('.jsonl'):
+            filas = _filas_jsonl(ruta, f)
+        else:
+            delimitador = '\t' if ruta.lower().endswith('.tsv') else ','
+            filas = ((fila + [''])[:2] for fila in csv.reader(f, delimiter=delimitador)
+                     if fila and fila[0].strip() and not fila[0].lstrip().startswith('#'))
+        for fila in filas:
+            if isinstance(fila, dict):
+                pares.append(fila)
+                continue
+            archivo, genero = fila
+            pares.append((os.path.join(base, archivo.strip()), genero.strip().lower()))
+    return pares
+
+
+def _filas_jsonl(ruta, f):
+    for numero, linea in enumerate(f, 1):
+        if not linea.strip():
+            continue
+        try:
+            d = json.loads(linea)
+            if not d:
+                continue
+            if not isinstance(d, dict) or not isinstance(d.get('ruta'), str):
+                raise ValueError("La entrada no tiene una clave 'ruta' de texto")
+            genero = d.get('genero') or ''
+            if not isinstance(genero, str):
+                raise ValueError("La clave 'genero' no es texto")
+        except ValueError as e:
+            yield {'ruta': f'{ruta}:{numero}', 'genero': '', 'error': f'{type(e).__name__}: {e}'}
+            continue
+        yield d['ruta'], genero
+
+
+def listar_directorio(directorio, genero=None):
+    """Obtiene pares (ruta, género) de un directorio.
+
+    Con genero, todos los manuscritos del directorio se evalúan en ese género.
+    Sin él, se espera un subdirectorio por género: <directorio>/<genero>/<archivo>.
+    """
+    if genero is not None:
+        return [(ruta, genero) for ruta in _manuscritos(directorio)]
+    pares = []
+    for nombre in sorted(os.listdir(directorio)):
+        subdirectorio = os.path.join(directorio, nombre)
+        if os.path.isdir(subdirectorio):
+            pares.extend((ruta, nombre.lower()) for ruta in _manuscritos(subdirectorio))
+    return pares
+
+
+def _manuscritos(directorio):
+    return [os.path.join(directorio, nombre) for nombre in sorted(os.listdir(directorio))
+            if os.path.splitext(nombre)[1].lower() in EXTENSIONES
+            and os.path.isfile(os.path.join(directorio, nombre))]
+
+
+def evaluar_archivo(ruta, genero, exhaustivo=False):
+    """Analiza y evalúa un manuscrito. Los fallos se devuelven como resultado, no se lanzan."""
+    try:
+        if not genero:
+            raise ValueError('Falta el género del manuscrito')
+        if genero not in GENERO_CRITERIOS:
+            raise ValueError(f'Género no implementado: {genero}')
+        resultados, stats = evaluar_ruta(ruta, genero, cache=_cache, cache_extraccion=_cache_extraccion,
+                                         exhaustivo=exhaustivo)
+        return {'ruta': ruta, 'genero': genero, 'apto': es_apto(resultados),
+                'stats': stats, 'resultados': resultados}
+    except Exception as e:
+        return {'ruta': ruta, 'genero': genero, 'error': f'{type(e).__name__}: {e}'}
+
+
+def _correctores_por_trabajador(procesos):
+    """Correctores de cada trabajador, para que entre todos no pasen de las CPU."""
+    return max(1, min(corrector.NUM_CORRECTORES, (os.cpu_count() or 1) // procesos))
+
+
+def _iniciar_trabajador(usar_cache, correctores=1):
+    global _cache, _cache_extraccion
+    # Cada trabajador arranca su propio pool de LanguageTool (un JVM por corrector)
+    corrector.NUM_CORRECTORES = correctores
+    if usar_cache:
+        _cache = CacheGramatical()
+        _cache_extraccion = CacheExtraccion()
+
+
+def evaluar_lote(pares, procesos=None, usar_cache=True, exhaustivo=False):
+    """Evalúa los pares (ruta, género) en un pool de procesos.
+
+    Genera un dict por manuscrito en el orden en que terminan. Como mucho hay
+    2 * procesos manuscritos en vuelo, así que la bandeja puede ser arbitrariamente
+    grande. Un manuscrito que falla produce un dict con la clave 'error'; las
+    entradas que ya son un dict (líneas ilegibles del manifiesto) se emiten tal
+    cual. Si un trabajador muere (por falta de memoria, por ejemplo), los
+    manuscritos que estaban en vuelo se reintentan de uno en uno en un pool
+    nuevo, y solo el que vuelve a romperlo se informa como error.
+    Con exhaustivo=False se omiten los criterios caros de los manuscritos ya NO APTOS.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    pendientes = iter(pares)
+    # Entradas en vuelo cuando se rompió el pool; no se sabe cuál lo rompió
+    sospechosas = deque()
+    # futuro -> (entrada, es un reintento)
+    en_vuelo = {}
+    executor = None
+    try:
+        while True:
+            if executor is None:
+                executor = ProcessPoolExecutor(procesos, initializer=_iniciar_trabajador,
+                                               initargs=(usar_cache, _correctores_por_trabajador(procesos)))
+            roto = False
+            if sospechosas:
+                # Reintentos aislados: si el pool vuelve a romperse, la culpable es la única en vuelo
+                if not en_vuelo:
+                    entrada = sospechosas.popleft()
+                    try:
+                        en_vuelo[executor.submit(evaluar_archivo, *entrada, exhaustivo)] = (entrada, True)
+                    except BrokenProcessPool:
+                        sospechosas.appendleft(entrada)
+                        roto = True
+            else:
+                for entrada in pendientes:
+                    if isinstance(entrada, dict):
+                        yield entrada
+                        continue
+                    try:
+                        en_vuelo[executor.submit(evaluar_archivo, *entrada, exhaustivo)] = (entrada, False)
+                    except BrokenProcessPool:
+                        # El pool se rompió antes de enviarla: la entrada irá al siguiente
+                        pendientes = itertools.chain([entrada], pendientes)
+                        roto = True
+                        break
+                    if len(en_vuelo) >= 2 * procesos:
+                        break
+            if not en_vuelo and not roto:
+                break
+            terminados, _ = wait(en_vuelo, return_when=FIRST_COMPLETED) if en_vuelo else ((), ())
+            for futuro in terminados:
+                entrada, reintento = en_vuelo.pop(futuro)
+                try:
+                    yield futuro.result()
+                except BrokenProcessPool as e:
+                    roto = True
+                    if reintento:
+                        yield _error(entrada, e)
+                    else:
+                        sospechosas.append(entrada)
+                except Exception as e:
+                    yield _error(entrada, e)
+            if roto:
+                # Un trabajador murió: lo que seguía en vuelo se pierde con el pool y se reintenta
+                sospechosas.extend(entrada for entrada, _ in en_vuelo.values())
+                en_vuelo.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = None
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _error(entrada, excepcion):
+    ruta, genero = entrada
+    return {'ruta': ruta, 'genero': genero, 'error': f'{type(excepcion).__name__}: {excepcion}'}
+
+
+def escribir_jsonl(resultados, salida):
+    """Escribe cada resultado como una línea JSON en cuanto está disponible."""
+    for resultado in resultados:
+        salida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+        salida.flush()
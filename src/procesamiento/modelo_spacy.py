@@ -0,0 +1,90 @@
+"""
+Pipeline de spaCy compartido y podado según lo que pide cada llamada.
+Editorial Nuevo Milenio
+
+Cargar es_core_news_sm cuesta segundos; aquí se carga una sola vez por
+combinación de componentes y se reutiliza. Los componentes que no hacen falta
+para los rasgos pedidos se excluyen al cargar, y si se necesitan oraciones pero
+no el análisis de dependencias se usa el 'sentencizer' de reglas en lugar del parser.
+
+Requiere: pip install spacy && python -m spacy download es_core_news_sm
+"""
+
+import threading
+import time
+
+MODELO_ES = 'es_core_news_sm'
+
+# Componentes del modelo que necesita cada rasgo. 'tokens' solo usa el tokenizador
+# y 'oraciones' se resuelve con el parser o con el sentencizer (ver componentes_necesarios).
+COMPONENTES = {
+    'tokens': (),
+    'oraciones': (),
+    'entidades': ('tok2vec', 'ner'),
+    'morfologia': ('tok2vec', 'morphologizer', 'attribute_ruler'),
+    'lemas': ('tok2vec', 'morphologizer', 'attribute_ruler', 'lemmatizer'),
+    'dependencias': ('tok2vec', 'parser'),
+}
+
+# Componentes entrenados del modelo que pueden excluirse
+_COMPONENTES_MODELO = ('tok2vec', 'morphologizer', 'parser', 'attribute_ruler',
+                       'lemmatizer', 'ner', 'senter')
+
+_modelos = {}
+_lock = threading.Lock()
+_metricas = {'cargas': {}, 'documentos': 0, 'tiempo_documentos': 0.0}
+
+
+def componentes_necesarios(rasgos):
+    """Devuelve (componentes, usar_sentencizer) para un conjunto de rasgos."""
+    desconocidos = set(rasgos) - set(COMPONENTES)
+    if desconocidos:
+        raise ValueError(f'Rasgos no soportados: {", ".join(sorted(desconocidos))}')
+    componentes = frozenset(c for rasgo in rasgos for c in COMPONENTES[rasgo])
+    usar_sentencizer = 'oraciones' in rasgos and 'parser' not in componentes
+    return componentes, usar_sentencizer
+
+
+def obtener_nlp(rasgos=('tokens',), modelo=MODELO_ES):
+    """Devuelve el pipeline compartido mínimo que produce los rasgos pedidos."""
+    componentes, usar_sentencizer = componentes_necesarios(rasgos)
+    clave = (modelo, componentes, usar_sentencizer)
+    with _lock:
+        nlp = _modelos.get(clave)
+        if nlp is None:
+            import spacy
+            inicio = time.perf_counter()
+            nlp = spacy.load(modelo, exclude=[c for c in _COMPONENTES_MODELO if c not in componentes])
+            if usar_sentencizer:
+                nlp.add_pipe('sentencizer')
+            _metricas['cargas'][' + '.join(nlp.pipe_names) or 'tokenizer'] = time.perf_counter() - inicio
+            _modelos[clave] = nlp
+    return nlp
+
+
+def procesar(texto, rasgos=('tokens',), modelo=MODELO_ES):
+    """Procesa un texto con el pipeline compartido y registra el tiempo empleado."""
+    nlp = obtener_nlp(rasgos, modelo)
+    inicio = time.perf_counter()
+    doc = nlp(texto)
+    registrar_documentos(1, time.perf_counter() - inicio)
+    return doc
+
+
+def registrar_documentos(cantidad, segundos):
+    """Suma documentos procesados y su tiempo a las métricas."""
+    with _lock:
+        _metricas['documentos'] += cantidad
+        _metricas['tiempo_documentos'] += segundos
+
+
+def metricas():
+    """Tiempos de carga por pipeline y tiempo medio por documento procesado."""
+    with _lock:
+        documentos = _metricas['documentos']
+        return {
+            'cargas': dict(_metricas['cargas']),
+            'documentos': documentos,
+            'tiempo_documentos': _metricas['tiempo_documentos'],
+            'tiempo_por_documento': _metricas['tiempo_documentos'] / documentos if documentos else 0.0,
+        }
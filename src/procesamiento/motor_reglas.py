@@ -0,0 +1,225 @@
+"""
+Motor de reglas con cálculo de características bajo demanda.
+Editorial Nuevo Milenio
+
+Cada regla declara qué datos del manuscrito lee (claves del diccionario de
+estadísticas, como 'num_palabras' o 'errores_graves'). Cada dato lo produce
+una característica, que puede depender de otras: el planificador recorre ese
+grafo y calcula cada característica necesaria una sola vez por manuscrito,
+y ninguna más. Un género cuyas reglas no leen 'errores_graves' no pasa por
+el corrector gramatical ni decodifica el texto de un .txt.
+
+Salvo en modo exhaustivo, las reglas se aplican de la más barata a la más cara
+y, en cuanto una no se cumple (el manuscrito ya es NO APTO), las que
+necesitarían calcular algo más se marcan como omitidas en lugar de aplicarse.
+"""
+
+from collections import namedtuple
+
+from archivos import ProcesadorDeArchivos, es_texto_plano
+from capitulos import analizar_capitulos, errores_por_capitulo
+from utils import escanear_texto, escanear_txt, revisar_gramatica
+
+# Datos que calcula utils.escanear_texto (o escanear_txt); salen todos de la misma llamada
+CLAVES_CONTEO = ('num_palabras', 'num_capitulos', 'num_oraciones', 'num_parrafos',
+                 'num_caracteres', 'num_silabas', 'indice_legibilidad', 'indice_szigriszt',
+                 'indice_flesch')
+
+# Datos intermedios que no forman parte de las estadísticas
+INTERNAS = frozenset({'ruta_texto', 'texto', 'coincidencias'})
+
+# claves: datos que produce; requiere: características que deben calcularse antes;
+# calcular(manuscrito) -> dict con esos datos; costo: coste relativo, para ordenar las reglas
+Caracteristica = namedtuple('Caracteristica', 'claves requiere calcular costo', defaults=(1,))
+
+
+def _fuente(manuscrito):
+    """Ruta de la que leer el texto: el propio archivo de texto o el texto extraído guardado en caché."""
+    ruta = manuscrito.ruta
+    if manuscrito.cache_extraccion is not None and not es_texto_plano(ruta):
+        ruta = manuscrito.cache_extraccion.obtener(ruta, manuscrito.procesador.iterar_texto)
+    return {'ruta_texto': ruta}
+
+
+def _texto(manuscrito):
+    ruta = manuscrito.obtener('ruta_texto')
+    if es_texto_plano(ruta):
+        return {'texto': manuscrito.procesador.extraer_texto(ruta)}
+    # iterar_texto propaga la falta de PyPDF2 (o de python-docx, si el XML
+    # no se puede leer) en lugar de devolver un aviso como texto
+    return {'texto': ''.join(manuscrito.procesador.iterar_texto(ruta))}
+
+
+def _conteo(manuscrito):
+    # Un .txt se cuenta sobre el archivo proyectado en memoria; el texto solo se
+    # pide (una vez, y compartido con la gramática) para PDF y DOCX sin caché
+    ruta = manuscrito.obtener('ruta_texto')
+    if es_texto_plano(ruta):
+        return escanear_txt(ruta)
+    return escanear_texto(manuscrito.obtener('texto'))
+
+
+def _capitulos(manuscrito):
+    return {'capitulos': analizar_capitulos(manuscrito.obtener('texto'))}
+
+
+def _errores_capitulos(manuscrito):
+    # Los errores de cada capítulo salen de la misma revisión gramatical que errores_graves
+    coincidencias = manuscrito.obtener('coincidencias') or []
+    return {'errores_capitulos': errores_por_capitulo(manuscrito.obtener('capitulos'), coincidencias)}
+
+
+def _errores(manuscrito):
+    cache = manuscrito.cache
+    aciertos, fallos = (cache.aciertos, cache.fallos) if cache is not None else (0, 0)
+    coincidencias = revisar_gramatica(manuscrito.obtener('texto'), cache)
+    datos = {'errores_graves': 0 if coincidencias is None else len(coincidencias),
+             'coincidencias': coincidencias}
+    if cache is not None:
+        datos['cache_aciertos'] = cache.aciertos - aciertos
+        datos['cache_fallos'] = cache.fallos - fallos
+    return datos
+
+
+CARACTERISTICAS = {
+    'fuente': Caracteristica(('ruta_texto',), (), _fuente, 0),
+    'texto': Caracteristica(('texto',), ('fuente',), _texto, 1),
+    'conteo': Caracteristica(CLAVES_CONTEO, ('fuente',), _conteo, 1),
+    'capitulos': Caracteristica(('capitulos',), ('texto',), _capitulos, 1),
+    # LanguageTool cuesta órdenes de magnitud más que cualquier conteo
+    'gramatica': Caracteristica(('errores_graves', 'coincidencias'), ('texto',), _errores, 100),
+    # Aparte de 'capitulos', para que el equilibrio entre capítulos no pase por LanguageTool
+    'errores_capitulos': Caracteristica(('errores_capitulos',), ('capitulos', 'gramatica'), _errores_capitulos, 1),
+}
+
+
+class Regla:
+    """Criterio editorial con los datos del manuscrito que necesita."""
+
+    def __init__(self, nombre, descripcion, funcion_validacion, requiere=()):
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.funcion_validacion = funcion_validacion
+        self.requiere = tuple(requiere)
+
+    def aplicar(self, stats):
+        return self.funcion_validacion(stats)
+
+
+class Manuscrito:
+    """Características de un manuscrito, calculadas la primera vez que se piden."""
+
+    def __init__(self, ruta, cache=None, cache_extraccion=None, caracteristicas=None):
+        self.ruta = ruta
+        self.cache = cache
+        self.cache_extraccion = cache_extraccion
+        self.caracteristicas = CARACTERISTICAS if caracteristicas is None else caracteristicas
+        self.procesador = ProcesadorDeArchivos()
+        self.datos = {}
+        # Características ya calculadas, en el orden en que se calcularon
+        self.calculadas = []
+        self._proveedores = _proveedores(self.caracteristicas)
+
+    @property
+    def stats(self):
+        """Estadísticas calculadas hasta ahora, sin los datos intermedios."""
+        return {clave: valor for clave, valor in self.datos.items() if clave not in INTERNAS}
+
+    def calcular(self, nombre):
+        """Calcula una característica (y antes sus dependencias) si aún no se calculó."""
+        if nombre in self.calculadas:
+            return
+        caracteristica = self.caracteristicas[nombre]
+        for dependencia in caracteristica.requiere:
+            self.calcular(dependencia)
+        self.datos.update(caracteristica.calcular(self))
+        self.calculadas.append(nombre)
+
+    def obtener(self, clave):
+        """Valor de un dato, calculando la característica que lo produce si hace falta."""
+        if clave not in self.datos:
+            self.calcular(self._proveedores[clave])
+        return self.datos[clave]
+
+
+def _proveedores(caracteristicas):
+    return {clave: nombre for nombre, c in caracteristicas.items() for clave in c.claves}
+
+
+def planificar(reglas, caracteristicas=None):
+    """Características que necesitan las reglas, con sus dependencias, en orden de cálculo.
+
+    Lanza ValueError si una regla pide un dato que ninguna característica produce
+    o si las dependencias forman un ciclo.
+    """
+    caracteristicas = CARACTERISTICAS if caracteristicas is None else caracteristicas
+    proveedores = _proveedores(caracteristicas)
+    orden = []
+    visitando = set()
+
+    def visitar(nombre):
+        if nombre in orden:
+            return
+        if nombre in visitando:
+            raise ValueError(f'Dependencia circular en la característica {nombre!r}')
+        visitando.add(nombre)
+        for dependencia in caracteristicas[nombre].requiere:
+            visitar(dependencia)
+        visitando.discard(nombre)
+        orden.append(nombre)
+
+    for regla in reglas:
+        for clave in regla.requiere:
+            if clave not in proveedores:
+                raise ValueError(f'La regla {regla.nombre!r} pide {clave!r}, que ninguna característica calcula')
+            visitar(proveedores[clave])
+    return orden
+
+
+def ejecutar(reglas, manuscrito, exhaustivo=False):
+    """Calcula lo que piden las reglas y devuelve {nombre de la regla: resultado}.
+
+    Con exhaustivo=True se calculan todas las características y se aplican todas
+    las reglas. Si no, se aplican de la más barata a la más cara (según lo que
+    falte por calcular) y, una vez que alguna no se cumple, las que requieren
+    calcular algo nuevo devuelven un resultado omitido (ver omitido). El
+    diccionario conserva siempre el orden de las reglas.
+    """
+    caracteristicas = manuscrito.caracteristicas
+    if exhaustivo:
+        for nombre in planificar(reglas, caracteristicas):
+            manuscrito.calcular(nombre)
+        stats = manuscrito.stats
+        return {regla.nombre: regla.aplicar(stats) for regla in reglas}
+
+    planes = {regla.nombre: planificar([regla], caracteristicas) for regla in reglas}
+
+    def pendiente(regla):
+        return [nombre for nombre in planes[regla.nombre] if nombre not in manuscrito.calculadas]
+
+    def costo(regla):
+        return sum(caracteristicas[nombre].costo for nombre in pendiente(regla))
+
+    resultados = {}
+    decidido = False
+    restantes = list(reglas)
+    while restantes:
+        regla = min(restantes, key=costo)
+        restantes.remove(regla)
+        if decidido and pendiente(regla):
+            resultados[regla.nombre] = omitido(regla)
+            continue
+        for nombre in planes[regla.nombre]:
+            manuscrito.calcular(nombre)
+        resultados[regla.nombre] = regla.aplicar(manuscrito.stats)
+        decidido = decidido or not resultados[regla.nombre].get('cumple', False)
+    return {regla.nombre: resultados[regla.nombre] for regla in reglas}
+
+
+def omitido(regla):
+    """Resultado de una regla que no se aplicó porque el veredicto ya estaba decidido."""
+    return {
+        'cumple': None,
+        'omitido': True,
+        'mensaje': f'{regla.nombre}: no evaluado (el manuscrito ya incumple otro criterio)'
+    }
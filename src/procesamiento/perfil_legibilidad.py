@@ -0,0 +1,124 @@
+"""
+Perfil de legibilidad por ventanas de oraciones.
+Editorial Nuevo Milenio
+
+indice_legibilidad resume el manuscrito entero en un número; el perfil calcula
+el mismo índice (Fernández-Huerta) sobre una ventana de N oraciones que avanza
+de paso en paso, para localizar los pasajes densos. Cada oración se mide una
+sola vez (palabras y sílabas) y la ventana se desliza sumando las oraciones
+que entran y restando las que salen, así que el coste es lineal en el tamaño
+del texto sea cual sea la ventana.
+
+Para colocar las ventanas, una oración acaba en una racha de signos de cierre
+('...' o '?!' cierran una sola); el texto sin cerrar del final también cuenta
+como oración, y los signos sin ninguna palabra delante no abren oraciones
+vacías. Para la fórmula, en cambio, cada signo de cierre cuenta como una
+oración, igual que en indice_legibilidad (utils._PATRON_ESCANEO): 'Hola...'
+pesa tres. Los signos sueltos se suman a la oración anterior (o a la primera),
+así que una ventana que abarca todo el texto da exactamente su
+indice_legibilidad.
+"""
+
+import re
+from array import array
+from collections import namedtuple
+
+from silabas import contar_silabas
+from utils import indice_fernandez_huerta
+
+VENTANA = 20
+PASO = 5
+
+_TOKEN = re.compile(r'(\w+)|[.!?]+')
+
+# ventana, paso: en oraciones; inicios: offset (en caracteres) de la primera
+# oración de cada ventana; indices: índice de legibilidad de cada ventana
+Perfil = namedtuple('Perfil', 'ventana paso inicios indices')
+
+
+def medir_oraciones(texto):
+    """Devuelve (inicios, palabras, sílabas, cierres) de cada oración, como arrays paralelos.
+
+    cierres es el número de signos de cierre que se cuentan a la oración (ver
+    el comentario del módulo); puede ser 0 en la última, si queda sin cerrar.
+    """
+    inicios = array('q')
+    palabras = array('l')
+    silabas = array('l')
+    cierres = array('l')
+    n_palabras = n_silabas = 0
+    # Signos anteriores a la primera palabra: se suman a la primera oración
+    sueltos = 0
+    for m in _TOKEN.finditer(texto):
+        palabra = m.group(1)
+        if palabra is not None:
+            if not n_palabras:
+                inicios.append(m.start())
+            n_palabras += 1
+            n_silabas += contar_silabas(palabra)
+        elif n_palabras:
+            palabras.append(n_palabras)
+            silabas.append(n_silabas)
+            cierres.append(len(m.group()) + sueltos)
+            n_palabras = n_silabas = sueltos = 0
+        elif cierres:
+            cierres[-1] += len(m.group())
+        else:
+            sueltos += len(m.group())
+    if n_palabras:
+        palabras.append(n_palabras)
+        silabas.append(n_silabas)
+        cierres.append(sueltos)
+    return inicios, palabras, silabas, cierres
+
+
+def inicios_de_ventanas(n, ventana, paso):
+    """Primera oración de cada ventana sobre n oraciones.
+
+    Las ventanas empiezan en 0, paso, 2 * paso... mientras quepan enteras; si
+    el paso no llega justo al final, una última ventana acaba en la última
+    oración, para que ninguna quede fuera. Con menos de `ventana` oraciones
+    hay una sola ventana con todas.
+    """
+    inicios = range(0, max(n - ventana, 0) + 1, paso)
+    yield from inicios
+    if inicios[-1] + ventana < n:
+        yield n - ventana
+
+
+def perfil_legibilidad(texto, ventana=VENTANA, paso=PASO):
+    """Índice de legibilidad de cada ventana de `ventana` oraciones, avanzando `paso` oraciones.
+
+    Las ventanas empiezan donde indica inicios_de_ventanas. Devuelve un Perfil
+    cuyos inicios e indices son arrays de la biblioteca estándar, listos para
+    dibujar (o para numpy.asarray).
+    """
+    if ventana < 1 or paso < 1:
+        raise ValueError(f'La ventana y el paso deben ser positivos: {ventana}, {paso}')
+    inicios, palabras, silabas, cierres = medir_oraciones(texto)
+    n = len(palabras)
+    perfil = Perfil(ventana, paso, array('q'), array('d'))
+    if not n:
+        return perfil
+
+    # Suma de la ventana [desde, hasta) en curso
+    suma_palabras = suma_silabas = suma_cierres = 0
+    desde = hasta = 0
+    for inicio in inicios_de_ventanas(n, ventana, paso):
+        fin = min(inicio + ventana, n)
+        # Si el paso supera la ventana, la nueva no se solapa con la anterior
+        if inicio >= hasta:
+            desde = hasta = inicio
+            suma_palabras = suma_silabas = suma_cierres = 0
+        for i in range(desde, inicio):
+            suma_palabras -= palabras[i]
+            suma_silabas -= silabas[i]
+            suma_cierres -= cierres[i]
+        for i in range(hasta, fin):
+            suma_palabras += palabras[i]
+            suma_silabas += silabas[i]
+            suma_cierres += cierres[i]
+        desde, hasta = inicio, fin
+        perfil.inicios.append(inicios[inicio])
+        perfil.indices.append(indice_fernandez_huerta(suma_palabras, suma_cierres, suma_silabas))
+    return perfil
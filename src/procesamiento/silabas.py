@@ -0,0 +1,123 @@
+"""
+División en sílabas del español y recuento de sílabas con caché.
+Editorial Nuevo Milenio
+
+Sigue las reglas ortográficas de la RAE:
+
+- Núcleos: dos vocales seguidas forman diptongo si una es cerrada sin tilde
+  (i, u, ü, o y final) y la otra abierta, o si ambas son cerradas y
+  distintas: 'ai-re', 'ciu-dad', 'hoy', 'cuí-da-te'. Dos abiertas, una
+  cerrada con tilde junto a una abierta o dos cerradas iguales forman hiato:
+  'cre-er', 'rí-o', 'ba-úl', 'chi-i-ta'. Cerrada, abierta y cerrada sin tilde
+  forman triptongo: 'a-ve-ri-güéis'.
+- 'ch', 'll' y 'rr' son una sola consonante, y la u de 'que', 'qui', 'gue'
+  y 'gui' no es vocal.
+- Entre dos núcleos, una consonante va con la sílaba siguiente; de dos, se
+  separan salvo los grupos inseparables (pr, bl, tr...); de tres, las dos
+  primeras van con la anterior salvo si las dos últimas son inseparables; de
+  cuatro, se reparten dos y dos.
+
+contar_silabas guarda en una caché acotada el resultado de cada forma, así
+que las palabras que se repiten en un texto se dividen una sola vez.
+"""
+
+from functools import lru_cache
+
+# Número máximo de formas distintas guardadas en la caché de contar_silabas
+TAMANO_CACHE_SILABAS = 100_000
+
+_ABIERTAS = frozenset('aeoáéó')
+_CERRADAS = frozenset('iuüy')
+_CERRADAS_TILDE = frozenset('íú')
+_VOCALES = _ABIERTAS | _CERRADAS | _CERRADAS_TILDE
+_DIGRAFOS = ('ch', 'll', 'rr')
+_INSEPARABLES = frozenset(('pr', 'br', 'tr', 'dr', 'cr', 'kr', 'gr', 'fr',
+                           'pl', 'bl', 'cl', 'kl', 'gl', 'fl'))
+_SIN_TILDE = str.maketrans('íúü', 'iuu')
+
+
+def _unidades(palabra):
+    """Parte la palabra en letras o dígrafos, marcando cuáles son vocales."""
+    unidades = []
+    i = 0
+    n = len(palabra)
+    while i < n:
+        letra = palabra[i]
+        par = palabra[i:i + 2]
+        if par in _DIGRAFOS:
+            unidades.append((par, False))
+            i += 2
+        elif par in ('qu', 'gu') and i + 2 < n and palabra[i + 2] in 'eiéí':
+            unidades.append((par, False))
+            i += 2
+        elif letra == 'y':
+            # La y es vocal al final de la palabra o ante consonante: 'hoy', 'muy'
+            vocal = i + 1 == n or palabra[i + 1] not in _VOCALES
+            unidades.append((letra, vocal))
+            i += 1
+        else:
+            unidades.append((letra, letra in _VOCALES))
+            i += 1
+    return unidades
+
+
+def _diptongo(a, b):
+    """True si las vocales a y b (en ese orden) van en la misma sílaba."""
+    if a not in _ABIERTAS and b not in _ABIERTAS:
+        # Dos cerradas: diptongo salvo que se repita la misma ('chi-i-ta')
+        return a.translate(_SIN_TILDE) != b.translate(_SIN_TILDE)
+    return a in _CERRADAS or b in _CERRADAS
+
+
+def silabear(palabra):
+    """Lista de sílabas de una palabra (en minúsculas). Una palabra sin vocales es una sílaba."""
+    unidades = _unidades(palabra.lower())
+    # Núcleos: tramos de vocales que forman una sola sílaba, como (inicio, fin) en unidades
+    nucleos = []
+    for i, (letra, vocal) in enumerate(unidades):
+        if not vocal:
+            continue
+        if nucleos and nucleos[-1][1] == i and _diptongo(unidades[i - 1][0], letra):
+            nucleos[-1][1] = i + 1
+        else:
+            nucleos.append([i, i + 1])
+    if not nucleos:
+        return [palabra.lower()] if palabra else []
+
+    cortes = []
+    for (_, fin), (siguiente, _) in zip(nucleos, nucleos[1:]):
+        consonantes = [letra for letra, _ in unidades[fin:siguiente]]
+        n = len(consonantes)
+        if n <= 1:
+            cortes.append(fin)
+        elif n == 2:
+            cortes.append(fin if ''.join(consonantes) in _INSEPARABLES else fin + 1)
+        elif n == 3:
+            cortes.append(fin + 1 if ''.join(consonantes[1:]) in _INSEPARABLES else fin + 2)
+        else:
+            cortes.append(siguiente - 2)
+    limites = [0] + cortes + [len(unidades)]
+    return [''.join(letra for letra, _ in unidades[a:b]) for a, b in zip(limites, limites[1:])]
+
+
+@lru_cache(maxsize=TAMANO_CACHE_SILABAS)
+def contar_silabas(palabra):
+    """Número de sílabas de una forma; se calcula una vez por forma distinta."""
+    return len(silabear(palabra)) or 1
+
+
+def contar_silabas_formas(formas):
+    """Total de sílabas de un Counter {forma: apariciones}."""
+    return sum(contar_silabas(forma) * n for forma, n in formas.items())
+
+
+def estadisticas_cache():
+    """Aciertos, fallos, formas guardadas y tasa de aciertos de la caché de contar_silabas."""
+    info = contar_silabas.cache_info()
+    consultas = info.hits + info.misses
+    return {
+        'aciertos': info.hits,
+        'fallos': info.misses,
+        'formas': info.currsize,
+        'tasa_aciertos': info.hits / consultas if consultas else 0.0,
+    }
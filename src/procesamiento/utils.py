@@ -4,6 +4,38 @@ Editorial Nuevo Milenio
 """
 
 import re
+from collections import Counter
+from operator import attrgetter
+
+from archivos import ProcesadorDeArchivos, TAMANO_BLOQUE, es_texto_plano
+from conteo_bytes import contar_archivo
+from corrector import TAMANO_FRAGMENTO, backend_disponible, revisar_texto, ultimo_corte
+from silabas import contar_silabas_formas
+
+
+# Patrón del escaneo de estructura. Cada alternativa es un grupo con nombre;
+# el nombre del grupo que coincide identifica la estadística:
+#   parrafo  -> inicio de un bloque de texto precedido por línea en blanco
+#   capitulo -> 'Capítulo' al inicio de línea (también cuenta como palabra)
+#   oracion  -> signo de cierre de oración
+# Las palabras se cuentan en una segunda pasada, por formas, para las sílabas
+# (ver _contar_tokens).
+_PATRON_ESCANEO = re.compile(
+    r'(?P<parrafo>(?:\A|\n[^\S\n]*\n)\s*(?=\S))'
+    r'|(?P<capitulo>^cap[\u00ed]tulo\w*)'
+    r'|(?P<oracion>[.!?])',
+    re.MULTILINE | re.IGNORECASE,
+)
+
+_PALABRA = re.compile(r'\w+')
+
+_GRUPO = attrgetter('lastgroup')
+
+# Puntos de corte seguros para el análisis en flujo, en orden de preferencia:
+# tras el último carácter visible seguido de una línea en blanco, de un salto de
+# línea, de un cierre de oración y, en último caso, de cualquier espacio.
+_CORTES = [re.compile(patron, re.DOTALL) for patron in (
+    r'.*\S(\s*\n[^\S\n]*\n)', r'.*\S([^\S\n]*\n)', r'.*[.!?](\s)', r'.*\S(\s)')]
 
 
 def contar_palabras(texto):
@@ -17,38 +49,237 @@ def contar_capitulos(texto):
 
 
 def calcular_legibilidad(texto):
-    """Fórmula simple para español (puede mejorarse con SpaCy o herramientas especializadas)."""
+    """Índice de Fernández-Huerta del texto (0-100; más alto, más fácil de leer)."""
+    return escanear_texto(texto)['indice_legibilidad']
+
+
+def calcular_legibilidad_szigriszt(texto):
+    """Índice de perspicuidad de Szigriszt-Pazos del texto (0-100)."""
+    return escanear_texto(texto)['indice_szigriszt']
+
+
+def calcular_legibilidad_flesch(texto):
+    """Índice anterior: fórmula de Flesch con caracteres por palabra en lugar de sílabas."""
     palabras = contar_palabras(texto)
     oraciones = len(re.findall(r'[.!?]', texto))
+    return indice_flesch(palabras, oraciones, len(texto))
+
+
+def indice_flesch(palabras, oraciones, caracteres):
+    """Calcula el índice anterior a partir de conteos ya obtenidos."""
+    if palabras == 0 or oraciones == 0:
+        return 100
+    return max(0, min(100, 206.835 - 1.015 * (palabras / oraciones) - 84.6 * (caracteres / palabras)))
+
+
+def indice_fernandez_huerta(palabras, oraciones, silabas):
+    """206.84 - 60 * sílabas por palabra - 102 * oraciones por palabra, acotado a 0-100."""
+    if palabras == 0 or oraciones == 0:
+        return 100
+    return max(0, min(100, 206.84 - 60 * (silabas / palabras) - 102 * (oraciones / palabras)))
+
+
+def indice_szigriszt(palabras, oraciones, silabas):
+    """206.835 - 62.3 * sílabas por palabra - palabras por oración, acotado a 0-100."""
     if palabras == 0 or oraciones == 0:
         return 100
-    return max(0, min(100, 206.835 - 1.015 * (palabras / oraciones) - 84.6 * (len(texto) / palabras)))
+    return max(0, min(100, 206.835 - 62.3 * (silabas / palabras) - palabras / oraciones))
+
 
+def _contar_tokens(texto, inicio=0, fin=None):
+    """Cuenta cada tipo de token de texto[inicio:fin], y sus palabras y sílabas.
+
+    Son dos pasadas: _PATRON_ESCANEO para párrafos, capítulos y oraciones, y
+    _PALABRA.findall para las formas de las palabras. Añadir \\w+ al patrón
+    único obligaría a crear un objeto de coincidencia (o una tupla de grupos)
+    por palabra, y en CPython resulta más lento que las dos pasadas en C.
+    Las palabras se agrupan por forma antes de contar sílabas, así que cada
+    forma distinta se divide una vez (y las ya vistas salen de la caché).
+    """
+    if fin is None:
+        fin = len(texto)
+    conteo = Counter(map(_GRUPO, _PATRON_ESCANEO.finditer(texto, inicio, fin)))
+    formas = Counter(_PALABRA.findall(texto, inicio, fin))
+    conteo['palabra'] = sum(formas.values()) - conteo['capitulo']
+    conteo['silaba'] = contar_silabas_formas(formas)
+    return conteo
+
+
+def _estadisticas_de_conteo(conteo, caracteres):
+    """Convierte el conteo de tokens en el diccionario de estadísticas."""
+    palabras = conteo['palabra'] + conteo['capitulo']
+    oraciones = conteo['oracion']
+    silabas = conteo['silaba']
+    return {
+        'num_palabras': palabras,
+        'num_capitulos': conteo['capitulo'],
+        'num_oraciones': oraciones,
+        'num_parrafos': conteo['parrafo'],
+        'num_caracteres': caracteres,
+        'num_silabas': silabas,
+        'indice_legibilidad': indice_fernandez_huerta(palabras, oraciones, silabas),
+        'indice_szigriszt': indice_szigriszt(palabras, oraciones, silabas),
+        'indice_flesch': indice_flesch(palabras, oraciones, caracteres),
+    }
+
+
+def escanear_texto(texto):
+    """Obtiene todas las estadísticas del texto en dos pasadas (ver _contar_tokens).
+
+    Equivale a combinar contar_palabras, contar_capitulos y los índices de
+    legibilidad (Fernández-Huerta en indice_legibilidad, Szigriszt-Pazos y el
+    anterior, indice_flesch), y añade el número de oraciones, sílabas y
+    párrafos (bloques separados por líneas en blanco).
+    """
+    return _estadisticas_de_conteo(_contar_tokens(texto), len(texto))
 
-def detectar_errores(texto):
+
+def escanear_txt(ruta):
+    """Como escanear_texto sobre el contenido de un .txt UTF-8, sin decodificarlo entero.
+
+    Cuenta sobre el archivo proyectado en memoria (ver conteo_bytes.py). Los
+    archivos con retornos de carro sueltos se leen y escanean como texto.
+    """
+    resultado = contar_archivo(ruta)
+    if resultado is None:
+        with open(ruta, encoding='utf-8') as f:
+            return escanear_texto(f.read())
+    return _estadisticas_de_conteo(*resultado)
+
+
+def _segmentar(bloques):
+    """Reagrupa bloques de texto en segmentos que no parten palabras ni separadores.
+
+    Produce tuplas (buffer, inicio, fin): el segmento es buffer[inicio:fin]. Cada
+    buffer, salvo el primero, arrastra como contexto el último carácter visible del
+    segmento anterior, de modo que '^' y los separadores de párrafo se evalúan igual
+    que sobre el texto completo.
+    """
+    pendiente = ''
+    inicio = 0
+    for bloque in bloques:
+        buffer = pendiente + bloque
+        corte = next(filter(None, (patron.match(buffer, inicio) for patron in _CORTES)), None)
+        if corte is None:
+            pendiente = buffer
+            continue
+        fin = corte.start(1)
+        yield buffer, inicio, fin
+        pendiente = buffer[fin - 1:]
+        inicio = 1
+    if len(pendiente) > inicio:
+        yield pendiente, inicio, len(pendiente)
+
+
+def escanear_bloques(bloques):
+    """Como escanear_texto, pero consume un iterable de fragmentos de texto.
+
+    La memoria usada depende del tamaño de los bloques, no del total del texto.
+    """
+    conteo = Counter()
+    caracteres = 0
+    for buffer, inicio, fin in _segmentar(bloques):
+        conteo.update(_contar_tokens(buffer, inicio, fin))
+        caracteres += fin - inicio
+    return _estadisticas_de_conteo(conteo, caracteres)
+
+
+def revisar_gramatica(texto, cache=None):
+    """Coincidencias de LanguageTool para el texto (ver detectar_errores), o None si no está instalado."""
+    try:
+        return revisar_texto(texto, cache=cache)
+    except ImportError:
+        return None
+
+
+def detectar_errores(texto, cache=None):
     """Detecta errores ortográficos y gramaticales usando LanguageTool.
 
     Requiere: pip install language-tool-python
     Si LanguageTool no está instalado, devuelve 0 y no bloquea la evaluación.
+    Reutiliza los correctores compartidos del proceso y revisa los textos
+    largos por fragmentos en paralelo (ver corrector.py). Con una
+    CacheGramatical solo se revisan los párrafos nuevos o modificados.
     """
-    try:
-        import language_tool_python
-        tool = language_tool_python.LanguageTool('es')
-        matches = tool.check(texto)
-        tool.close()
-        return len(matches)
-    except ImportError:
-        return 0
-
-
-def analizar_manuscrito(path):
-    """Lee un archivo .txt y extrae estadísticas de análisis."""
-    with open(path, encoding='utf-8') as f:
-        texto = f.read()
-    stats = {
-        'num_palabras': contar_palabras(texto),
-        'num_capitulos': contar_capitulos(texto),
-        'indice_legibilidad': calcular_legibilidad(texto),
-        'errores_graves': detectar_errores(texto),
-    }
+    coincidencias = revisar_gramatica(texto, cache)
+    return 0 if coincidencias is None else len(coincidencias)
+
+
+def analizar_manuscrito(path, streaming=False, tamano_bloque=TAMANO_BLOQUE, cache=None,
+                        cache_extraccion=None, por_capitulos=False):
+    """Lee un manuscrito (.txt, .pdf o .docx) y extrae estadísticas de análisis.
+
+    Con streaming=True el archivo se lee por bloques (o páginas, o párrafos) y
+    nunca se carga completo; el resultado coincide con el de la lectura en memoria.
+    Si se pasa una CacheGramatical, las estadísticas incluyen sus aciertos y fallos.
+    Con una CacheExtraccion, el texto de los PDF y DOCX se extrae una sola vez
+    y las siguientes evaluaciones leen el texto guardado.
+    Con por_capitulos=True se añade 'capitulos', el desglose de analizar_capitulos
+    (con los errores de la misma revisión gramatical); requiere streaming=False.
+    """
+    if streaming and por_capitulos:
+        raise ValueError('El desglose por capítulos necesita el texto completo (streaming=False)')
+    procesador = ProcesadorDeArchivos()
+    if cache_extraccion is not None and not es_texto_plano(path):
+        path = cache_extraccion.obtener(path, procesador.iterar_texto)
+    aciertos, fallos = (cache.aciertos, cache.fallos) if cache is not None else (0, 0)
+    if streaming:
+        stats = _analizar_en_flujo(procesador.iterar_texto(path, tamano_bloque), cache)
+    else:
+        if es_texto_plano(path):
+            stats = escanear_txt(path)
+            # El texto solo se decodifica si la gramática o el desglose van a leerlo;
+            # sin LanguageTool, la caché gramatical aún puede tener los párrafos
+            revisa = cache is not None or backend_disponible()
+            texto = procesador.extraer_texto(path) if revisa or por_capitulos else None
+        else:
+            # iterar_texto propaga la falta de PyPDF2 (o de python-docx, si el XML
+            # no se puede leer) en lugar de devolver un aviso como texto
+            texto = ''.join(procesador.iterar_texto(path))
+            stats = escanear_texto(texto)
+        coincidencias = revisar_gramatica(texto, cache) if texto is not None else None
+        stats['errores_graves'] = 0 if coincidencias is None else len(coincidencias)
+        if por_capitulos:
+            from capitulos import analizar_capitulos
+            stats['capitulos'] = analizar_capitulos(texto, coincidencias=coincidencias)
+    if cache is not None:
+        stats['cache_aciertos'] = cache.aciertos - aciertos
+        stats['cache_fallos'] = cache.fallos - fallos
+    return stats
+
+
+def _analizar_en_flujo(bloques, cache=None):
+    """Estadísticas y errores segmento a segmento, sin reunir el texto completo.
+
+    Al corrector solo llegan párrafos u oraciones completos: el texto se acumula
+    hasta TAMANO_FRAGMENTO y se envía hasta su último corte (ver
+    corrector.ultimo_corte), igual que al revisar el texto entero.
+    """
+    conteo = Counter()
+    caracteres = 0
+    errores = 0
+    pendiente = []
+    tamano = 0
+    umbral = TAMANO_FRAGMENTO
+    for buffer, inicio, fin in _segmentar(bloques):
+        conteo.update(_contar_tokens(buffer, inicio, fin))
+        caracteres += fin - inicio
+        pendiente.append(buffer[inicio:fin])
+        tamano += fin - inicio
+        if tamano >= umbral:
+            texto = ''.join(pendiente)
+            corte = ultimo_corte(texto)
+            if corte is None:
+                # Un párrafo sin cortes: se sigue acumulando sin volver a buscar en cada segmento
+                pendiente = [texto]
+                umbral = tamano + TAMANO_FRAGMENTO
+                continue
+            errores += detectar_errores(texto[:corte], cache)
+            pendiente = [texto[corte:]]
+            tamano = len(texto) - corte
+            umbral = TAMANO_FRAGMENTO
+    if tamano:
+        errores += detectar_errores(''.join(pendiente), cache)
+    stats = _estadisticas_de_conteo(conteo, caracteres)
+    stats['errores_graves'] = errores
     return stats
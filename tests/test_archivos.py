@@ -0,0 +1,346 @@
+"""
+Tests para src/procesamiento/archivos.py
+"""
+
+import re
+from types import SimpleNamespace
+
+import pytest
+from archivos import ProcesadorDeArchivos, _leer_parrafos, es_texto_plano, estadisticas_corpus
+
+
+class TestLeerParrafos:
+    def test_agrupa_por_lineas_en_blanco(self):
+        lineas = ["Uno\n", "sigue.\n", "\n", "  \n", "Dos.\n", "\n"]
+        assert list(_leer_parrafos(lineas)) == ["Uno\nsigue.", "Dos."]
+
+    def test_parrafo_largo_se_parte(self):
+        lineas = ["abcde\n"] * 10
+        parrafos = list(_leer_parrafos(lineas, limite=12))
+        assert len(parrafos) == 5
+        assert "".join(p + "\n" for p in parrafos) == "abcde\n" * 10
+
+
+    def test_linea_larga_se_parte_por_oraciones(self):
+        linea = "Una oración corta. Otra algo más larga que la primera. Y la última\n"
+        parrafos = list(_leer_parrafos(["Antes.\n", linea, "sigue.\n"], limite=30))
+        assert parrafos[:3] == ["Antes.", "Una oración corta. ", "Otra algo más larga que la "]
+        assert parrafos[3] == "primera. Y la última\nsigue."
+        assert all(len(p) <= 30 for p in parrafos)
+
+    def test_linea_sin_espacios_se_corta_en_el_limite(self):
+        parrafos = list(_leer_parrafos(["x" * 25 + "\n"], limite=10))
+        assert parrafos == ["x" * 10, "x" * 10, "x" * 5]
+
+
+class _DocFalso:
+    """Doc mínimo: tokens separados por espacios, una oración por punto y una entidad por mayúscula."""
+
+    def __init__(self, texto):
+        self._tokens = [SimpleNamespace(text=t, is_space=t == '\n') for t in re.findall(r'[^\s]+|\n', texto)]
+        self.sents = [None] * max(texto.count('.'), 1)
+        self.ents = [t for t in self._tokens if t.text[:1].isupper()]
+
+    def __iter__(self):
+        return iter(self._tokens)
+
+    def __len__(self):
+        return len(self._tokens)
+
+
+class NlpFalso:
+    max_length = 1000
+
+    def __init__(self):
+        self.textos = []
+        self.argumentos = None
+
+    def __call__(self, texto):
+        if len(texto) > self.max_length:
+            raise ValueError('[E088] Text of length exceeds maximum')
+        return _DocFalso(texto)
+
+    def pipe(self, tuplas, as_tuples=False, batch_size=None, n_process=None):
+        assert as_tuples
+        self.argumentos = {'batch_size': batch_size, 'n_process': n_process}
+        for texto, contexto in tuplas:
+            self.textos.append(texto)
+            yield self(texto), contexto
+
+
+class TestEstadisticasCorpus:
+    @pytest.fixture
+    def nlp(self, monkeypatch):
+        import modelo_spacy
+        nlp = NlpFalso()
+        monkeypatch.setattr(modelo_spacy, 'obtener_nlp', lambda rasgos=('tokens',), modelo=None: nlp)
+        return nlp
+
+    def _escribir(self, tmp_path, nombre, texto):
+        ruta = tmp_path / nombre
+        ruta.write_text(texto, encoding="utf-8")
+        return str(ruta)
+
+    def test_suma_los_parrafos_de_cada_archivo(self, tmp_path, nlp):
+        texto = "Ana vino.\nY se fue.\n\nLuego Berta.\n"
+        uno = self._escribir(tmp_path, "uno.txt", texto)
+        dos = self._escribir(tmp_path, "dos.txt", "solo una línea")
+        resultados = list(estadisticas_corpus([uno, dos]))
+        assert [r for r, _ in resultados] == [uno, dos]
+        assert resultados[0][1] == {'caracteres': len(texto), 'palabras': 7, 'oraciones': 3, 'tokens': 8, 'entidades': 4}
+        assert resultados[1][1] == {'caracteres': 14, 'palabras': 3, 'oraciones': 1, 'tokens': 3, 'entidades': 0}
+        assert nlp.textos == ["Ana vino.\nY se fue.", "Luego Berta.", "solo una línea"]
+
+    def test_orden_de_entrada_con_archivos_vacios(self, tmp_path, nlp):
+        rutas = [self._escribir(tmp_path, f"{n}.txt", "Texto." if n % 2 else "\n\n") for n in range(5)]
+        resultados = list(estadisticas_corpus(rutas))
+        assert [r for r, _ in resultados] == rutas
+        assert [e['palabras'] for _, e in resultados] == [0, 1, 0, 1, 0]
+
+    def test_pasa_batch_size_y_n_process(self, tmp_path, nlp):
+        ruta = self._escribir(tmp_path, "uno.txt", "Hola.")
+        list(estadisticas_corpus([ruta], batch_size=8, n_process=3))
+        assert nlp.argumentos == {'batch_size': 8, 'n_process': 3}
+
+    def test_archivos_ilegibles(self, tmp_path, nlp, capsys):
+        bueno = self._escribir(tmp_path, "bueno.txt", "Hola.")
+        binario = tmp_path / "binario.txt"
+        binario.write_bytes(b"\xff\xfe\x00")
+        resultados = dict(estadisticas_corpus([str(tmp_path / "no_existe.txt"), str(binario), bueno]))
+        assert resultados[str(tmp_path / "no_existe.txt")] is None
+        assert resultados[str(binario)] is None
+        assert resultados[bueno]['palabras'] == 1
+        assert "Error al procesar el archivo" in capsys.readouterr().out
+
+    def test_texto_sin_saltos_no_supera_max_length(self, tmp_path, nlp):
+        texto = "Una oración más. " * 200
+        ruta = self._escribir(tmp_path, "largo.txt", texto)
+        (_, estadisticas), = estadisticas_corpus([ruta])
+        assert all(len(t) <= nlp.max_length for t in nlp.textos)
+        assert "".join(nlp.textos) == texto
+        assert estadisticas['palabras'] == 600 and estadisticas['caracteres'] == len(texto)
+
+
+class TestProcesadorDeArchivos:
+    def test_txt_por_bloques(self, tmp_path):
+        archivo = tmp_path / "texto.txt"
+        archivo.write_text("áéíóú" * 100, encoding="utf-8")
+        procesador = ProcesadorDeArchivos()
+        bloques = list(procesador.iterar_txt(str(archivo), 64))
+        assert all(len(b) <= 64 for b in bloques)
+        assert "".join(bloques) == procesador.extraer_texto(str(archivo))
+
+    def test_iterar_texto_txt_alimenta_escaneo(self, tmp_path):
+        from utils import escanear_bloques, escanear_texto
+        archivo = tmp_path / "texto.txt"
+        texto = "Capítulo I\nUna página. Otra.\n\nCapítulo II\nFin.\n" * 20
+        archivo.write_text(texto, encoding="utf-8")
+        bloques = ProcesadorDeArchivos().iterar_texto(str(archivo), tamano_bloque=50)
+        assert escanear_bloques(bloques) == escanear_texto(texto)
+
+    @pytest.mark.parametrize("nombre", ["manuscrito.md", "manuscrito.text", "manuscrito"])
+    def test_otras_extensiones_se_leen_como_texto(self, tmp_path, nombre):
+        archivo = tmp_path / nombre
+        archivo.write_text("Capítulo I\nTexto.\n", encoding="utf-8")
+        procesador = ProcesadorDeArchivos()
+        assert procesador.extraer_texto(str(archivo)) == "Capítulo I\nTexto.\n"
+        assert "".join(procesador.iterar_texto(str(archivo))) == "Capítulo I\nTexto.\n"
+
+    @pytest.mark.parametrize("nombre", ["manuscrito.odt", "manuscrito.rtf", "manuscrito.DOC"])
+    def test_extension_no_soportada(self, nombre):
+        with pytest.raises(ValueError, match="Tipo de archivo no soportado"):
+            ProcesadorDeArchivos().extraer_texto(nombre)
+        with pytest.raises(ValueError, match="Tipo de archivo no soportado"):
+            ProcesadorDeArchivos().iterar_texto(nombre)
+        assert not es_texto_plano(nombre)
+
+    def test_rtf_no_se_puntua_como_prosa(self, tmp_path):
+        archivo = tmp_path / "manuscrito.rtf"
+        archivo.write_text("{\\rtf1\\ansi Había una vez.}", encoding="utf-8")
+        with pytest.raises(ValueError, match="Tipo de archivo no soportado"):
+            ProcesadorDeArchivos().extraer_texto(str(archivo))
+
+
+# PyPDF2 falso: cada página es un tramo del archivo separado por '\f'; '-' es una página sin texto
+PYPDF2_FALSO = """
+class _Pagina:
+    def __init__(self, texto):
+        self.texto = texto
+
+    def extract_text(self):
+        return None if self.texto == '-' else self.texto
+
+
+class PdfReader:
+    def __init__(self, f):
+        self.pages = [_Pagina(t) for t in f.read().decode('utf-8').split('\\f')]
+"""
+
+
+@pytest.fixture
+def pdf(tmp_path, monkeypatch):
+    """Un PDF de 23 páginas para el PyPDF2 falso, instalado también para los procesos hijos."""
+    import importlib
+    import sys
+    modulos = tmp_path / "modulos"
+    modulos.mkdir()
+    (modulos / "PyPDF2.py").write_text(PYPDF2_FALSO, encoding="utf-8")
+    # sys.path llega a los procesos hijos aunque no se creen con fork
+    monkeypatch.syspath_prepend(str(modulos))
+    monkeypatch.delitem(sys.modules, 'PyPDF2', raising=False)
+    monkeypatch.setitem(sys.modules, 'PyPDF2', importlib.import_module('PyPDF2'))
+    paginas = [f"Página {n}.\n" if n % 7 else "-" for n in range(23)]
+    ruta = tmp_path / "manuscrito.pdf"
+    ruta.write_text("\f".join(paginas), encoding="utf-8")
+    return str(ruta), [p if p != "-" else "" for p in paginas]
+
+
+def _extraer_pdf_original(ruta):
+    """La extracción de PDF anterior a la lectura por páginas, página a página sobre un str."""
+    import PyPDF2
+    texto = ""
+    with open(ruta, 'rb') as f:
+        for pagina in PyPDF2.PdfReader(f).pages:
+            texto += pagina.extract_text() or ""
+    return texto
+
+
+class TestPdf:
+    @pytest.fixture
+    def paralelo(self, monkeypatch):
+        """Registra las llamadas al camino paralelo."""
+        import archivos
+        llamadas = []
+        original = archivos._extraer_pdf_en_paralelo
+
+        def registrar(ruta, total, procesos=None):
+            llamadas.append(total)
+            return original(ruta, total, procesos)
+        monkeypatch.setattr(archivos, '_extraer_pdf_en_paralelo', registrar)
+        return llamadas
+
+    def test_paginas_en_orden(self, pdf, paralelo):
+        ruta, paginas = pdf
+        assert list(ProcesadorDeArchivos().iterar_paginas_pdf(ruta, paralelo=False)) == paginas
+        assert paralelo == []
+
+    def test_paralelo_en_orden_entre_rangos(self, pdf, paralelo, monkeypatch):
+        import archivos
+        ruta, paginas = pdf
+        # 23 páginas en rangos de 3: ocho tareas, más de las 2 * procesos que caben en vuelo
+        monkeypatch.setattr(archivos, 'PAGINAS_POR_TAREA', 3)
+        assert list(ProcesadorDeArchivos().iterar_paginas_pdf(ruta, paralelo=True, procesos=2)) == paginas
+        assert paralelo == [23]
+
+    @pytest.mark.parametrize("umbral, usa_paralelo", [(23, True), (24, False)])
+    def test_umbral_de_paginas(self, pdf, paralelo, monkeypatch, umbral, usa_paralelo):
+        import archivos
+        ruta, paginas = pdf
+        monkeypatch.setattr(archivos, 'UMBRAL_PAGINAS_PARALELO', umbral)
+        monkeypatch.setattr(archivos, 'PAGINAS_POR_TAREA', 5)
+        assert list(ProcesadorDeArchivos().iterar_paginas_pdf(ruta, procesos=2)) == paginas
+        assert paralelo == ([23] if usa_paralelo else [])
+
+    @pytest.mark.parametrize("umbral", [1, 1000])
+    def test_igual_que_la_extraccion_original(self, pdf, monkeypatch, umbral):
+        import archivos
+        ruta, _ = pdf
+        monkeypatch.setattr(archivos, 'UMBRAL_PAGINAS_PARALELO', umbral)
+        procesador = ProcesadorDeArchivos()
+        assert procesador.extraer_texto(ruta) == _extraer_pdf_original(ruta)
+        assert "".join(procesador.iterar_texto(ruta)) == _extraer_pdf_original(ruta)
+
+    def test_sin_pypdf2(self, pdf, monkeypatch):
+        import sys
+        monkeypatch.setitem(sys.modules, 'PyPDF2', None)
+        assert ProcesadorDeArchivos().extraer_texto(pdf[0]) == "PyPDF2 no instalado"
+
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _parte(cuerpo):
+    return f'<?xml version="1.0" encoding="UTF-8"?><w:document {W}><w:body>{cuerpo}</w:body></w:document>'
+
+
+@pytest.fixture
+def docx(tmp_path):
+    import zipfile
+    ruta = tmp_path / "manuscrito.docx"
+    cuerpo = (
+        '<w:p><w:r><w:t>Capítulo I</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t xml:space="preserve">Uno </w:t></w:r><w:r><w:tab/><w:t>dos</w:t>'
+        '<w:br/><w:t>tres</w:t></w:r></w:p>'
+        '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Celda</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+        '<w:p><w:r><w:t>Antes</w:t></w:r><w:r><w:pict><w:txbxContent><w:p><w:r><w:t>Cuadro</w:t>'
+        '</w:r></w:p></w:txbxContent></w:pict></w:r><w:r><w:t> después</w:t></w:r></w:p>'
+    )
+    with zipfile.ZipFile(ruta, 'w') as z:
+        z.writestr('word/document.xml', _parte(cuerpo))
+        z.writestr('word/header1.xml', _parte('<w:p><w:r><w:t>Encabezado</w:t></w:r></w:p>'))
+        z.writestr('word/footnotes.xml', _parte('<w:p><w:r><w:t>Nota</w:t></w:r></w:p>'))
+    return str(ruta)
+
+
+class TestDocx:
+    def test_parrafos_del_cuerpo(self, docx):
+        parrafos = list(ProcesadorDeArchivos().iterar_parrafos_docx(docx))
+        assert parrafos == ["Capítulo I", "Uno \tdos\ntres", "Antes después"]
+
+    def test_encabezados_notas_y_tablas(self, docx):
+        parrafos = list(ProcesadorDeArchivos().iterar_parrafos_docx(
+            docx, encabezados=True, notas=True, tablas=True))
+        assert parrafos[0] == "Encabezado" and parrafos[-1] == "Nota"
+        assert "Celda" in parrafos
+
+    def test_extraer_texto_e_iterar_texto(self, docx):
+        procesador = ProcesadorDeArchivos()
+        texto = procesador.extraer_texto(docx)
+        assert texto == "Capítulo I\nUno \tdos\ntres\nAntes después\n"
+        assert "".join(procesador.iterar_texto(docx)) == texto
+
+    def test_memoria_no_crece_con_los_parrafos(self):
+        import io
+        import tracemalloc
+        from archivos import _parrafos_xml
+        picos = []
+        for n in (5000, 50000):
+            xml = _parte('<w:p><w:r><w:t>Texto de un párrafo.</w:t></w:r></w:p>' * n).encode('utf-8')
+            tracemalloc.start()
+            assert sum(1 for _ in _parrafos_xml(io.BytesIO(xml))) == n
+            picos.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        # Diez veces más párrafos no deben costar apenas más memoria
+        assert picos[1] < 2 * picos[0]
+
+    def test_archivo_no_zip_recurre_a_python_docx(self, tmp_path):
+        ruta = tmp_path / "roto.docx"
+        ruta.write_bytes(b"no es un zip")
+        procesador = ProcesadorDeArchivos()
+        try:
+            import docx  # noqa: F401
+        except ImportError:
+            assert procesador.extraer_texto(str(ruta)) == "python-docx no instalado"
+        else:
+            with pytest.raises(Exception):
+                procesador.extraer_texto(str(ruta))
+
+    def test_iterar_texto_recurre_a_python_docx(self, tmp_path, monkeypatch):
+        import sys
+        import types
+        ruta = tmp_path / "roto.docx"
+        ruta.write_bytes(b"no es un zip")
+        falso = types.ModuleType('docx')
+        parrafos = [types.SimpleNamespace(text=t) for t in ("Uno", "Dos")]
+        falso.Document = lambda r: types.SimpleNamespace(paragraphs=parrafos)
+        monkeypatch.setitem(sys.modules, 'docx', falso)
+        procesador = ProcesadorDeArchivos()
+        assert "".join(procesador.iterar_texto(str(ruta))) == procesador.extraer_texto(str(ruta)) == "Uno\nDos\n"
+
+    def test_iterar_texto_sin_python_docx_propaga(self, tmp_path, monkeypatch):
+        import sys
+        ruta = tmp_path / "roto.docx"
+        ruta.write_bytes(b"no es un zip")
+        monkeypatch.setitem(sys.modules, 'docx', None)
+        with pytest.raises(ImportError):
+            list(ProcesadorDeArchivos().iterar_texto(str(ruta)))
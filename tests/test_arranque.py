@@ -0,0 +1,38 @@
+"""
+Tests de importación perezosa: la CLI no debe cargar dependencias pesadas al arrancar.
+Ver benchmarks/arranque.py para medir el tiempo de arranque.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+PROCESAMIENTO = os.path.join(os.path.dirname(__file__), '..', 'src', 'procesamiento')
+PESADOS = ['spacy', 'language_tool_python', 'PyPDF2', 'docx', 'numpy', 'sqlite3',
+           'multiprocessing', 'concurrent.futures']
+
+
+def _modulos_tras(codigo):
+    programa = (f'import sys, json; sys.path.insert(0, {PROCESAMIENTO!r}); {codigo}; '
+                f'print(json.dumps(sorted(sys.modules)))')
+    salida = subprocess.run([sys.executable, '-c', programa], capture_output=True, text=True, check=True)
+    return set(json.loads(salida.stdout))
+
+
+def test_importar_pipeline_no_carga_dependencias_pesadas():
+    modulos = _modulos_tras('import evaluador, utils')
+    assert not modulos & set(PESADOS)
+    assert not any(m.startswith('criterios.') for m in modulos)
+
+
+def test_genero_se_carga_al_primer_uso():
+    modulos = _modulos_tras("import evaluador; evaluador.GENERO_CRITERIOS['poema']")
+    assert 'criterios.poema' in modulos
+    assert 'criterios.novela' not in modulos
+
+
+def test_registro_de_generos_completo():
+    from evaluador import GENERO_CRITERIOS
+    assert set(GENERO_CRITERIOS) == {'novela', 'cuento', 'poema', 'ensayo', 'cronica'}
+    assert GENERO_CRITERIOS['novela'].__name__ == 'evaluar_novela'
@@ -0,0 +1,48 @@
+"""
+Tests para src/buffer.py
+"""
+
+import random
+import pytest
+from buffer import BufferDeTexto
+
+
+class TestBufferDeTexto:
+    def test_editar(self):
+        buffer = BufferDeTexto("Hola mundo")
+        buffer.insertar(4, ",")
+        assert buffer.borrar(0, 1) == "H"
+        assert buffer.reemplazar(5, 5, "amigo") == "mundo"
+        assert len(buffer) == 10 and buffer.fragmento(3, 10) == ", amigo"
+        assert str(buffer) == "ola, amigo"
+
+    def test_deshacer_y_rehacer(self):
+        buffer = BufferDeTexto("abc")
+        buffer.reemplazar(1, 1, "XYZ")
+        buffer.insertar(0, ">")
+        assert buffer.deshacer() == (0, ">", "")
+        assert buffer.deshacer() == (1, "XYZ", "b")
+        assert buffer.deshacer() is None and buffer.texto() == "abc"
+        assert buffer.rehacer() == (1, "b", "XYZ")
+        buffer.insertar(0, "!")
+        assert buffer.rehacer() is None and buffer.texto() == "!aXYZc"
+
+    def test_fuera_del_texto(self):
+        with pytest.raises(IndexError):
+            BufferDeTexto("abc").borrar(2, 5)
+
+    def test_ediciones_aleatorias_sin_reconstruir(self):
+        aleatorio = random.Random(5)
+        modelo = "".join(aleatorio.choice("abcdef\n ") for _ in range(500))
+        buffer = BufferDeTexto(modelo)
+        for _ in range(1000):
+            offset = aleatorio.randint(0, len(modelo))
+            longitud = aleatorio.randint(0, min(10, len(modelo) - offset))
+            nuevo = "".join(aleatorio.choice("XYZ\n") for _ in range(aleatorio.randint(0, 5)))
+            assert buffer.reemplazar(offset, longitud, nuevo) == modelo[offset:offset + longitud]
+            modelo = modelo[:offset] + nuevo + modelo[offset + longitud:]
+            inicio = aleatorio.randint(0, len(modelo))
+            fin = aleatorio.randint(inicio, len(modelo))
+            assert buffer.fragmento(inicio, fin) == modelo[inicio:fin]
+            assert len(buffer) == len(modelo)
+        assert buffer[:] == modelo and buffer.texto() == modelo
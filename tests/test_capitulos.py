@@ -0,0 +1,114 @@
+"""
+Tests para src/procesamiento/capitulos.py
+"""
+
+import pytest
+import motor_reglas
+from capitulos import analizar_capitulos, indice_de_capitulos
+from corrector import Coincidencia
+from evaluador import evaluar_ruta, reglas_de_genero
+from utils import analizar_manuscrito, contar_capitulos, escanear_texto
+
+TEXTO = ("Portada.\n\nCapítulo 1: El viaje\nSalimos al alba. Llovía.\n\n"
+         "capítulo 2\nUna línea.\n\nCAPÍTULO 3 — Fin\nTodo acabó. ¿O no?\n")
+
+
+def _requisitos(genero, nombre):
+    return next(r.requiere for r in reglas_de_genero(genero) if r.nombre == nombre)
+
+
+class TestIndice:
+    def test_titulos_y_limites(self):
+        indice = indice_de_capitulos(TEXTO)
+        assert [titulo for titulo, _, _ in indice] == ['Capítulo 1: El viaje', 'capítulo 2', 'CAPÍTULO 3 — Fin']
+        assert indice[0][1] == TEXTO.index('Capítulo 1') and indice[-1][2] == len(TEXTO)
+        assert all(fin == siguiente for (_, _, fin), (_, siguiente, _) in zip(indice, indice[1:]))
+
+    @pytest.mark.parametrize("texto", [TEXTO, "", "Sin capítulos.", "Un capítulo 1 en medio"])
+    def test_igual_que_contar_capitulos(self, texto):
+        assert len(indice_de_capitulos(texto)) == contar_capitulos(texto)
+
+
+class TestDesglose:
+    @pytest.mark.parametrize("paralelo", [False, True])
+    def test_conteos_por_capitulo(self, paralelo):
+        capitulos = analizar_capitulos(TEXTO, paralelo=paralelo, procesos=2)
+        for capitulo in capitulos:
+            esperado = escanear_texto(TEXTO[capitulo['inicio']:capitulo['fin']])
+            del esperado['num_capitulos']
+            assert {k: capitulo[k] for k in esperado} == esperado
+        assert sum(c['num_palabras'] for c in capitulos) == escanear_texto(TEXTO)['num_palabras'] - 1
+
+    def test_errores_repartidos_por_offset(self):
+        inicio_2 = TEXTO.index('capítulo 2')
+        coincidencias = [Coincidencia(o, 1, 'R', '', []) for o in (0, inicio_2, inicio_2 + 12, len(TEXTO) - 2)]
+        capitulos = analizar_capitulos(TEXTO, coincidencias=coincidencias)
+        assert [c['errores_graves'] for c in capitulos] == [0, 2, 1]
+        assert capitulos[1]['errores_por_mil'] == 2 / capitulos[1]['num_palabras'] * 1000
+
+    def test_analizar_manuscrito(self, tmp_path):
+        ruta = tmp_path / "novela.txt"
+        ruta.write_text(TEXTO, encoding="utf-8")
+        stats = analizar_manuscrito(str(ruta), por_capitulos=True)
+        assert [c['titulo'] for c in stats['capitulos']] == [t for t, _, _ in indice_de_capitulos(TEXTO)]
+        with pytest.raises(ValueError):
+            analizar_manuscrito(str(ruta), streaming=True, por_capitulos=True)
+
+    def test_motor_de_reglas_reparte_los_errores(self, tmp_path, monkeypatch):
+        inicio_2 = TEXTO.index('capítulo 2')
+        monkeypatch.setattr(motor_reglas, 'revisar_gramatica', lambda texto, cache=None: [
+            Coincidencia(o, 1, 'R', '', []) for o in (inicio_2, len(TEXTO) - 2)])
+        ruta = tmp_path / "novela.txt"
+        ruta.write_text(TEXTO, encoding="utf-8")
+        manuscrito = motor_reglas.Manuscrito(str(ruta))
+        regla = motor_reglas.Regla('r', '', lambda stats: {'cumple': True}, ('errores_capitulos',))
+        motor_reglas.ejecutar([regla], manuscrito)
+        stats = manuscrito.stats
+        assert [c['errores_graves'] for c in stats['errores_capitulos']] == [0, 1, 1]
+        assert [c['titulo'] for c in stats['errores_capitulos']] == [c['titulo'] for c in stats['capitulos']]
+        assert stats['errores_graves'] == 2 and 'coincidencias' not in stats
+
+    def test_equilibrio_no_revisa_la_gramatica(self, tmp_path, monkeypatch):
+        from criterios import novela
+        monkeypatch.setitem(novela.UMBRALES, 'max_desequilibrio', 10)
+        estructura = [r for r in reglas_de_genero('novela') if r.nombre == 'estructura']
+        assert 'gramatica' not in motor_reglas.planificar(estructura)
+        monkeypatch.setattr(motor_reglas, 'revisar_gramatica', lambda *a, **k: pytest.fail('no debía revisarse'))
+        ruta = tmp_path / "novela.txt"
+        ruta.write_text(TEXTO, encoding="utf-8")
+        manuscrito = motor_reglas.Manuscrito(str(ruta))
+        resultados = motor_reglas.ejecutar(estructura, manuscrito, exhaustivo=True)
+        assert resultados['estructura']['cumple']
+        assert [c['titulo'] for c in manuscrito.stats['capitulos']] == [t for t, _, _ in indice_de_capitulos(TEXTO)]
+
+
+class TestEstructuraNovela:
+    def test_desequilibrio_solo_informativo(self):
+        from criterios import novela
+        desigual = {'num_capitulos': 3, 'capitulos': [{'num_palabras': n} for n in (100, 1000, 1100)]}
+        resultado = novela.evaluar_estructura(desigual)
+        assert resultado['cumple'] and resultado['desequilibrio'] == 11
+        # Sin desglose, solo cuenta el número de capítulos
+        assert 'desequilibrio' not in novela.evaluar_estructura({'num_capitulos': 3})
+        assert _requisitos('novela', 'estructura') == ('num_capitulos',)
+
+    def test_desequilibrio_con_umbral(self, monkeypatch):
+        from criterios import novela
+        monkeypatch.setitem(novela.UMBRALES, 'max_desequilibrio', 10)
+        # El umbral cambiado después de importar el módulo también cuenta para las reglas
+        assert _requisitos('novela', 'estructura') == ('num_capitulos', 'capitulos')
+        equilibrada = {'num_capitulos': 3, 'capitulos': [{'num_palabras': n} for n in (900, 1000, 1100)]}
+        desigual = {'num_capitulos': 3, 'capitulos': [{'num_palabras': n} for n in (100, 1000, 1100)]}
+        assert novela.evaluar_estructura(equilibrada)['cumple']
+        assert not novela.evaluar_estructura(desigual)['cumple']
+
+    def test_indice_del_libro_no_desequilibra(self, monkeypatch):
+        from criterios import novela
+        monkeypatch.setitem(novela.UMBRALES, 'max_desequilibrio', 10)
+        cuerpo = ' '.join(['palabra'] * 3000) + '.'
+        texto = ('Índice\nCapítulo 1\nCapítulo 2\nCapítulo 3\n\n'
+                 + ''.join(f'Capítulo {n}\n{cuerpo}\n\n' for n in (1, 2, 3)))
+        capitulos = analizar_capitulos(texto)
+        assert [c['num_palabras'] for c in capitulos] == [2, 2, 2, 3002, 3002, 3002]
+        resultado = novela.evaluar_estructura({'num_capitulos': 6, 'capitulos': capitulos})
+        assert resultado['cumple'] and resultado['desequilibrio'] == 1
@@ -0,0 +1,68 @@
+"""
+Tests para src/procesamiento/conteo_bytes.py
+"""
+
+import random
+import pytest
+from conteo_bytes import contar_archivo, contar_mapa
+from utils import _estadisticas_de_conteo, contar_capitulos, contar_palabras, escanear_texto, escanear_txt
+
+TEXTOS = [
+    "",
+    "Hola mundo.",
+    "Capítulo I\nEl niño cantó una canción.\n\nCAPÍTULO II\n¿Qué pasó? ¡Nada!",
+    "«Dijo» —y calló— … «adiós» 12×3÷4 ª º µ",
+    "﻿Capítulo primero\n\n\n  \n\tSegundo párrafo.\n \xa0\nTercero　fin.",
+    "  \n\n  Empieza tarde.\n \nsigue",
+    "Líneas\r\nde Windows.\r\n\r\nCapítulo 2\r\nFin.\r\n",
+    "Combinación: á é; emoji 😀 y 中文 también.",
+]
+
+
+def _escanear_bytes(texto):
+    return _estadisticas_de_conteo(*contar_mapa(texto.encode('utf-8')))
+
+
+class TestContarMapa:
+    @pytest.mark.parametrize("texto", TEXTOS)
+    def test_coincide_con_escanear_texto(self, texto):
+        assert _escanear_bytes(texto) == escanear_texto(texto.replace('\r\n', '\n'))
+
+    @pytest.mark.parametrize("texto", TEXTOS)
+    def test_coincide_con_contar_palabras_y_capitulos(self, texto):
+        stats = _escanear_bytes(texto)
+        assert stats['num_palabras'] == contar_palabras(texto)
+        assert stats['num_capitulos'] == contar_capitulos(texto)
+
+    def test_texto_aleatorio(self):
+        aleatorio = random.Random(7)
+        piezas = ([chr(c) for c in range(0x80, 0x600)]
+                  + list(" \n\t.!?¿¡«»—“”…\xa0\x85\x1cabcXYZ_09") * 20
+                  + ["Capítulo", "\n", "\r\n", "﻿", "😀", "中", "́"] * 20)
+        for _ in range(500):
+            texto = "".join(aleatorio.choice(piezas) for _ in range(aleatorio.randint(1, 50)))
+            assert _escanear_bytes(texto) == escanear_texto(texto.replace('\r\n', '\n')), texto
+
+    def test_retorno_de_carro_suelto(self):
+        assert contar_mapa(b"uno\rdos") is None
+
+    def test_utf8_invalido(self):
+        with pytest.raises(UnicodeDecodeError):
+            contar_mapa(b"caf\xe9 con leche")
+
+
+class TestEscanearTxt:
+    @pytest.mark.parametrize("texto", TEXTOS + ["Mac\rclásico\r\rCapítulo\r"])
+    def test_archivo(self, tmp_path, texto):
+        archivo = tmp_path / "texto.txt"
+        archivo.write_bytes(texto.encode('utf-8'))
+        with open(archivo, encoding='utf-8') as f:
+            assert escanear_txt(str(archivo)) == escanear_texto(f.read())
+
+    def test_bloques_pequenos(self, tmp_path, monkeypatch):
+        import conteo_bytes
+        monkeypatch.setattr(conteo_bytes, 'TAMANO_BLOQUE_BYTES', 7)
+        texto = "Él leyó «Capítulo» y\r\ndijo: ¿sí?\r\n\r\nCapítulo 2 — fin.\r\n" * 5
+        archivo = tmp_path / "texto.txt"
+        archivo.write_bytes(texto.encode('utf-8'))
+        assert _estadisticas_de_conteo(*contar_archivo(str(archivo))) == escanear_texto(texto.replace('\r\n', '\n'))
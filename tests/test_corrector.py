@@ -0,0 +1,211 @@
+"""
+Tests para src/procesamiento/corrector.py
+"""
+
+import os
+import re
+import pytest
+from types import SimpleNamespace
+from corrector import (CorrectorGramatical, PoolDeCorrectores, configurar_backend, obtener_corrector,
+                       cerrar_corrector, dividir_en_fragmentos, fusionar_coincidencias, Coincidencia)
+from cache import CacheGramatical
+from utils import detectar_errores, analizar_manuscrito
+
+RUTA_MUESTRA = os.path.join(os.path.dirname(__file__), '..', 'src', 'samples', 'sample.txt')
+
+
+class CorrectorFalso:
+    """Backend local: marca cada aparición de 'herror', de 'mas' y de espacios dobles."""
+    instancias = 0
+    revisados = []
+
+    @staticmethod
+    def version():
+        return 'falso-1'
+
+    def __init__(self, idioma):
+        CorrectorFalso.instancias += 1
+        self.idioma = idioma
+        self.cerrado = False
+        self.fallar = False
+
+    def check(self, texto):
+        if self.fallar or self.cerrado:
+            raise ConnectionError('servidor caído')
+        CorrectorFalso.revisados.append(texto)
+        return [SimpleNamespace(offset=m.start(), errorLength=len(m.group()), ruleId=m.lastgroup,
+                                message='', replacements=[])
+                for m in re.finditer(r'(?P<HERROR>herror)|(?P<MAS>\bmas\b)|(?P<ESPACIOS>  +)', texto)]
+
+    def close(self):
+        self.cerrado = True
+
+
+@pytest.fixture(autouse=True)
+def backend_falso():
+    CorrectorFalso.instancias = 0
+    CorrectorFalso.revisados = []
+    configurar_backend(CorrectorFalso)
+    yield
+    configurar_backend()
+
+
+class TestCorrectorGramatical:
+    def test_arranque_perezoso(self):
+        c = CorrectorGramatical(CorrectorFalso)
+        assert CorrectorFalso.instancias == 0
+        assert c.esta_activo() is False
+        c.revisar("texto")
+        assert CorrectorFalso.instancias == 1
+        assert c.esta_activo() is True
+
+    def test_reutiliza_backend(self):
+        c = CorrectorGramatical(CorrectorFalso)
+        for _ in range(5):
+            c.revisar("un herror")
+        assert CorrectorFalso.instancias == 1
+
+    def test_reinicia_tras_caida(self):
+        c = CorrectorGramatical(CorrectorFalso)
+        c.revisar("texto")
+        c._backend.fallar = True
+        assert [m.offset for m in c.revisar("un herror y otro herror")] == [3, 17]
+        assert CorrectorFalso.instancias == 2
+        assert c.reinicios == 1
+
+    def test_verificacion_descarta_backend_caido(self):
+        c = CorrectorGramatical(CorrectorFalso)
+        c.revisar("texto")
+        c._backend.fallar = True
+        assert c.esta_activo() is False
+        c.revisar("texto")
+        assert CorrectorFalso.instancias == 2
+
+    def test_cerrar(self):
+        c = CorrectorGramatical(CorrectorFalso)
+        c.revisar("texto")
+        backend = c._backend
+        c.cerrar()
+        assert backend.cerrado is True
+        assert c.esta_activo() is False
+
+
+class TestCorrectorCompartido:
+    def test_instancia_unica(self):
+        assert obtener_corrector() is obtener_corrector()
+
+    def test_detectar_errores_reutiliza_corrector(self):
+        assert detectar_errores("un herror") == 1
+        assert detectar_errores("herror, herror") == 2
+        assert CorrectorFalso.instancias == 1
+
+    def test_cerrar_corrector(self):
+        anterior = obtener_corrector()
+        cerrar_corrector()
+        assert obtener_corrector() is not anterior
+
+    def test_sin_language_tool_devuelve_cero(self):
+        def sin_dependencia(idioma):
+            raise ImportError('language_tool_python')
+        configurar_backend(sin_dependencia)
+        assert detectar_errores("un herror") == 0
+
+
+class TestRevisionPorFragmentos:
+    def test_fragmentos_contiguos_y_acotados(self):
+        with open(RUTA_MUESTRA, encoding='utf-8') as f:
+            texto = f.read()
+        fragmentos = dividir_en_fragmentos(texto, 500)
+        assert len(fragmentos) > 1
+        assert fragmentos[0][0] == 0 and fragmentos[-1][1] == len(texto)
+        assert all(a[1] == b[0] for a, b in zip(fragmentos, fragmentos[1:]))
+
+    def test_corta_en_parrafos(self):
+        texto = "Uno uno.\n\nDos dos.\n\nTres tres."
+        assert dividir_en_fragmentos(texto, 12) == [(0, 10), (10, 20), (20, 30)]
+
+    def test_corta_en_oraciones_si_no_hay_parrafos(self):
+        texto = "Uno uno. Dos dos. Tres tres."
+        assert dividir_en_fragmentos(texto, 10) == [(0, 9), (9, 18), (18, 28)]
+
+    def test_texto_corto_un_solo_fragmento(self):
+        assert dividir_en_fragmentos("Hola.", 100) == [(0, 5)]
+        assert dividir_en_fragmentos("", 100) == []
+
+    def test_misma_revision_que_en_una_llamada(self):
+        with open(RUTA_MUESTRA, encoding='utf-8') as f:
+            texto = f.read()
+        texto = texto.replace(' la ', ' la  herror ').replace(' de ', ' mas ')
+        unica = PoolDeCorrectores(1, CorrectorFalso).revisar(texto, tamano_fragmento=len(texto))
+        pool = PoolDeCorrectores(4, CorrectorFalso)
+        fragmentada = pool.revisar(texto, tamano_fragmento=300)
+        pool.cerrar()
+        assert len(fragmentada) == len(unica) > 0
+        assert fragmentada == unica
+        assert [texto[c.offset:c.offset + c.longitud] for c in fragmentada if c.regla == 'HERROR'] \
+            == ['herror'] * texto.count('herror')
+
+    def test_fusion_descarta_duplicados(self):
+        a = Coincidencia(10, 3, 'R', '', [])
+        b = Coincidencia(2, 1, 'R', '', [])
+        assert fusionar_coincidencias([[a, b], [a]]) == [b, a]
+
+
+class TestCacheGramatical:
+    TEXTO = "Primer herror aquí.\n\nSegundo párrafo sin nada.\n \nTercero con  espacios.\n"
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        c = CacheGramatical(str(tmp_path / "gramatica.sqlite3"))
+        yield c
+        c.cerrar()
+
+    def test_reenvio_no_revisa_de_nuevo(self, cache):
+        primera = detectar_errores(self.TEXTO, cache)
+        CorrectorFalso.revisados = []
+        assert detectar_errores(self.TEXTO, cache) == primera == 2
+        assert CorrectorFalso.revisados == []
+        assert cache.estadisticas()['aciertos'] == 3
+
+    def test_solo_revisa_parrafos_modificados(self, cache):
+        pool = PoolDeCorrectores(2, CorrectorFalso)
+        original = pool.revisar(self.TEXTO, cache=cache)
+        CorrectorFalso.revisados = []
+        revisado = self.TEXTO.replace("Segundo", "Segundo herror")
+        con_cache = pool.revisar(revisado, cache=cache)
+        assert CorrectorFalso.revisados == ["Segundo herror párrafo sin nada."]
+        assert con_cache == pool.revisar(revisado)
+        assert len(con_cache) == len(original) + 1 == 3
+        pool.cerrar()
+
+    def test_offsets_absolutos_desde_cache(self, cache):
+        pool = PoolDeCorrectores(1, CorrectorFalso)
+        pool.revisar(self.TEXTO, cache=cache)
+        desplazado = "Nuevo inicio.\n\n" + self.TEXTO
+        assert pool.revisar(desplazado, cache=cache) == pool.revisar(desplazado)
+
+    def test_clave_depende_de_version(self):
+        assert CacheGramatical.clave("Hola.", "es", "1") != CacheGramatical.clave("Hola.", "es", "2")
+        assert CacheGramatical.clave(" Hola. ", "es", "1") == CacheGramatical.clave("Hola.", "es", "1")
+
+    def test_desalojo_lru(self, tmp_path):
+        cache = CacheGramatical(str(tmp_path / "lru.sqlite3"), max_parrafos=2)
+        for clave in ("a", "b"):
+            cache.guardar(clave, [])
+            cache.confirmar()
+        cache.obtener("a")
+        cache.guardar("c", [])
+        cache.confirmar()
+        assert cache.obtener("a") == [] and cache.obtener("c") == []
+        assert cache.obtener("b") is None
+        assert cache.estadisticas()['entradas'] == 2
+        cache.cerrar()
+
+    def test_contadores_en_estadisticas(self, tmp_path, cache):
+        archivo = tmp_path / "manuscrito.txt"
+        archivo.write_text(self.TEXTO, encoding="utf-8")
+        stats = analizar_manuscrito(str(archivo), cache=cache)
+        assert (stats['cache_aciertos'], stats['cache_fallos']) == (0, 3)
+        stats = analizar_manuscrito(str(archivo), cache=cache)
+        assert (stats['cache_aciertos'], stats['cache_fallos']) == (3, 0)
+        assert stats['errores_graves'] == 2
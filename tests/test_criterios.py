@@ -191,3 +191,14 @@ class TestCronica:
     def test_legibilidad_minima(self):
         assert cronica.evaluar_legibilidad({'indice_legibilidad': 54})['cumple'] is False
         assert cronica.evaluar_legibilidad({'indice_legibilidad': 55})['cumple'] is True
+
+
+@pytest.mark.parametrize("modulo", [novela, cuento, poema, ensayo, cronica])
+def test_tasa_de_errores_sin_palabras(modulo):
+    # Sin palabras (o sin la clave), la tasa se calcula sobre una en lugar de dividir por cero
+    por = modulo.UMBRALES['errores_por']
+    for stats in ({'num_palabras': 0, 'errores_graves': 2}, {'errores_graves': 2}):
+        resultado = modulo.evaluar_ortografia_gramatica(stats)
+        assert resultado['tasa_error'] == 2 * por
+        assert not resultado['cumple']
+    assert modulo.evaluar_ortografia_gramatica({'num_palabras': 0})['cumple']
@@ -0,0 +1,206 @@
+"""
+Tests para src/editor.py
+"""
+
+import random
+import re
+import pytest
+from editor import ERRATA, ESPACIO_DOBLE, GRAMATICA, SIN_PUNTUACION, EditorDeTexto, Incidencia
+from intervalos import IndiceDeIntervalos
+
+
+def _editor(texto, **kwargs):
+    editor = EditorDeTexto(**kwargs)
+    editor.cargar_texto(texto)
+    return editor
+
+
+# Implementaciones anteriores, como referencia de compatibilidad
+def _espacios_dobles(texto):
+    return [i for i in range(len(texto) - 1) if texto[i] == ' ' and texto[i + 1] == ' ']
+
+
+def _falta_puntuacion(texto):
+    return [n for n, l in enumerate(texto.split('\n')) if l and not re.search(r'[.!?]$', l.strip())]
+
+
+def _errores_comunes(texto, errores):
+    # Ahora con límites de palabra y sin distinguir mayúsculas
+    return {err: sug for err, sug in errores.items() if re.search(rf'(?i)\b{re.escape(err)}\b', texto)}
+
+
+class TestEscanear:
+    def test_incidencias_tipadas(self):
+        texto = "Hola  mundo.\nHe recivido\n   \nFin."
+        assert _editor(texto).escanear() == [
+            Incidencia(ESPACIO_DOBLE, 4, 1, 0, 4, ' ', None),
+            Incidencia(ERRATA, 16, 8, 1, 3, 'recivido', 'recibido'),
+            Incidencia(SIN_PUNTUACION, 24, 0, 1, 11, '', None),
+            Incidencia(SIN_PUNTUACION, 25, 0, 2, 0, '', None),
+            Incidencia(ESPACIO_DOBLE, 25, 1, 2, 0, ' ', None),
+            Incidencia(ESPACIO_DOBLE, 26, 1, 2, 1, ' ', None),
+        ]
+
+    def test_se_reutiliza_hasta_cambiar_el_texto(self):
+        editor = _editor("uno  dos")
+        assert editor.escanear() is editor.escanear()
+        editor.cargar_texto("uno dos.")
+        assert editor.escanear() == []
+
+    def test_errores_personalizados_solapados(self):
+        editor = _editor("Dijo de el que  vino.", errores={'de el': 'del', 'el que': 'el cual'})
+        assert editor.errores_comunes() == {'de el': 'del', 'el que': 'el cual'}
+        assert [(i.tipo, i.offset, i.texto) for i in editor.escanear()] == [
+            (ERRATA, 5, 'de el'), (ERRATA, 8, 'el que'), (ESPACIO_DOBLE, 14, ' ')]
+
+    def test_lexicon_desde_archivo(self, tmp_path):
+        lexicon = tmp_path / "erratas.tsv"
+        lexicon.write_text("# errata\tcorrección\nhaiga\thaya\n", encoding="utf-8")
+        editor = EditorDeTexto(lexicon=str(lexicon), directorio_cache=str(tmp_path / "cache"))
+        editor.cargar_texto("Ojalá haiga suerte.")
+        assert editor.errores_comunes() == {'haiga': 'haya'}
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+class TestPosiciones:
+    def test_coincidencias_gramaticales(self):
+        from types import SimpleNamespace
+        editor = _editor("Primera línea.\nAqui hay error.")
+        coincidencia = SimpleNamespace(offset=15, longitud=4, regla='TILDE', mensaje='Falta tilde',
+                                       sugerencias=['Aquí'])
+        assert editor.ubicar_coincidencias([coincidencia]) == [
+            Incidencia(GRAMATICA, 15, 4, 1, 0, 'Aqui', 'Aquí', 'TILDE', 'Falta tilde')]
+
+    def test_indice_se_reconstruye_al_cambiar_el_texto(self):
+        editor = _editor("a\nb")
+        assert editor.texto_de_lineas(1) == "b"
+        editor.cargar_texto("x\ny\nz")
+        assert editor.texto_de_lineas(1, 3) == "y\nz"
+
+
+class TestZonaVisible:
+    def _coincidencia(self, offset, longitud, regla):
+        from types import SimpleNamespace
+        return SimpleNamespace(offset=offset, longitud=longitud, regla=regla, mensaje='', sugerencias=[])
+
+    def test_incidencias_en_lineas(self):
+        editor = _editor("Uno  dos.\nTres teh.\nCuatro  cinco\nSeis.")
+        editor.agregar_gramatica([self._coincidencia(10, 4, 'A'), self._coincidencia(38, 4, 'B')])
+        assert [(i.tipo, i.linea) for i in editor.incidencias_en_lineas(1, 3)] == [
+            (GRAMATICA, 1), (ERRATA, 1), (ESPACIO_DOBLE, 2), (SIN_PUNTUACION, 2)]
+        todas = editor.escanear() + editor.gramatica()
+        assert sorted(editor.incidencias_en(0, len(editor.texto))) == sorted(todas)
+
+    def test_volver_a_revisar_un_tramo(self):
+        editor = _editor("Uno.\n\nDos.\n\nTres.")
+        editor.agregar_gramatica([self._coincidencia(0, 3, 'A'), self._coincidencia(6, 3, 'B')])
+        assert [i.regla for i in editor.incidencias_en(0, 20)] == ['A', 'B']
+        editor.agregar_gramatica([self._coincidencia(7, 2, 'C')], 6, 10)
+        assert [i.regla for i in editor.incidencias_en(0, 20)] == ['A', 'C']
+
+    def test_gramatica_tras_editar(self):
+        editor = _editor("Uno.\nDos.\nTres.")
+        editor.agregar_gramatica([self._coincidencia(0, 3, 'A'), self._coincidencia(5, 3, 'B'),
+                                  self._coincidencia(10, 4, 'C')])
+        editor.insertar(5, "Y\n")
+        assert [(i.regla, i.offset, i.linea, i.texto) for i in editor.incidencias_en_lineas(0, 4)
+                if i.tipo == GRAMATICA] == [('A', 0, 0, 'Uno'), ('C', 12, 3, 'Tres')]
+
+    def test_indice_se_mantiene_al_editar(self):
+        aleatorio = random.Random(5)
+        piezas = ["a", "parte", "teh", "de", "el", " ", "  ", "\n", ".", "x"]
+        modelo = "".join(aleatorio.choice(piezas) for _ in range(150))
+        editor = _editor(modelo, errores=TestEdicion.ERRORES)
+        editor.agregar_gramatica([self._coincidencia(o, 3, str(o)) for o in range(0, len(modelo) - 3, 17)])
+        intervalos = editor._diagnosticos()
+        for _ in range(200):
+            if aleatorio.random() < 0.2:
+                editor.deshacer()
+            else:
+                offset = aleatorio.randint(0, len(editor._buffer))
+                longitud = aleatorio.randint(0, min(5, len(editor._buffer) - offset))
+                editor.reemplazar(offset, longitud, "".join(aleatorio.choices(piezas, k=aleatorio.randint(0, 3))))
+            inicio = aleatorio.randint(0, len(editor._buffer))
+            fin = inicio + aleatorio.randint(0, 40)
+            # Misma respuesta que un índice nuevo, sin reconstruir el del editor
+            nuevo = IndiceDeIntervalos((i.offset, i.offset + i.longitud, i)
+                                       for i in editor.escanear() + editor.gramatica())
+            assert sorted(editor.incidencias_en(inicio, fin)) == sorted(nuevo.consultar(inicio, fin))
+            assert editor._intervalos is intervalos and len(intervalos) == len(nuevo)
+
+
+class TestVistasCompatibles:
+    @pytest.mark.parametrize("texto", [
+        "", "Hola mundo", "Hola.  \nteh   fin!\r\n\n  \n¿Qué?\t", "escribirr\nrecivido.", "   ",
+    ])
+    def test_igual_que_antes(self, texto):
+        editor = _editor(texto)
+        assert editor.encontrar_espacios_dobles() == _espacios_dobles(texto)
+        assert editor.falta_puntuacion() == _falta_puntuacion(texto)
+        assert editor.errores_comunes() == _errores_comunes(texto, editor.errores)
+
+    def test_texto_aleatorio(self):
+        aleatorio = random.Random(3)
+        piezas = list("ab .!?\n\t\r") + ["  ", "teh", "Teh", "recivido", "\xa0", "escribirr"]
+        for _ in range(300):
+            texto = "".join(aleatorio.choice(piezas) for _ in range(aleatorio.randint(0, 40)))
+            editor = _editor(texto)
+            assert editor.encontrar_espacios_dobles() == _espacios_dobles(texto), texto
+            assert editor.falta_puntuacion() == _falta_puntuacion(texto), texto
+            assert editor.errores_comunes() == _errores_comunes(texto, editor.errores), texto
+
+
+class TestEdicion:
+    ERRORES = {'teh': 'the', 'a parte': 'aparte', 'de el que': 'del que'}
+
+    def test_reemplazar_deshacer_rehacer(self):
+        editor = _editor("He recivido  la carta.\nFin.")
+        errata = next(i for i in editor.escanear() if i.tipo == ERRATA)
+        editor.reemplazar(errata.offset, errata.longitud, errata.sugerencia)
+        assert editor.texto == "He recibido  la carta.\nFin."
+        assert [(i.tipo, i.offset, i.linea, i.columna) for i in editor.escanear()] == [(ESPACIO_DOBLE, 11, 0, 11)]
+        assert editor.deshacer() and editor.texto == "He recivido  la carta.\nFin."
+        assert editor.rehacer() and editor.texto == "He recibido  la carta.\nFin."
+        assert editor.rehacer() is False
+
+    def test_editar_no_reconstruye_las_posteriores(self, monkeypatch):
+        import lineas
+        editor = _editor("Uno  teh dos\n" * 2000)
+        editor.incidencias_en(0, 10)
+        ubicadas = []
+        posicion = lineas.IndiceDeLineas.posicion
+        monkeypatch.setattr(lineas.IndiceDeLineas, 'posicion', lambda s, o: ubicadas.append(o) or posicion(s, o))
+        for _ in range(20):
+            editor.insertar(0, "x")
+        assert ubicadas == []
+        assert editor.incidencias_en_lineas(1999)[0][1:5] == (13 * 1999 + 20 + 3, 1, 1999, 3)
+
+    def test_incidencias_tras_ediciones_aleatorias(self):
+        aleatorio = random.Random(11)
+        piezas = ["a", "parte", "teh", "de", "el", "que", " ", "  ", "\n", ".", "x", "\n\n"]
+        modelo = "".join(aleatorio.choice(piezas) for _ in range(200))
+        deshechos, hechos = [], []
+        editor = _editor(modelo, errores=self.ERRORES)
+        editor.escanear()
+        for _ in range(300):
+            accion = aleatorio.random()
+            if accion < 0.15:
+                if editor.deshacer():
+                    hechos.append(modelo)
+                    modelo = deshechos.pop()
+            elif accion < 0.2:
+                if editor.rehacer():
+                    deshechos.append(modelo)
+                    modelo = hechos.pop()
+            else:
+                offset = aleatorio.randint(0, len(modelo))
+                longitud = aleatorio.randint(0, min(6, len(modelo) - offset))
+                nuevo = "".join(aleatorio.choice(piezas) for _ in range(aleatorio.randint(0, 3)))
+                editor.reemplazar(offset, longitud, nuevo)
+                deshechos.append(modelo)
+                hechos.clear()
+                modelo = modelo[:offset] + nuevo + modelo[offset + longitud:]
+            # Sin pedir editor.texto, que reconstruiría el buffer en cada paso
+            assert editor.escanear() == _editor(modelo, errores=self.ERRORES).escanear()
+            assert editor.indice.inicios == _editor(modelo).indice.inicios
+        assert editor.texto == modelo
@@ -0,0 +1,100 @@
+"""
+Tests para src/erratas.py
+"""
+
+import json
+import os
+from erratas import AutomataErratas, cargar_automata, directorio_automatas, leer_lexicon
+
+
+def _buscar(errores, texto):
+    return [(texto[i:f], e, c) for i, f, e, c in AutomataErratas(errores).buscar(texto)]
+
+
+class TestAutomataErratas:
+    def test_limites_de_palabra_y_mayusculas(self):
+        errores = {'haiga': 'haya', 'teh': 'the'}
+        assert _buscar(errores, "Haiga sol; tehran no, teh sí.") == [
+            ('Haiga', 'haiga', 'haya'), ('teh', 'teh', 'the')]
+
+    def test_varias_palabras_y_solapamientos(self):
+        errores = {'de el': 'del', 'el que': 'el cual', 'que': 'qué', 'a parte': 'aparte'}
+        assert _buscar(errores, "Habló de  el que sabía") == [
+            ('de  el', 'de el', 'del'), ('el que', 'el que', 'el cual'), ('que', 'que', 'qué')]
+
+    def test_la_puntuacion_corta_las_secuencias(self):
+        assert _buscar({'a parte': 'aparte'}, "iba a, parte") == []
+        assert _buscar({'a parte': 'aparte'}, "iba a\nparte") == [('a\nparte', 'a parte', 'aparte')]
+        assert _buscar({'a parte': 'aparte'}, "iba a\n \nparte") == []
+
+    def test_sufijo_por_enlace_de_fallo(self):
+        errores = {'uno dos tres': 'x', 'dos tres cuatro': 'y'}
+        assert [e for _, e, _ in _buscar(errores, "uno dos tres cuatro")] == ['uno dos tres', 'dos tres cuatro']
+
+    def test_lexicon_grande(self):
+        errores = {f'errata{i}': f'bien{i}' for i in range(20000)}
+        texto = "texto normal " * 1000 + "errata19999 y errata7."
+        assert [e for _, e, _ in _buscar(errores, texto)] == ['errata19999', 'errata7']
+
+
+class TestCargarAutomata:
+    def test_lexicon_tsv_y_csv(self, tmp_path):
+        ruta = tmp_path / "lexicon.txt"
+        ruta.write_text("# comentario\nhaiga\thaya\n\nnadien,nadie\n", encoding="utf-8")
+        assert leer_lexicon(str(ruta)) == {'haiga': 'haya', 'nadien': 'nadie'}
+
+    def test_cache_en_disco(self, tmp_path):
+        ruta = tmp_path / "lexicon.tsv"
+        cache = tmp_path / "cache"
+        ruta.write_text("haiga\thaya\n", encoding="utf-8")
+        primero = cargar_automata(str(ruta), str(cache))
+        assert len(os.listdir(cache)) == 1
+        assert cargar_automata(str(ruta), str(cache)).correcciones == primero.correcciones
+
+        ruta.write_text("haiga\thaya\nnadien\tnadie\n", encoding="utf-8")
+        assert len(cargar_automata(str(ruta), str(cache))) == 2
+        assert len(os.listdir(cache)) == 2
+
+    def test_compilado_corrupto_se_reconstruye(self, tmp_path):
+        ruta = tmp_path / "lexicon.tsv"
+        cache = tmp_path / "cache"
+        ruta.write_text("haiga\thaya\n", encoding="utf-8")
+        cargar_automata(str(ruta), str(cache))
+        (compilado,) = cache.iterdir()
+        compilado.write_bytes(b"basura")
+        assert len(cargar_automata(str(ruta), str(cache))) == 1
+
+    def test_compilado_es_json(self, tmp_path):
+        ruta = tmp_path / "lexicon.tsv"
+        cache = tmp_path / "cache"
+        ruta.write_text("de el\tdel\nel que\tel cual\nque\tqué\n", encoding="utf-8")
+        compilado = cargar_automata(str(ruta), str(cache))
+        (archivo,) = cache.iterdir()
+        assert archivo.suffix == '.json'
+        datos = json.loads(archivo.read_text(encoding="utf-8"))
+        # Tablas planas: ninguna lista contiene listas ni diccionarios
+        assert all(not isinstance(x, (list, dict)) for v in datos.values() if isinstance(v, list) for x in v)
+        cargado = cargar_automata(str(ruta), str(cache))
+        texto = "Habló de el que sabía"
+        assert list(cargado.buscar(texto)) == list(compilado.buscar(texto))
+        assert cargado.formas == compilado.formas
+
+    def test_compilado_incoherente_se_reconstruye(self, tmp_path):
+        ruta = tmp_path / "lexicon.tsv"
+        cache = tmp_path / "cache"
+        ruta.write_text("haiga\thaya\n", encoding="utf-8")
+        cargar_automata(str(ruta), str(cache))
+        (compilado,) = cache.iterdir()
+        datos = json.loads(compilado.read_text(encoding="utf-8"))
+        datos['fallo'].append(0)
+        compilado.write_text(json.dumps(datos), encoding="utf-8")
+        assert [e for _, _, e, _ in cargar_automata(str(ruta), str(cache)).buscar("haiga")] == ['haiga']
+
+
+    def test_directorio_compartido_con_las_demas_caches(self, tmp_path, monkeypatch):
+        from cache import CacheExtraccion
+        monkeypatch.setenv('ECDOTICA_CACHE', str(tmp_path))
+        assert directorio_automatas() == str(tmp_path / "erratas")
+        cache = CacheExtraccion()
+        assert cache.directorio == str(tmp_path / "extraccion")
+        cache.cerrar()
@@ -0,0 +1,71 @@
+"""
+Tests para src/procesamiento/evaluacion_masiva.py
+"""
+
+import random
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from evaluacion_masiva import cargar_columnas, evaluar_registros  # noqa: E402
+from evaluador import GENERO_CRITERIOS, es_apto, evaluar_manuscrito  # noqa: E402
+
+
+def _registros(n, semilla=0):
+    aleatorio = random.Random(semilla)
+    registros = []
+    for _ in range(n):
+        registro = {
+            'num_palabras': aleatorio.choice([0, 4, 5, 1000, 30000, 150000, 150001, aleatorio.randint(0, 200000)]),
+            'num_capitulos': aleatorio.randint(0, 6),
+            'indice_legibilidad': aleatorio.choice([30, 50, 59.99, aleatorio.uniform(0, 100)]),
+            'errores_graves': aleatorio.randint(0, 80),
+        }
+        if aleatorio.random() < 0.3:
+            registro['capitulos'] = [{'num_palabras': aleatorio.choice([0, 50, 500, 5000])}
+                                     for _ in range(aleatorio.randint(0, 4))]
+        # Algunas claves ausentes, para comprobar los valores por defecto
+        for clave in list(registro):
+            if aleatorio.random() < 0.1:
+                del registro[clave]
+        registros.append(registro)
+    return registros
+
+
+class TestEvaluacionMasiva:
+    @pytest.mark.parametrize("genero", list(GENERO_CRITERIOS))
+    def test_igual_que_los_criterios(self, genero):
+        registros = _registros(2000)
+        masivo = evaluar_registros(registros, genero)
+        for n, stats in enumerate(registros):
+            resultados = evaluar_manuscrito(stats, genero)
+            for criterio, valor in resultados.items():
+                assert bool(masivo[criterio][n]) == valor['cumple'], (criterio, stats)
+            assert masivo['tasa_error'][n] == resultados['ortografia_gramatica']['tasa_error']
+            assert bool(masivo['apto'][n]) == es_apto(resultados)
+
+    def test_umbrales_cambiados(self, monkeypatch):
+        from criterios import novela
+        umbrales = dict(novela.UMBRALES, min_palabras=1000, min_capitulos=1)
+        registros = _registros(500, semilla=1)
+        masivo = evaluar_registros(registros, 'novela', umbrales)
+        monkeypatch.setattr(novela, 'UMBRALES', umbrales)
+        assert masivo['apto'].tolist() == [es_apto(evaluar_manuscrito(r, 'novela')) for r in registros]
+
+    def test_umbral_de_desequilibrio(self, monkeypatch):
+        from criterios import novela
+        umbrales = dict(novela.UMBRALES, max_desequilibrio=10)
+        registros = _registros(500, semilla=2)
+        masivo = evaluar_registros(registros, 'novela', umbrales)
+        monkeypatch.setattr(novela, 'UMBRALES', umbrales)
+        assert masivo['estructura'].tolist() == [evaluar_manuscrito(r, 'novela')['estructura']['cumple']
+                                                 for r in registros]
+
+    def test_columnas(self):
+        columnas = cargar_columnas([{'num_palabras': 3}, {}], claves=('num_palabras',))
+        assert columnas['num_palabras'][0] == 3 and np.isnan(columnas['num_palabras'][1])
+        assert evaluar_registros([], 'poema')['apto'].shape == (0,)
+
+    def test_genero_desconocido(self):
+        with pytest.raises(ValueError):
+            evaluar_registros([{}], 'soneto')
@@ -0,0 +1,56 @@
+"""
+Tests para src/procesamiento/evaluador.py
+"""
+
+import pytest
+import motor_reglas
+from evaluador import (GENERO_CRITERIOS, clasificar_generos, evaluar_generos, evaluar_manuscrito,
+                       reporte_generos)
+
+
+@pytest.fixture
+def revisados(monkeypatch):
+    textos = []
+    monkeypatch.setattr(motor_reglas, 'revisar_gramatica', lambda texto, cache=None: textos.append(texto) or [])
+    return textos
+
+
+class TestEvaluarGeneros:
+    def test_un_analisis_para_todos(self, tmp_path, revisados, monkeypatch):
+        ruta = tmp_path / "poema.txt"
+        ruta.write_text("Y a o e u.", encoding="utf-8")
+        conteos = []
+        escanear_txt = motor_reglas.escanear_txt
+        monkeypatch.setattr(motor_reglas, 'escanear_txt', lambda r: conteos.append(r) or escanear_txt(r))
+        tabla, stats = evaluar_generos(str(ruta))
+        assert len(conteos) == 1 and len(revisados) == 1
+        assert [fila['genero'] for fila in tabla][0] == 'poema' and tabla[0]['apto']
+        assert {fila['genero'] for fila in tabla} == set(GENERO_CRITERIOS)
+        # La gramática la pidió el poema, así que ningún otro género la omite
+        for fila in tabla:
+            assert fila['omitidos'] == 0
+            assert fila['resultados'] == evaluar_manuscrito(stats, fila['genero'])
+
+    def test_exhaustivo_igual_que_evaluar_cada_genero(self, tmp_path, revisados):
+        ruta = tmp_path / "corto.txt"
+        ruta.write_text("Capítulo 1\n\nHabía una vez un niño.", encoding="utf-8")
+        tabla, stats = evaluar_generos(str(ruta), ['novela', 'cronica'], exhaustivo=True)
+        assert len(revisados) == 1
+        assert {fila['genero']: fila['resultados'] for fila in tabla} == {
+            g: evaluar_manuscrito(stats, g) for g in ('novela', 'cronica')}
+
+
+class TestClasificarGeneros:
+    def test_orden(self):
+        si, no = {'cumple': True}, {'cumple': False}
+        omitido = {'cumple': None, 'omitido': True}
+        tabla = clasificar_generos({
+            'novela': {'a': no, 'b': no},
+            'cuento': {'a': si, 'b': no, 'c': omitido},
+            'ensayo': {'a': si, 'b': no},
+            'poema': {'a': si, 'b': si},
+        })
+        assert [(f['genero'], f['apto'], f['cumplidos'], f['omitidos']) for f in tabla] == [
+            ('poema', True, 2, 0), ('ensayo', False, 1, 0), ('cuento', False, 1, 1), ('novela', False, 0, 0)]
+        reporte = reporte_generos(tabla)
+        assert reporte.splitlines()[1].startswith('1. POEMA') and '1 sin evaluar' in reporte
@@ -0,0 +1,91 @@
+"""
+Tests para src/intervalos.py
+"""
+
+import random
+import pytest
+from intervalos import IndiceDeIntervalos
+
+
+def _solapan(intervalos, a, b):
+    return sorted((i, f, v) for i, f, v in intervalos if (i < b and f > a) or (i == f and a <= i < b))
+
+
+class TestIndiceDeIntervalos:
+    def test_consultar(self):
+        indice = IndiceDeIntervalos([(0, 5, 'a'), (3, 3, 'vacio'), (10, 12, 'b'), (0, 1000, 'largo')])
+        assert indice.consultar(4, 10) == ['a', 'largo']
+        assert indice.consultar(3, 4) == ['a', 'largo', 'vacio']
+        assert indice.consultar(12, 20) == ['largo']
+        assert indice.consultar(2000, 3000) == []
+        assert list(indice) == ['a', 'largo', 'vacio', 'b']
+
+    def test_insertar_y_quitar(self):
+        indice = IndiceDeIntervalos()
+        indice.insertar(5, 8, 'x')
+        indice.insertar(5, 8, 'y')
+        assert indice.quitar(5, 8, 'x') and not indice.quitar(5, 8, 'x')
+        assert indice.consultar(0, 10) == ['y'] and len(indice) == 1
+        with pytest.raises(ValueError):
+            indice.insertar(3, 1, 'z')
+
+    def test_desplazar(self):
+        indice = IndiceDeIntervalos([(0, 2, 'a'), (5, 8, 'b'), (6, 600, 'largo'), (9, 9, 'c')], ancho=20)
+        indice.desplazar(5, 10)
+        assert list(indice.elementos()) == [(0, 2, 'a'), (15, 18, 'b'), (16, 610, 'largo'), (19, 19, 'c')]
+        assert indice.consultar(16, 17) == ['b', 'largo'] and indice.consultar(5, 8) == []
+        indice.desplazar(15, -12)
+        assert indice.consultar(4, 5) == ['b', 'largo']
+        assert list(indice) == ['a', 'b', 'largo', 'c']
+        assert indice.empiezan_en(3, 7) == [(3, 6, 'b'), (4, 598, 'largo')]
+
+    def test_desplazar_mantiene_el_orden(self):
+        indice = IndiceDeIntervalos([(0, 1, 'a'), (5, 6, 'b'), (10, 11, 'c')])
+        indice.desplazar(5, -8)
+        assert list(indice.elementos()) == [(-3, -2, 'b'), (0, 1, 'a'), (2, 3, 'c')]
+        assert indice.consultar(0, 3) == ['a', 'c']
+
+    def test_desplazamientos_pendientes(self):
+        aleatorio = random.Random(7)
+        intervalos = []
+        indice = IndiceDeIntervalos(ancho=20)
+        for n in range(3000):
+            accion = aleatorio.random()
+            if intervalos and accion < 0.2:
+                elegido = intervalos.pop(aleatorio.randrange(len(intervalos)))
+                assert indice.quitar(*elegido)
+            elif accion < 0.5:
+                # Como una edición: se desplaza todo lo que empieza tras un punto,
+                # sin adelantarlo a lo anterior
+                desde = aleatorio.randint(0, 1000)
+                anterior = max([i for i, _, _ in intervalos if i < desde], default=-1)
+                delta = aleatorio.randint(anterior - desde + 1, 30)
+                intervalos = [(i + delta, f + delta, v) if i >= desde else (i, f, v) for i, f, v in intervalos]
+                indice.desplazar(desde, delta)
+            else:
+                inicio = aleatorio.randint(0, 1000)
+                elegido = (inicio, inicio + aleatorio.choice([0, 1, 5, 20, 21, 300]), n)
+                intervalos.append(elegido)
+                indice.insertar(*elegido)
+            a = aleatorio.randint(0, 1100)
+            b = a + aleatorio.randint(0, 80)
+            assert indice.consultar(a, b) == [v for _, _, v in _solapan(intervalos, a, b)]
+            assert indice.empiezan_en(a, b) == sorted(e for e in intervalos if a <= e[0] < b)
+        assert list(indice.elementos()) == sorted(intervalos)
+
+    def test_igual_que_filtrar_todo(self):
+        aleatorio = random.Random(3)
+        intervalos = []
+        indice = IndiceDeIntervalos(ancho=20)
+        for n in range(2000):
+            if intervalos and aleatorio.random() < 0.3:
+                elegido = intervalos.pop(aleatorio.randrange(len(intervalos)))
+                assert indice.quitar(*elegido)
+            else:
+                inicio = aleatorio.randint(0, 1000)
+                elegido = (inicio, inicio + aleatorio.choice([0, 1, 5, 20, 21, 300]), n)
+                intervalos.append(elegido)
+                indice.insertar(*elegido)
+            a = aleatorio.randint(0, 1100)
+            b = a + aleatorio.randint(0, 80)
+            assert indice.consultar(a, b) == [v for _, _, v in _solapan(intervalos, a, b)]
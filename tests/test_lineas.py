@@ -0,0 +1,32 @@
+"""
+Tests para src/lineas.py
+"""
+
+import pytest
+from lineas import IndiceDeLineas
+
+TEXTO = "uno\n\ntres líneas\nfin"
+
+
+class TestIndiceDeLineas:
+    def test_inicios(self):
+        assert IndiceDeLineas(TEXTO).inicios == [0, 4, 5, 17]
+        assert IndiceDeLineas("").inicios == [0]
+        assert IndiceDeLineas("a\n").inicios == [0, 2]
+
+    @pytest.mark.parametrize("texto", [TEXTO, "", "\n\n", "sin saltos", "final\n"])
+    def test_posicion_como_al_partir_el_texto(self, texto):
+        indice = IndiceDeLineas(texto)
+        for offset in range(len(texto) + 1):
+            antes = texto[:offset].split('\n')
+            assert indice.posicion(offset) == (len(antes) - 1, len(antes[-1]))
+            assert indice.offset(*indice.posicion(offset)) == offset
+
+    def test_rango_y_lineas(self):
+        indice = IndiceDeLineas(TEXTO)
+        assert indice.lineas(2) == "tres líneas"
+        assert indice.lineas(0, 2) == "uno\n"
+        assert indice.lineas(2, 10) == "tres líneas\nfin"
+        assert indice.lineas(5, 8) == ""
+        assert indice.rango(3) == (17, 20)
+        assert len(indice) == len(TEXTO.split('\n'))
@@ -0,0 +1,121 @@
+"""
+Tests para src/procesamiento/lote.py
+"""
+
+import io
+import json
+import os
+import pytest
+import corrector
+import lote
+from lote import evaluar_archivo, evaluar_lote, escribir_jsonl, leer_manifiesto, listar_directorio
+
+
+def _reventar_en_roto(ruta, genero, exhaustivo=False):
+    # Simula un trabajador que muere (por falta de memoria, por ejemplo)
+    if ruta.endswith("roto.txt"):
+        os._exit(1)
+    return evaluar_archivo(ruta, genero, exhaustivo)
+
+
+@pytest.fixture
+def bandeja(tmp_path):
+    (tmp_path / "cuento").mkdir()
+    (tmp_path / "poema").mkdir()
+    (tmp_path / "cuento" / "uno.txt").write_text("Había una vez. " * 100, encoding="utf-8")
+    (tmp_path / "poema" / "dos.txt").write_text("Verde que te quiero verde.", encoding="utf-8")
+    (tmp_path / "poema" / "roto.txt").write_bytes(b"\xff\xfe\x00")
+    (tmp_path / "poema" / "notas.md").write_text("ignorado", encoding="utf-8")
+    return tmp_path
+
+
+class TestEntradas:
+    def test_directorio_por_genero(self, bandeja):
+        pares = listar_directorio(str(bandeja))
+        assert [(p.rsplit('/', 1)[1], g) for p, g in pares] == [
+            ("uno.txt", "cuento"), ("dos.txt", "poema"), ("roto.txt", "poema")]
+
+    def test_directorio_con_genero(self, bandeja):
+        pares = listar_directorio(str(bandeja / "poema"), "ensayo")
+        assert {g for _, g in pares} == {"ensayo"} and len(pares) == 2
+
+    def test_manifiesto_csv(self, bandeja):
+        manifiesto = bandeja / "lote.csv"
+        manifiesto.write_text("# ruta,genero\ncuento/uno.txt, Cuento\npoema/dos.txt,poema\n", encoding="utf-8")
+        assert leer_manifiesto(str(manifiesto)) == [
+            (str(bandeja / "cuento" / "uno.txt"), "cuento"), (str(bandeja / "poema" / "dos.txt"), "poema")]
+
+    def test_manifiesto_jsonl(self, bandeja):
+        manifiesto = bandeja / "lote.jsonl"
+        manifiesto.write_text('{"ruta": "poema/dos.txt", "genero": "poema"}\n', encoding="utf-8")
+        assert leer_manifiesto(str(manifiesto)) == [(str(bandeja / "poema" / "dos.txt"), "poema")]
+
+    def test_manifiesto_jsonl_con_lineas_en_blanco(self, bandeja):
+        manifiesto = bandeja / "lote.jsonl"
+        manifiesto.write_text('\n{"ruta": "poema/dos.txt", "genero": "poema"}\n  \n\n', encoding="utf-8")
+        assert leer_manifiesto(str(manifiesto)) == [(str(bandeja / "poema" / "dos.txt"), "poema")]
+
+    def test_manifiesto_jsonl_con_lineas_invalidas(self, bandeja):
+        manifiesto = bandeja / "lote.jsonl"
+        manifiesto.write_text('{"ruta": "poema/dos.txt", "genero": "poema"}\n{roto\n'
+                              '{"genero": "poema"}\n["poema/dos.txt"]\n', encoding="utf-8")
+        pares = leer_manifiesto(str(manifiesto))
+        assert pares[0] == (str(bandeja / "poema" / "dos.txt"), "poema")
+        assert [(p['ruta'], p['error'].split(':')[0]) for p in pares[1:]] == [
+            (f"{manifiesto}:2", "JSONDecodeError"), (f"{manifiesto}:3", "ValueError"),
+            (f"{manifiesto}:4", "ValueError")]
+        resultados = list(evaluar_lote(pares, procesos=1, usar_cache=False))
+        assert len(resultados) == 4 and sum('error' in r for r in resultados) == 3
+
+    def test_fila_sin_genero_se_informa(self, bandeja):
+        manifiesto = bandeja / "lote.tsv"
+        manifiesto.write_text("poema/dos.txt\npoema/dos.txt\tpoema\n\t\n", encoding="utf-8")
+        pares = leer_manifiesto(str(manifiesto))
+        assert pares == [(str(bandeja / "poema" / "dos.txt"), ""), (str(bandeja / "poema" / "dos.txt"), "poema")]
+        assert 'Falta el género' in evaluar_archivo(*pares[0])['error']
+
+
+class TestEvaluarLote:
+    def test_un_fallo_no_detiene_el_lote(self, bandeja):
+        pares = listar_directorio(str(bandeja)) + [("/no/existe.txt", "novela"), (str(bandeja), "teatro")]
+        resultados = {r['ruta']: r for r in evaluar_lote(pares, procesos=2, usar_cache=False)}
+        assert len(resultados) == 5
+        assert resultados[str(bandeja / "cuento" / "uno.txt")]['stats']['num_palabras'] == 300
+        assert resultados[str(bandeja / "poema" / "dos.txt")]['apto'] in (True, False)
+        assert 'UnicodeDecodeError' in resultados[str(bandeja / "poema" / "roto.txt")]['error']
+        assert 'FileNotFoundError' in resultados["/no/existe.txt"]['error']
+        assert 'Género no implementado' in resultados[str(bandeja)]['error']
+
+    @pytest.mark.parametrize("procesos, cpus, esperado", [(8, 8, 1), (2, 8, 4), (1, 2, 2), (16, 4, 1)])
+    def test_correctores_por_trabajador(self, monkeypatch, procesos, cpus, esperado):
+        monkeypatch.setattr(lote.os, 'cpu_count', lambda: cpus)
+        monkeypatch.setattr(corrector, 'NUM_CORRECTORES', 4)
+        assert lote._correctores_por_trabajador(procesos) == esperado
+        lote._iniciar_trabajador(False, esperado)
+        assert corrector.NUM_CORRECTORES == esperado
+
+    def test_trabajador_caido_no_detiene_el_lote(self, bandeja, monkeypatch):
+        monkeypatch.setattr(lote, 'evaluar_archivo', _reventar_en_roto)
+        uno, dos, roto = listar_directorio(str(bandeja))
+        resultados = list(evaluar_lote([roto] + [uno, dos] * 3, procesos=1, usar_cache=False))
+        assert len(resultados) == 7
+        assert 'BrokenProcessPool' in next(r for r in resultados if r['ruta'] == roto[0])['error']
+        # Los que estaban en vuelo con él se reintentan y solo falla el que rompe el pool
+        assert sum('stats' in r for r in resultados) == 6
+
+    def test_dos_trabajadores_caidos(self, bandeja, monkeypatch):
+        monkeypatch.setattr(lote, 'evaluar_archivo', _reventar_en_roto)
+        uno, dos, roto = listar_directorio(str(bandeja))
+        pares = [uno, roto, dos, uno, roto, dos, uno, dos]
+        resultados = list(evaluar_lote(pares, procesos=2, usar_cache=False))
+        assert len(resultados) == 8
+        errores = [r for r in resultados if 'error' in r]
+        assert [r['ruta'] for r in errores] == [roto[0]] * 2
+        assert all('BrokenProcessPool' in r['error'] for r in errores)
+
+    def test_salida_jsonl(self, bandeja):
+        salida = io.StringIO()
+        escribir_jsonl(evaluar_lote(listar_directorio(str(bandeja)), procesos=1, usar_cache=False), salida)
+        lineas = [json.loads(l) for l in salida.getvalue().splitlines()]
+        assert len(lineas) == 3
+        assert all('ruta' in l and 'genero' in l for l in lineas)
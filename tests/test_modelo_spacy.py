@@ -0,0 +1,94 @@
+"""
+Tests para src/procesamiento/modelo_spacy.py
+"""
+
+import sys
+import types
+import pytest
+import modelo_spacy
+from modelo_spacy import componentes_necesarios, metricas, obtener_nlp, procesar
+
+
+class TestComponentesNecesarios:
+    def test_tokens_solo_tokenizador(self):
+        assert componentes_necesarios(('tokens',)) == (frozenset(), False)
+
+    def test_oraciones_sin_parser_usa_sentencizer(self):
+        componentes, sentencizer = componentes_necesarios(('tokens', 'oraciones', 'entidades'))
+        assert componentes == {'tok2vec', 'ner'}
+        assert sentencizer is True
+
+    def test_oraciones_con_dependencias_usa_parser(self):
+        componentes, sentencizer = componentes_necesarios(('oraciones', 'dependencias'))
+        assert 'parser' in componentes
+        assert sentencizer is False
+
+    def test_rasgo_desconocido(self):
+        with pytest.raises(ValueError):
+            componentes_necesarios(('rima',))
+
+
+class _NlpFalso:
+    def __init__(self, componentes):
+        self.pipe_names = list(componentes)
+
+    def add_pipe(self, nombre):
+        self.pipe_names.append(nombre)
+
+    def __call__(self, texto):
+        return texto.split()
+
+
+@pytest.fixture
+def spacy_falso(monkeypatch):
+    """Sustituye spacy por un módulo que anota cada carga y vacía la caché de pipelines."""
+    cargas = []
+
+    def load(modelo, exclude=()):
+        cargas.append((modelo, sorted(exclude)))
+        return _NlpFalso(c for c in modelo_spacy._COMPONENTES_MODELO if c not in exclude)
+
+    falso = types.ModuleType('spacy')
+    falso.load = load
+    monkeypatch.setitem(sys.modules, 'spacy', falso)
+    monkeypatch.setattr(modelo_spacy, '_modelos', {})
+    monkeypatch.setattr(modelo_spacy, '_metricas', {'cargas': {}, 'documentos': 0, 'tiempo_documentos': 0.0})
+    return cargas
+
+
+class TestObtenerNlp:
+    def test_excluye_lo_que_no_hace_falta(self, spacy_falso):
+        nlp = obtener_nlp(('tokens', 'entidades'))
+        assert spacy_falso == [('es_core_news_sm', ['attribute_ruler', 'lemmatizer', 'morphologizer',
+                                                    'parser', 'senter'])]
+        assert nlp.pipe_names == ['tok2vec', 'ner']
+
+    def test_oraciones_anade_sentencizer(self, spacy_falso):
+        assert obtener_nlp(('oraciones',)).pipe_names == ['sentencizer']
+        assert spacy_falso[0][1] == sorted(modelo_spacy._COMPONENTES_MODELO)
+
+    def test_oraciones_con_parser_sin_sentencizer(self, spacy_falso):
+        assert obtener_nlp(('oraciones', 'dependencias')).pipe_names == ['tok2vec', 'parser']
+
+    def test_una_carga_por_conjunto_de_componentes(self, spacy_falso):
+        nlp = obtener_nlp(('tokens', 'entidades'))
+        # Mismos componentes aunque se pidan otros rasgos: se reutiliza el pipeline
+        assert obtener_nlp(('entidades',)) is nlp
+        assert obtener_nlp(('tokens', 'entidades')) is nlp
+        assert obtener_nlp(('tokens', 'oraciones', 'entidades')) is not nlp
+        assert obtener_nlp(('tokens',)) is not nlp
+        assert len(spacy_falso) == 3
+
+    def test_metricas(self, spacy_falso):
+        obtener_nlp(('tokens',))
+        assert procesar("Había una vez", ('tokens', 'entidades')) == ["Había", "una", "vez"]
+        procesar("un cuento", ('entidades',))
+        resultado = metricas()
+        assert set(resultado['cargas']) == {'tokenizer', 'tok2vec + ner'}
+        assert all(t >= 0 for t in resultado['cargas'].values())
+        assert resultado['documentos'] == 2
+        assert resultado['tiempo_por_documento'] == resultado['tiempo_documentos'] / 2
+
+    def test_metricas_sin_documentos(self, spacy_falso):
+        assert metricas() == {'cargas': {}, 'documentos': 0, 'tiempo_documentos': 0.0,
+                              'tiempo_por_documento': 0.0}
@@ -0,0 +1,125 @@
+"""
+Tests para src/procesamiento/motor_reglas.py
+"""
+
+import pytest
+import motor_reglas
+from evaluador import GENERO_CRITERIOS, evaluar_manuscrito, evaluar_ruta, reglas_de_genero, reporte_resultados
+from motor_reglas import CARACTERISTICAS, Caracteristica, Manuscrito, Regla, ejecutar, planificar
+from utils import analizar_manuscrito
+
+
+def _regla(nombre, *requiere):
+    return Regla(nombre, '', lambda stats: {'cumple': True, 'vistos': sorted(stats)}, requiere)
+
+
+class TestPlanificar:
+    def test_solo_lo_necesario(self):
+        assert planificar([_regla('longitud', 'num_palabras')]) == ['fuente', 'conteo']
+        assert planificar([_regla('estructura')]) == []
+
+    def test_dependencias_antes_y_una_vez(self):
+        reglas = [_regla('a', 'errores_graves'), _regla('b', 'num_palabras', 'errores_graves')]
+        assert planificar(reglas) == ['fuente', 'texto', 'gramatica', 'conteo']
+
+    def test_dato_desconocido(self):
+        with pytest.raises(ValueError, match='num_versos'):
+            planificar([_regla('metrica', 'num_versos')])
+
+    def test_ciclo(self):
+        caracteristicas = {'a': Caracteristica(('x',), ('b',), None), 'b': Caracteristica(('y',), ('a',), None)}
+        with pytest.raises(ValueError, match='circular'):
+            planificar([_regla('r', 'x')], caracteristicas)
+
+
+class TestEjecutar:
+    def test_txt_sin_gramatica_no_lee_el_texto(self, tmp_path, monkeypatch):
+        ruta = tmp_path / "poema.txt"
+        ruta.write_text("Verde que te quiero verde.", encoding="utf-8")
+        monkeypatch.setattr(motor_reglas, 'revisar_gramatica', lambda *a: pytest.fail('no debía revisarse'))
+        manuscrito = Manuscrito(str(ruta))
+        resultados = ejecutar([_regla('longitud', 'num_palabras')], manuscrito)
+        assert manuscrito.calculadas == ['fuente', 'conteo']
+        assert 'texto' not in manuscrito.datos
+        assert resultados['longitud']['vistos'] == sorted(motor_reglas.CLAVES_CONTEO)
+
+    def test_cada_caracteristica_una_vez(self, tmp_path, monkeypatch):
+        ruta = tmp_path / "cuento.txt"
+        ruta.write_text("Había una vez.", encoding="utf-8")
+        llamadas = []
+        caracteristicas = dict(CARACTERISTICAS, texto=Caracteristica(
+            ('texto',), ('fuente',), lambda m: llamadas.append(1) or CARACTERISTICAS['texto'].calcular(m)))
+        monkeypatch.setattr(motor_reglas, 'revisar_gramatica', lambda texto, cache=None: [])
+        manuscrito = Manuscrito(str(ruta), caracteristicas=caracteristicas)
+        ejecutar([_regla('a', 'errores_graves'), _regla('b', 'errores_graves', 'num_palabras')], manuscrito)
+        assert llamadas == [1]
+        assert 'texto' not in manuscrito.stats
+
+
+class TestCriterios:
+    @pytest.mark.parametrize("genero", list(GENERO_CRITERIOS))
+    def test_requisitos_bastan(self, genero):
+        # Con solo los datos declarados, cada regla da lo mismo que con todos
+        completas = {'num_palabras': 4000, 'num_capitulos': 1, 'indice_legibilidad': 45, 'errores_graves': 3}
+        for regla in reglas_de_genero(genero):
+            parciales = {clave: completas[clave] for clave in regla.requiere}
+            assert regla.aplicar(parciales) == evaluar_manuscrito(completas, genero)[regla.nombre]
+
+    @pytest.mark.parametrize("genero", list(GENERO_CRITERIOS))
+    def test_igual_que_analizar_manuscrito(self, tmp_path, genero):
+        ruta = tmp_path / "manuscrito.txt"
+        ruta.write_text("Capítulo 1\n\nHabía una vez un niño.\n\nCapítulo 2\n\nFin.", encoding="utf-8")
+        resultados, stats = evaluar_ruta(str(ruta), genero, exhaustivo=True)
+        esperado = analizar_manuscrito(str(ruta))
+        assert resultados == evaluar_manuscrito(esperado, genero)
+        assert stats == esperado
+
+    @pytest.mark.parametrize("nombre", ["manuscrito.md", "manuscrito"])
+    def test_texto_sin_extension_txt(self, tmp_path, nombre):
+        (tmp_path / "manuscrito.txt").write_text("Capítulo 1\n\nHabía una vez.\n", encoding="utf-8")
+        (tmp_path / nombre).write_text("Capítulo 1\n\nHabía una vez.\n", encoding="utf-8")
+        _, stats = evaluar_ruta(str(tmp_path / nombre), 'cuento', exhaustivo=True)
+        assert stats == analizar_manuscrito(str(tmp_path / nombre)) == analizar_manuscrito(str(tmp_path / "manuscrito.txt"))
+
+
+class TestSalidaTemprana:
+    @pytest.fixture
+    def corto(self, tmp_path, monkeypatch):
+        revisados = []
+        monkeypatch.setattr(motor_reglas, 'revisar_gramatica',
+                            lambda texto, cache=None: revisados.append(texto) or [])
+        ruta = tmp_path / "corto.txt"
+        ruta.write_text("Había una vez un cuento corto.", encoding="utf-8")
+        return str(ruta), revisados
+
+    def test_no_revisa_la_gramatica_si_ya_no_es_apto(self, corto):
+        ruta, revisados = corto
+        resultados, stats = evaluar_ruta(ruta, 'novela')
+        assert list(resultados) == ['ortografia_gramatica', 'longitud', 'estructura', 'legibilidad']
+        assert resultados['ortografia_gramatica']['omitido'] and not resultados['longitud']['cumple']
+        assert revisados == [] and 'errores_graves' not in stats
+        reporte = reporte_resultados(resultados, 'novela')
+        assert reporte.splitlines()[0].startswith('– ') and 'NO APTO' in reporte
+
+    def test_exhaustivo_evalua_todo(self, corto):
+        ruta, revisados = corto
+        resultados, _ = evaluar_ruta(ruta, 'novela', exhaustivo=True)
+        assert revisados and not any(r.get('omitido') for r in resultados.values())
+
+    def test_apto_no_omite_nada(self, corto, tmp_path):
+        _, revisados = corto
+        ruta = tmp_path / "poema.txt"
+        ruta.write_text("Y a o e u.", encoding="utf-8")
+        resultados, stats = evaluar_ruta(str(ruta), 'poema')
+        assert revisados and resultados == evaluar_manuscrito(stats, 'poema')
+
+    def test_lo_ya_calculado_no_se_omite(self):
+        fallida = Regla('a', '', lambda stats: {'cumple': False}, ('num_palabras',))
+        gratis = Regla('b', '', lambda stats: {'cumple': True}, ('num_caracteres',))
+        cara = Regla('c', '', lambda stats: {'cumple': True}, ('errores_graves',))
+        manuscrito = Manuscrito('x.txt', caracteristicas={
+            'conteo': Caracteristica(('num_palabras', 'num_caracteres'), (), lambda m: {
+                'num_palabras': 1, 'num_caracteres': 1}),
+            'gramatica': Caracteristica(('errores_graves',), (), lambda m: pytest.fail('caro'), 100)})
+        resultados = ejecutar([cara, gratis, fallida], manuscrito)
+        assert resultados == {'c': motor_reglas.omitido(cara), 'b': {'cumple': True}, 'a': {'cumple': False}}
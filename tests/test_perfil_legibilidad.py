@@ -0,0 +1,114 @@
+"""
+Tests para src/procesamiento/perfil_legibilidad.py
+"""
+
+import random
+
+import pytest
+from perfil_legibilidad import inicios_de_ventanas, medir_oraciones, perfil_legibilidad
+from utils import calcular_legibilidad, escanear_texto
+
+PALABRAS = ('el', 'sol', 'casa', 'murciélago', 'extraordinariamente', 'río', 'canción', 'y',
+            'administración', 'aire', 'perro', 'averigüéis')
+
+
+def texto_aleatorio(oraciones, semilla=0):
+    aleatorio = random.Random(semilla)
+    return ' '.join(' '.join(aleatorio.choices(PALABRAS, k=aleatorio.randint(1, 15)))
+                    + aleatorio.choice(('.', '?', '!', '...')) for _ in range(oraciones))
+
+
+def perfil_directo(texto, ventana, paso):
+    """Recalcula cada ventana desde cero sobre su propio texto."""
+    inicios = medir_oraciones(texto)[0]
+    n = len(inicios)
+    limites = list(inicios[1:]) + [len(texto)]
+    fragmentos = (texto[inicios[i]:limites[min(i + ventana, n) - 1]] for i in inicios_de_ventanas(n, ventana, paso))
+    return [escanear_texto(fragmento)['indice_legibilidad'] for fragmento in fragmentos]
+
+
+class TestMedirOraciones:
+    def test_cuenta_palabras_y_silabas(self):
+        inicios, palabras, silabas, cierres = medir_oraciones("El gato come. La casa... ¿Es blanca?")
+        assert list(inicios) == [0, 14, 26]
+        assert list(palabras) == [3, 2, 2]
+        assert list(silabas) == [5, 3, 3]
+        # Cada signo cuenta para la fórmula, como en escanear_texto
+        assert list(cierres) == [1, 3, 1]
+
+    def test_texto_final_sin_cerrar(self):
+        _, palabras, _, cierres = medir_oraciones("Uno. Dos tres")
+        assert list(palabras) == [1, 2]
+        assert list(cierres) == [1, 0]
+
+    def test_signos_sin_palabras(self):
+        inicios, palabras, _, cierres = medir_oraciones("... ¡! Hola. ?")
+        assert list(inicios) == [7]
+        assert list(palabras) == [1]
+        # Los signos sueltos se suman a la oración más cercana
+        assert list(cierres) == [6]
+
+    def test_vacio(self):
+        assert all(len(a) == 0 for a in medir_oraciones(""))
+
+
+class TestPerfilLegibilidad:
+    @pytest.mark.parametrize("ventana, paso", [(1, 1), (5, 1), (5, 2), (10, 10), (3, 7), (50, 3),
+                                              (7, 4), (10, 6)])
+    def test_coincide_con_recalcular_cada_ventana(self, ventana, paso):
+        texto = texto_aleatorio(40)
+        perfil = perfil_legibilidad(texto, ventana, paso)
+        assert list(perfil.indices) == pytest.approx(perfil_directo(texto, ventana, paso))
+        # La última ventana llega a la última oración, y si el paso no supera la
+        # ventana toda oración cae en alguna
+        inicios = list(medir_oraciones(texto)[0])
+        cubiertas = {j for i in map(inicios.index, perfil.inicios) for j in range(i, min(i + ventana, 40))}
+        assert 39 in cubiertas
+        if paso <= ventana:
+            assert cubiertas == set(range(40))
+
+    @pytest.mark.parametrize("n, ventana, paso, esperado", [
+        (10, 4, 2, [0, 2, 4, 6]),
+        (10, 4, 4, [0, 4, 6]),
+        (10, 3, 5, [0, 5, 7]),
+        (3, 5, 2, [0]),
+        (5, 5, 3, [0]),
+    ])
+    def test_inicios_de_ventanas(self, n, ventana, paso, esperado):
+        assert list(inicios_de_ventanas(n, ventana, paso)) == esperado
+
+    def test_inicios_de_las_ventanas(self):
+        texto = "Uno. Dos. Tres. Cuatro. Cinco."
+        perfil = perfil_legibilidad(texto, ventana=2, paso=2)
+        # La última ventana (oraciones 3 y 4) recoge la que el paso dejaba fuera
+        assert list(perfil.inicios) == [0, 10, 16]
+        assert len(perfil.indices) == 3
+
+    def test_texto_corto_una_ventana(self):
+        texto = "El sol brilla. Las aves cantan."
+        perfil = perfil_legibilidad(texto, ventana=20)
+        assert list(perfil.indices) == [calcular_legibilidad(texto)]
+
+    @pytest.mark.parametrize("texto", ["¿Sí?! Claro... Ya veremos.", "... Hola. ?", "Uno. Dos tres",
+                                       texto_aleatorio(40)])
+    def test_ventana_de_todo_el_texto(self, texto):
+        perfil = perfil_legibilidad(texto, ventana=100)
+        assert list(perfil.indices) == [pytest.approx(calcular_legibilidad(texto))]
+
+    def test_pasaje_denso(self):
+        facil = "El sol sale. " * 30
+        denso = "La administración internacionalizó extraordinariamente las comunicaciones. " * 30
+        perfil = perfil_legibilidad(facil + denso + facil, ventana=10, paso=5)
+        # La ventana 8 (oraciones 40-49) cae entera en el pasaje denso (30-59)
+        assert len(facil) <= perfil.inicios[8] < len(facil + denso)
+        assert perfil.indices[8] < perfil.indices[0]
+        assert perfil.indices[8] < perfil.indices[-1]
+
+    def test_vacio(self):
+        perfil = perfil_legibilidad("")
+        assert len(perfil.indices) == 0 and len(perfil.inicios) == 0
+
+    @pytest.mark.parametrize("ventana, paso", [(0, 1), (5, 0)])
+    def test_parametros_invalidos(self, ventana, paso):
+        with pytest.raises(ValueError):
+            perfil_legibilidad("Hola.", ventana, paso)
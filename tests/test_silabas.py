@@ -0,0 +1,78 @@
+"""
+Tests para src/procesamiento/silabas.py
+"""
+
+from collections import Counter
+
+import pytest
+from silabas import contar_silabas, contar_silabas_formas, estadisticas_cache, silabear
+
+
+class TestSilabear:
+    @pytest.mark.parametrize("palabra, silabas", [
+        ("casa", ["ca", "sa"]),
+        ("perro", ["pe", "rro"]),
+        ("calle", ["ca", "lle"]),
+        ("muchacho", ["mu", "cha", "cho"]),
+        ("libro", ["li", "bro"]),
+        ("atlas", ["at", "las"]),
+        ("instrucción", ["ins", "truc", "ción"]),
+        ("construir", ["cons", "truir"]),
+        ("obstáculo", ["obs", "tá", "cu", "lo"]),
+        ("queso", ["que", "so"]),
+        ("guitarra", ["gui", "ta", "rra"]),
+    ])
+    def test_consonantes(self, palabra, silabas):
+        assert silabear(palabra) == silabas
+
+    @pytest.mark.parametrize("palabra, silabas", [
+        ("aire", ["ai", "re"]),
+        ("ciudad", ["ciu", "dad"]),
+        ("cuídate", ["cuí", "da", "te"]),
+        ("hoy", ["hoy"]),
+        ("reyes", ["re", "yes"]),
+        ("pingüino", ["pin", "güi", "no"]),
+        ("averigüéis", ["a", "ve", "ri", "güéis"]),
+    ])
+    def test_diptongos_y_triptongos(self, palabra, silabas):
+        assert silabear(palabra) == silabas
+
+    @pytest.mark.parametrize("palabra, silabas", [
+        ("creer", ["cre", "er"]),
+        ("río", ["rí", "o"]),
+        ("baúl", ["ba", "úl"]),
+        ("poeta", ["po", "e", "ta"]),
+        ("chiita", ["chi", "i", "ta"]),
+    ])
+    def test_hiatos(self, palabra, silabas):
+        assert silabear(palabra) == silabas
+
+    def test_mayusculas(self):
+        assert silabear("CANCIÓN") == ["can", "ción"]
+
+    def test_sin_vocales(self):
+        assert silabear("mmm") == ["mmm"]
+        assert silabear("") == []
+
+
+class TestContarSilabas:
+    def test_cuenta(self):
+        assert contar_silabas("murciélago") == 4
+        assert contar_silabas("y") == 1
+
+    def test_palabra_sin_vocales_cuenta_una(self):
+        assert contar_silabas("2024") == 1
+
+    def test_formas(self):
+        assert contar_silabas_formas(Counter({"casa": 3, "río": 2})) == 10
+        assert contar_silabas_formas(Counter()) == 0
+
+    def test_cache_reutiliza_formas(self):
+        contar_silabas.cache_clear()
+        for _ in range(3):
+            contar_silabas("biblioteca")
+        cache = estadisticas_cache()
+        assert cache['fallos'] == 1
+        assert cache['aciertos'] == 2
+        assert cache['formas'] == 1
+        assert cache['tasa_aciertos'] == pytest.approx(2 / 3)
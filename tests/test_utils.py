@@ -5,7 +5,14 @@ Tests para src/procesamiento/utils.py
 import pytest
 import tempfile
 import os
-from utils import contar_palabras, contar_capitulos, calcular_legibilidad, analizar_manuscrito
+import re
+import tracemalloc
+from types import SimpleNamespace
+from corrector import configurar_backend
+from silabas import contar_silabas
+from utils import (contar_palabras, contar_capitulos, calcular_legibilidad, calcular_legibilidad_flesch,
+                   calcular_legibilidad_szigriszt, analizar_manuscrito,
+                   escanear_texto, escanear_bloques)
 
 
 class TestContarPalabras:
@@ -61,6 +68,58 @@ class TestCalcularLegibilidad:
         resultado = calcular_legibilidad(texto)
         assert resultado >= 0
 
+    def test_fernandez_huerta(self):
+        # 8 palabras, 14 sílabas, 2 oraciones: 206.84 - 60 * 14/8 - 102 * 2/8
+        texto = "El gato come pescado. La casa es blanca."
+        assert calcular_legibilidad(texto) == pytest.approx(206.84 - 105 - 25.5)
+
+    def test_szigriszt(self):
+        texto = "El gato come pescado. La casa es blanca."
+        assert calcular_legibilidad_szigriszt(texto) == pytest.approx(206.835 - 62.3 * 14 / 8 - 4)
+
+    def test_palabras_largas_bajan_el_indice(self):
+        corto = "El sol sale. La luz da en el mar."
+        largo = "Extraordinariamente, la administración internacionalizó sus comunicaciones."
+        assert calcular_legibilidad(corto) > calcular_legibilidad(largo)
+
+    def test_flesch_conserva_el_indice_anterior(self):
+        texto = "El sol brilla. Las aves cantan. El río fluye con calma serena."
+        palabras = 12
+        esperado = 206.835 - 1.015 * palabras / 3 - 84.6 * len(texto) / palabras
+        assert calcular_legibilidad_flesch(texto) == pytest.approx(max(0, min(100, esperado)))
+        assert escanear_texto(texto)['indice_flesch'] == calcular_legibilidad_flesch(texto)
+
+
+class TestEscanearTexto:
+    TEXTOS = [
+        "",
+        "hola mundo",
+        "¡Hola, mundo! ¿Qué tal?",
+        "Capítulo I\nTexto.\n\nCapítulo II\nMás texto.\n\nCapítulo III\nFin.",
+        "Este es el capítulo primero.\ncapítulos sueltos\n  Capítulo con sangría",
+        "El sol brilla. Las aves cantan. El río fluye con calma serena.",
+        "\n\n  árbol canción...  análisis!\n \n\nFin?\n\n",
+    ]
+
+    @pytest.mark.parametrize("texto", TEXTOS)
+    def test_coincide_con_funciones_individuales(self, texto):
+        stats = escanear_texto(texto)
+        assert stats['num_palabras'] == contar_palabras(texto)
+        assert stats['num_capitulos'] == contar_capitulos(texto)
+        assert stats['indice_legibilidad'] == calcular_legibilidad(texto)
+        assert stats['num_caracteres'] == len(texto)
+        assert stats['num_silabas'] == sum(contar_silabas(p) for p in re.findall(r'\w+', texto))
+
+    def test_cuenta_oraciones(self):
+        assert escanear_texto("Uno. Dos! Tres? Cuatro")['num_oraciones'] == 3
+
+    def test_cuenta_parrafos(self):
+        texto = "\n\nPrimer párrafo\ncontinúa.\n\nSegundo.\n   \nTercero.\n\n"
+        assert escanear_texto(texto)['num_parrafos'] == 3
+
+    def test_texto_vacio_sin_parrafos(self):
+        assert escanear_texto("  \n\n ")['num_parrafos'] == 0
+
 
 class TestAnalizarManuscrito:
     def test_devuelve_dict_con_claves_correctas(self, tmp_path):
@@ -88,3 +147,129 @@ class TestAnalizarManuscrito:
     def test_archivo_no_encontrado_lanza_error(self):
         with pytest.raises(FileNotFoundError):
             analizar_manuscrito("/ruta/que/no/existe.txt")
+
+    def test_txt_sin_corrector_no_decodifica(self, tmp_path, monkeypatch):
+        import utils
+        from archivos import ProcesadorDeArchivos
+        archivo = tmp_path / "manuscrito.txt"
+        archivo.write_text("Capítulo 1\nUn herror.", encoding="utf-8")
+        monkeypatch.setattr(utils, 'backend_disponible', lambda: False)
+        monkeypatch.setattr(ProcesadorDeArchivos, 'extraer_texto', lambda self, ruta: pytest.fail('decodificado'))
+        stats = analizar_manuscrito(str(archivo))
+        assert stats['num_palabras'] == 4 and stats['errores_graves'] == 0
+
+
+class CorrectorDeMayusculas:
+    """Backend falso: marca 'herror' y toda oración que empieza en minúscula."""
+
+    @staticmethod
+    def version():
+        return 'mayusculas-1'
+
+    def __init__(self, idioma):
+        pass
+
+    def check(self, texto):
+        return [SimpleNamespace(offset=m.start(), errorLength=len(m.group()), ruleId=m.lastgroup,
+                                message='', replacements=[])
+                for m in re.finditer(r'(?P<HERROR>herror)|(?P<MAYUSCULA>(?:\A\s*|[.!?]\s+)[a-zñ])', texto)]
+
+    def close(self):
+        pass
+
+
+class TestAnalisisEnFlujo:
+    TEXTO = ("Capítulo I\nÁrbol, canción y análisis. ¿Qué tal?\n\n"
+             "Segundo párrafo... con puntos!\n \n"
+             "capítulo II\n\n\nFin del texto.\n")
+
+    @pytest.mark.parametrize("tamano", [1, 2, 3, 5, 8, 13, 1000])
+    def test_bloques_coinciden_con_texto_completo(self, tamano):
+        bloques = [self.TEXTO[i:i + tamano] for i in range(0, len(self.TEXTO), tamano)]
+        assert escanear_bloques(bloques) == escanear_texto(self.TEXTO)
+
+    @pytest.mark.parametrize("tamano", [7, 64, 4096])
+    def test_streaming_coincide_con_lectura_en_memoria(self, tmp_path, tamano):
+        archivo = tmp_path / "manuscrito.txt"
+        archivo.write_text(self.TEXTO * 50, encoding="utf-8")
+        en_flujo = analizar_manuscrito(str(archivo), streaming=True, tamano_bloque=tamano)
+        assert en_flujo == analizar_manuscrito(str(archivo))
+
+    def test_streaming_revisa_oraciones_completas(self, tmp_path):
+        # Párrafos de una sola línea, sin líneas en blanco: el flujo no debe
+        # partir oraciones al mandarlas al corrector
+        archivo = tmp_path / "novela.txt"
+        linea = "Era una noche larga y fría en la que nadie durmió, ni siquiera el herror del faro.\n"
+        archivo.write_text(linea * 1500, encoding="utf-8")
+        configurar_backend(CorrectorDeMayusculas)
+        try:
+            en_memoria = analizar_manuscrito(str(archivo))
+            assert en_memoria['errores_graves'] == 1500
+            for tamano in (13, 4096, 1 << 20):
+                assert analizar_manuscrito(str(archivo), streaming=True, tamano_bloque=tamano) == en_memoria
+        finally:
+            configurar_backend()
+
+    def test_memoria_no_crece_con_el_archivo(self, tmp_path):
+        archivo = tmp_path / "antologia.txt"
+        archivo.write_text(self.TEXTO * 10000, encoding="utf-8")  # ~1 MB
+        tracemalloc.start()
+        analizar_manuscrito(str(archivo), streaming=True, tamano_bloque=1 << 12)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert pico < 1 << 18
+
+
+def _escribir_docx(ruta, parrafos):
+    import zipfile
+    w = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    cuerpo = ''.join(f'<w:p><w:r><w:t>{p}</w:t></w:r></w:p>' for p in parrafos)
+    with zipfile.ZipFile(ruta, 'w') as z:
+        z.writestr('word/document.xml', f'<w:document {w}><w:body>{cuerpo}</w:body></w:document>')
+
+
+class TestIngestionConCache:
+    PARRAFOS = ["Capítulo I", "Era una vez un texto.", "", "Capítulo II", "Fin."]
+
+    def test_docx_igual_que_txt(self, tmp_path):
+        _escribir_docx(tmp_path / "m.docx", self.PARRAFOS)
+        (tmp_path / "m.txt").write_text("".join(p + "\n" for p in self.PARRAFOS), encoding="utf-8")
+        esperado = analizar_manuscrito(str(tmp_path / "m.txt"))
+        assert analizar_manuscrito(str(tmp_path / "m.docx")) == esperado
+        assert analizar_manuscrito(str(tmp_path / "m.docx"), streaming=True) == esperado
+
+    def test_segunda_evaluacion_no_extrae(self, tmp_path):
+        from cache import CacheExtraccion
+        ruta = tmp_path / "m.docx"
+        _escribir_docx(ruta, self.PARRAFOS)
+        cache = CacheExtraccion(str(tmp_path / "cache"))
+        primera = analizar_manuscrito(str(ruta), cache_extraccion=cache)
+        assert analizar_manuscrito(str(ruta), streaming=True, cache_extraccion=cache) == primera
+        assert (cache.aciertos, cache.fallos) == (1, 1)
+
+        # Cambiar el contenido cambia la clave; invalidar obliga a extraer de nuevo
+        _escribir_docx(ruta, self.PARRAFOS + ["Otro."])
+        assert analizar_manuscrito(str(ruta), cache_extraccion=cache)['num_palabras'] == primera['num_palabras'] + 1
+        cache.invalidar(str(ruta))
+        analizar_manuscrito(str(ruta), cache_extraccion=cache)
+        assert (cache.aciertos, cache.fallos) == (1, 3)
+
+    def test_desalojo_por_tamano(self, tmp_path):
+        from cache import CacheExtraccion
+        cache = CacheExtraccion(str(tmp_path / "cache"), max_bytes=25)
+        for i in range(3):
+            _escribir_docx(tmp_path / f"{i}.docx", [f"Documento {i} de prueba."])
+            cache.obtener(str(tmp_path / f"{i}.docx"), lambda r: ["x" * 20])
+        assert cache.estadisticas()['entradas'] == 1
+        cache.limpiar()
+        assert cache.estadisticas() == {'aciertos': 0, 'fallos': 3, 'entradas': 0, 'bytes': 0}
+
+    def test_extraccion_fallida_no_se_guarda(self, tmp_path):
+        from cache import CacheExtraccion
+        ruta = tmp_path / "roto.docx"
+        ruta.write_bytes(b"no es un zip")
+        cache = CacheExtraccion(str(tmp_path / "cache"))
+        with pytest.raises(Exception):
+            analizar_manuscrito(str(ruta), cache_extraccion=cache)
+        assert cache.estadisticas()['entradas'] == 0
+        assert [n for n in os.listdir(tmp_path / "cache") if n.endswith('.tmp')] == []